@@ -4,9 +4,12 @@ Fetches mock clinical trial data from ClinicalTrials.gov-like source.
 Provides information about ongoing and completed trials for drug candidates.
 """
 
+import threading
 from typing import Dict, List
 from datetime import datetime, timedelta
 
+from utils.trial_index import TrialIndex
+
 
 class ClinicalAgent:
     """
@@ -79,6 +82,21 @@ class ClinicalAgent:
         ],
     }
 
+    # Search index over MOCK_TRIALS, shared by all instances
+    _trial_index = None
+    _trial_index_lock = threading.Lock()
+
+    @property
+    def trial_index(self) -> TrialIndex:
+        """Inverted index over trial condition, title and sponsor (built on first use)."""
+        if ClinicalAgent._trial_index is None:
+            with ClinicalAgent._trial_index_lock:
+                if ClinicalAgent._trial_index is None:
+                    ClinicalAgent._trial_index = TrialIndex(
+                        trial for trials in self.MOCK_TRIALS.values() for trial in trials
+                    )
+        return ClinicalAgent._trial_index
+
     def query_trials(self, molecule_name: str) -> Dict:
         """
         Query clinical trials for a specific molecule.
@@ -167,29 +185,23 @@ class ClinicalAgent:
             ),
         }
 
-    def get_therapeutic_area_trials(self, therapeutic_area: str) -> List[Dict]:
+    def get_therapeutic_area_trials(self, therapeutic_area: str, page: int = 1, page_size: int = 10) -> List[Dict]:
         """
-        Get trials for a specific therapeutic area.
+        Get trials for a specific therapeutic area, most recent first.
+
+        Every word of the area must match (as a word prefix) the trial's condition,
+        title or sponsor, so "cardio" finds "Cardiovascular Disease".
 
         Args:
             therapeutic_area (str): Name of therapeutic area (e.g., Oncology, Cardiology).
+            page (int): 1-based page number.
+            page_size (int): Trials per page.
 
         Returns:
-            List[Dict]: List of trials in that area.
+            List[Dict]: Trials in that area for the requested page.
         """
-        all_trials = []
-        for molecule, trials in self.MOCK_TRIALS.items():
-            for trial in trials:
-                all_trials.append(trial)
-
-        # Filter by therapeutic area
-        filtered = [
-            t
-            for t in all_trials
-            if therapeutic_area.lower() in t["condition"].lower()
-        ]
-
-        return filtered[:10]  # Return up to 10 most recent
+        page = max(page, 1)
+        return self.trial_index.search(therapeutic_area, offset=(page - 1) * page_size, limit=page_size)
 
     def get_trending_conditions(self) -> List[Dict]:
         """
@@ -3,8 +3,17 @@ IQVIA Market Data Agent
 Fetches mock market data for pharmaceuticals including market size, growth rates, and competitive landscape.
 """
 
+import os
+import threading
 from typing import Dict, List
 from datetime import datetime
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Optional CSV/Parquet market file (molecule x region rows) replacing the mock data
+IQVIA_MARKET_DATA_PATH = os.getenv("IQVIA_MARKET_DATA_PATH", "")
 
 
 class IQVIAAgent:
@@ -65,6 +74,35 @@ class IQVIAAgent:
         },
     }
 
+    # Columnar dataset built from MOCK_MARKET_DATA, shared by all instances
+    _mock_dataset = None
+    _mock_dataset_lock = threading.Lock()
+
+    def __init__(self, dataset=None):
+        """
+        Initialize the IQVIA agent.
+
+        Args:
+            dataset (MarketDataset, optional): Market data to serve. If None, it is loaded
+                on first use from IQVIA_MARKET_DATA_PATH, or built from MOCK_MARKET_DATA.
+        """
+        self._dataset = dataset
+
+    @property
+    def dataset(self):
+        """Columnar market data (NumPy is only imported on first use)."""
+        if self._dataset is None:
+            from utils.market_dataset import MarketDataset, load_market_dataset
+
+            if IQVIA_MARKET_DATA_PATH:
+                self._dataset = load_market_dataset(IQVIA_MARKET_DATA_PATH)
+            else:
+                with IQVIAAgent._mock_dataset_lock:
+                    if IQVIAAgent._mock_dataset is None:
+                        IQVIAAgent._mock_dataset = MarketDataset.from_records(self.MOCK_MARKET_DATA)
+                self._dataset = IQVIAAgent._mock_dataset
+        return self._dataset
+
     def query_market_data(self, molecule_name: str) -> Dict:
         """
         Query market data for a specific molecule.
@@ -75,10 +113,9 @@ class IQVIAAgent:
         Returns:
             Dict: Market data including size, growth, competitors, and regions.
         """
-        molecule_key = molecule_name.lower()
+        data = self.dataset.molecule_record(molecule_name)
 
-        if molecule_key in self.MOCK_MARKET_DATA:
-            data = self.MOCK_MARKET_DATA[molecule_key].copy()
+        if data is not None:
             data["molecule"] = molecule_name
             data["data_source"] = "IQVIA"
             data["query_date"] = datetime.now().isoformat()
@@ -122,32 +159,8 @@ class IQVIAAgent:
         Returns:
             List[Dict]: Top therapeutic areas with market data.
         """
-        therapeutic_areas = {}
-
-        for molecule, data in self.MOCK_MARKET_DATA.items():
-            area = data["therapeutic_area"]
-            if area not in therapeutic_areas:
-                therapeutic_areas[area] = {
-                    "area": area,
-                    "total_market_size": 0,
-                    "avg_growth_rate": 0,
-                    "molecule_count": 0,
-                }
-            therapeutic_areas[area]["total_market_size"] += data["market_size_usd"]
-            therapeutic_areas[area]["avg_growth_rate"] += data["growth_rate"]
-            therapeutic_areas[area]["molecule_count"] += 1
-
-        # Calculate averages and sort by growth
-        for area in therapeutic_areas.values():
-            area["avg_growth_rate"] = area["avg_growth_rate"] / area["molecule_count"]
-
-        sorted_areas = sorted(
-            therapeutic_areas.values(),
-            key=lambda x: x["avg_growth_rate"],
-            reverse=True,
-        )
-
-        return sorted_areas[:5]  # Return top 5
+        # Vectorized group-by over the per-molecule columns
+        return self.dataset.therapeutic_area_trends(top=5)
 
     def get_regional_analysis(self, molecule_name: str) -> Dict:
         """
@@ -159,12 +172,8 @@ class IQVIAAgent:
         Returns:
             Dict: Regional market breakdown.
         """
-        molecule_key = molecule_name.lower()
-
-        if molecule_key in self.MOCK_MARKET_DATA:
-            return self.MOCK_MARKET_DATA[molecule_key].get(
-                "regions", {}
-            )
+        if molecule_name in self.dataset:
+            return self.dataset.regional_breakdown(molecule_name)
         else:
             return {
                 "North America": {"market_size": 0.3e9, "growth": 0.03},
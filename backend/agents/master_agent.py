@@ -4,7 +4,15 @@ Orchestrates all worker agents (IQVIA, Clinical, Patent, WebIntel).
 Aggregates their outputs and generates unified summaries using Groq AI.
 """
 
-from typing import Dict
+import os
+import re
+import json
+import time
+import hashlib
+import asyncio
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from .iqvia_agent import IQVIAAgent
@@ -13,6 +21,11 @@ from .patent_agent import PatentAgent
 from .webintel_agent import WebIntelAgent
 from .report_agent import ReportAgent
 from utils.groq_client import GroqClient
+from utils.llm_providers import MissingAPIKeyError
+from utils.molecules import normalize_molecule_name
+from utils.agent_cache import AgentCache, get_agent_cache
+from utils.metrics import AGENT_DURATION, AGENT_ERRORS, REPORT_RENDER_DURATION
+from utils.tracing import span
 
 
 class MasterAgent:
@@ -21,23 +34,72 @@ class MasterAgent:
     Coordinates data gathering, aggregation, and AI-powered analysis.
     """
 
-    def __init__(self, groq_api_key: str = None):
+    RECOMMENDATION_SYSTEM_MESSAGE = "You are a pharmaceutical strategy consultant. Provide actionable recommendations."
+    ANALYSIS_SYSTEM_MESSAGE = (
+        "You are a pharmaceutical intelligence analyst and strategy consultant. "
+        "Respond with a single JSON object and nothing else."
+    )
+
+    # "combined": one Groq call returns insights and recommendations as JSON;
+    # "separate": one call per section (also the fallback for unparseable JSON)
+    LLM_MODES = ("combined", "separate")
+
+    def __init__(
+        self,
+        groq_api_key: str = None,
+        concurrent: bool = None,
+        max_workers: int = None,
+        llm_mode: str = None,
+        agent_cache: AgentCache = None,
+    ):
         """
         Initialize Master Agent with all worker agents.
 
         Args:
             groq_api_key (str, optional): Groq API key. If None, reads from environment.
+            concurrent (bool, optional): Run the data agents (and the two LLM calls)
+                in parallel. If None, reads MASTER_AGENT_CONCURRENT (default: true).
+            max_workers (int, optional): Size of the fan-out thread pool. If None,
+                reads MASTER_AGENT_MAX_WORKERS (default: 8).
+            llm_mode (str, optional): "combined" for one structured Groq call per
+                analysis, "separate" for the two-call flow. If None, reads
+                MASTER_AGENT_LLM_MODE (default: combined).
+            agent_cache (AgentCache, optional): Cache for data-agent results. If None,
+                uses the shared cache configured by the AGENT_CACHE_* env vars (may be disabled).
         """
+        if llm_mode is None:
+            llm_mode = os.getenv("MASTER_AGENT_LLM_MODE", "combined").lower()
+        if llm_mode not in self.LLM_MODES:
+            raise ValueError(f"Unsupported LLM mode: {llm_mode}. Use 'combined' or 'separate'.")
+        self.llm_mode = llm_mode
+
+        if concurrent is None:
+            concurrent = os.getenv("MASTER_AGENT_CONCURRENT", "true").lower() in ("1", "true", "yes")
+        if max_workers is None:
+            max_workers = int(os.getenv("MASTER_AGENT_MAX_WORKERS", "8"))
+
+        self.concurrent = concurrent
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="master-agent")
+            if concurrent
+            else None
+        )
+
         self.iqvia_agent = IQVIAAgent()
         self.clinical_agent = ClinicalAgent()
         self.patent_agent = PatentAgent()
         self.webintel_agent = WebIntelAgent()
         self.report_agent = ReportAgent()
+        self.agent_cache = agent_cache if agent_cache is not None else get_agent_cache()
 
         try:
             self.groq_client = GroqClient(api_key=groq_api_key)
-        except ValueError:
-            # If Groq API key is not available, create a dummy client that won't be used
+        except MissingAPIKeyError:
+            # Only a missing key disables AI analysis; a misconfigured LLM_PROVIDER still raises
+            print(
+                "⚠️ Master Agent: GROQ_API_KEY not set, AI analysis disabled. "
+                "Set LLM_PROVIDER=synthetic or LLM_PROVIDER=replay to run it offline."
+            )
             self.groq_client = None
 
     def query_molecule(self, molecule_name: str) -> Dict:
@@ -50,46 +112,252 @@ class MasterAgent:
         Returns:
             Dict: Aggregated results from all agents plus AI insights.
         """
-        print(f"🔬 Master Agent: Starting analysis for {molecule_name}...")
+        with span("query_molecule", molecule=molecule_name):
+            aggregated_data = self.gather_molecule_data(molecule_name)
 
-        # Gather data from all agents
-        print("📊 Gathering market data...")
-        market_data = self.iqvia_agent.query_market_data(molecule_name)
+            ai_insights, ai_recommendations = self.generate_ai_analysis(aggregated_data)
+            aggregated_data["ai_insights"] = ai_insights
+            aggregated_data["recommendations"] = ai_recommendations
 
-        print("🏥 Gathering clinical trial data...")
-        clinical_data = self.clinical_agent.query_trials(molecule_name)
+        return aggregated_data
+
+    def generate_ai_analysis(self, aggregated_data: Dict) -> Tuple[str, str]:
+        """
+        Generate the AI insights and recommendations for gathered data using Groq.
+
+        Args:
+            aggregated_data (Dict): Output of ``gather_molecule_data``.
+
+        Returns:
+            Tuple[str, str]: (AI insights, strategic recommendations).
+        """
+        with span("ai_analysis", mode=self.llm_mode):
+            if not self.groq_client:
+                return (
+                    "Groq API not configured. Please set GROQ_API_KEY (or LLM_PROVIDER) in .env",
+                    "Unable to generate recommendations without Groq API.",
+                )
+            if self.llm_mode == "combined":
+                return self._generate_combined_analysis(aggregated_data)
+            if self.concurrent:
+                insights_future = self._submit(self._generate_ai_insights, aggregated_data)
+                recommendations_future = self._submit(self._generate_recommendations, aggregated_data)
+                return insights_future.result(), recommendations_future.result()
+            return self._generate_ai_insights(aggregated_data), self._generate_recommendations(aggregated_data)
+
+    def _submit(self, func: Callable, *args) -> Future:
+        """Run ``func`` on the fan-out pool in a copy of the caller's context (keeps the trace)."""
+        return self._executor.submit(contextvars.copy_context().run, func, *args)
+
+    def ai_input_hash(self, aggregated_data: Dict) -> Optional[str]:
+        """
+        Hash the data the AI sections are generated from.
+
+        Two analyses with the same hash would send Groq the same figures, so
+        their AI sections need not be regenerated.
+
+        Args:
+            aggregated_data (Dict): Aggregated pharmaceutical data.
+
+        Returns:
+            str or None: SHA-256 hex digest, or None if a section is incomplete or errored.
+        """
+        try:
+            if any("error" in aggregated_data[section] for section in self._agent_calls()):
+                return None
+            summary = self._insights_summary(aggregated_data)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        return hashlib.sha256(summary.encode("utf-8")).hexdigest()
+
+    def gather_molecule_data(self, molecule_name: str) -> Dict:
+        """
+        Gather and aggregate the structured agent data for a molecule, without AI sections.
 
-        print("📜 Gathering patent data...")
-        patent_data = self.patent_agent.query_patents(molecule_name)
+        Args:
+            molecule_name (str): Name of the molecule to analyze.
 
-        print("🌐 Gathering web intelligence...")
-        web_data = self.webintel_agent.search_publications(molecule_name)
+        Returns:
+            Dict: Molecule, timestamp, the market/clinical/patent/web sections and
+            ``data_freshness`` (per section: served from cache?, fetched_at, age_seconds).
+        """
+        # Gather data from all agents
+        with span("gather"):
+            sections = self._gather_agent_data(molecule_name)
 
         # Aggregate all data
-        aggregated_data = {
+        return {
             "molecule": molecule_name,
             "timestamp": datetime.now().isoformat(),
-            "market_data": market_data,
-            "clinical_data": clinical_data,
-            "patent_data": patent_data,
-            "web_data": web_data,
+            "market_data": sections["market_data"][0],
+            "clinical_data": sections["clinical_data"][0],
+            "patent_data": sections["patent_data"][0],
+            "web_data": sections["web_data"][0],
+            "data_freshness": {section: freshness for section, (_, freshness) in sections.items()},
         }
 
-        # Generate AI insights using Groq
-        print("🤖 Generating AI insights...")
-        if self.groq_client:
-            ai_insights = self._generate_ai_insights(aggregated_data)
-            ai_recommendations = self._generate_recommendations(aggregated_data)
-        else:
-            ai_insights = "Groq API not configured. Please set GROQ_API_KEY in .env"
-            ai_recommendations = "Unable to generate recommendations without Groq API."
+    async def astream_ai_analysis(self, aggregated_data: Dict) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream the AI insights and recommendations for gathered data as they are generated.
 
-        aggregated_data["ai_insights"] = ai_insights
-        aggregated_data["recommendations"] = ai_recommendations
+        Both Groq completions run concurrently; their deltas are interleaved in
+        arrival order and already have markdown stripped.
 
-        print("✅ Master Agent: Analysis complete!")
+        Args:
+            aggregated_data (Dict): Output of ``gather_molecule_data``.
 
-        return aggregated_data
+        Yields:
+            Tuple[str, str]: (section, text delta), section being "ai_insights" or "recommendations".
+        """
+        if not self.groq_client:
+            yield "ai_insights", "Groq API not configured. Please set GROQ_API_KEY (or LLM_PROVIDER) in .env"
+            yield "recommendations", "Unable to generate recommendations without Groq API."
+            return
+
+        try:
+            insights_stream = self.groq_client.astream_insights(
+                {"data": self._insights_summary(aggregated_data)}
+            )
+        except Exception as e:
+            insights_stream = self._single_chunk(f"Error generating insights: {str(e)}")
+        try:
+            recommendations_stream = self.groq_client.astream_query(
+                self._recommendation_prompt(aggregated_data),
+                system_message=self.RECOMMENDATION_SYSTEM_MESSAGE,
+                max_tokens=800,
+                caller="recommendations",
+                clean_markdown=True,
+            )
+        except Exception as e:
+            recommendations_stream = self._single_chunk(f"Error generating recommendations: {str(e)}")
+
+        queue = asyncio.Queue()
+        done = object()
+
+        async def pump(section: str, stream: AsyncIterator[str]):
+            try:
+                async for delta in stream:
+                    await queue.put((section, delta))
+            finally:
+                await queue.put(done)
+
+        tasks = [
+            asyncio.create_task(pump("ai_insights", insights_stream)),
+            asyncio.create_task(pump("recommendations", recommendations_stream)),
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def _single_chunk(text: str) -> AsyncIterator[str]:
+        """Wrap a fixed string as a one-chunk async stream."""
+        yield text
+
+    def _agent_calls(self) -> Dict[str, Callable[..., Dict]]:
+        """Section name -> agent method taking the molecule name."""
+        return {
+            "market_data": self.iqvia_agent.query_market_data,
+            "clinical_data": self.clinical_agent.query_trials,
+            "patent_data": self.patent_agent.query_patents,
+            "web_data": self.webintel_agent.search_publications,
+        }
+
+    def _gather_agent_data(self, molecule_name: str) -> Dict:
+        """
+        Query every data agent for a molecule, in parallel when concurrent mode is on.
+
+        A failing agent does not abort the analysis: its section is replaced by
+        an ``{"molecule": ..., "error": ...}`` dict.
+
+        Args:
+            molecule_name (str): Name of the molecule to analyze.
+
+        Returns:
+            Dict: Section name -> (agent result, freshness) for market_data,
+            clinical_data, patent_data and web_data.
+        """
+        if not self.concurrent:
+            return {section: self.fetch_section(section, molecule_name) for section in self._agent_calls()}
+
+        futures = {
+            section: self._submit(self.fetch_section, section, molecule_name)
+            for section in self._agent_calls()
+        }
+        return {section: future.result() for section, future in futures.items()}
+
+    def fetch_section(
+        self, section: str, molecule_name: str, *args, raise_errors: bool = False, use_cache: bool = True
+    ) -> Tuple[Dict, Dict]:
+        """
+        Get one agent's result for a molecule, from the agent cache when fresh.
+
+        Failed agent calls are never cached; they are returned as an error dict
+        unless ``raise_errors`` is set.
+
+        Args:
+            section (str): "market_data", "clinical_data", "patent_data" or "web_data".
+            molecule_name (str): Name of the molecule.
+            *args: Extra arguments for the agent method (part of the cache key).
+            raise_errors (bool): Re-raise agent exceptions instead of returning an error dict.
+            use_cache (bool): Serve from the cache when fresh; False always re-runs the
+                agent (the new result is still cached).
+
+        Returns:
+            Tuple[Dict, Dict]: (agent result, freshness) where freshness is
+            {"cached": bool, "fetched_at": ISO time, "age_seconds": float}.
+        """
+        with span(section, cached=False) as attributes:
+            if self.agent_cache is not None and use_cache:
+                cached = self.agent_cache.get(section, molecule_name, args)
+                if cached is not None:
+                    attributes["cached"] = True
+                    result, stored_at = cached
+                    return result, self._freshness(True, stored_at)
+
+            agent_call = self._agent_calls()[section]
+            try:
+                result = self.call_agent(agent_call, molecule_name, *args)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                attributes["error"] = str(e)
+                return (
+                    {"molecule": molecule_name, "error": f"Error gathering {section}: {str(e)}"},
+                    self._freshness(False, time.time()),
+                )
+            stored_at = time.time()
+            if self.agent_cache is not None:
+                stored_at = self.agent_cache.put(section, molecule_name, result, args)
+            return result, self._freshness(False, stored_at)
+
+    @staticmethod
+    def call_agent(method: Callable, *args):
+        """Call a data-agent method, recording its latency (and failure) in the metrics."""
+        labels = {"agent": type(method.__self__).__name__, "method": method.__name__}
+        try:
+            with AGENT_DURATION.time(**labels):
+                return method(*args)
+        except Exception:
+            AGENT_ERRORS.inc(**labels)
+            raise
+
+    @staticmethod
+    def _freshness(cached: bool, fetched_at: float) -> Dict:
+        """Describe where a section came from and how old it is."""
+        return {
+            "cached": cached,
+            "fetched_at": datetime.fromtimestamp(fetched_at).isoformat(),
+            "age_seconds": round(max(0.0, time.time() - fetched_at), 3),
+        }
 
     def _generate_ai_insights(self, aggregated_data: Dict) -> str:
         """
@@ -102,31 +370,193 @@ class MasterAgent:
             str: AI-generated insights.
         """
         try:
-            # Prepare summary for Groq
-            summary = f"""
+            insights = self.groq_client.generate_insights(
+                {"data": self._insights_summary(aggregated_data)}
+            )
+            return insights
+        except Exception as e:
+            return f"Error generating insights: {str(e)}"
+
+    def _insights_summary(self, aggregated_data: Dict) -> str:
+        """
+        Build the compact data summary sent to Groq for insight generation.
+
+        Args:
+            aggregated_data (Dict): All aggregated pharmaceutical data.
+
+        Returns:
+            str: Plain-text summary of the key market, clinical, patent and publication figures.
+        """
+        market_data = aggregated_data['market_data']
+        clinical_data = aggregated_data['clinical_data']
+        patent_data = aggregated_data['patent_data']
+        web_data = aggregated_data['web_data']
+        figure = self._format_figure
+        return f"""
             Molecule: {aggregated_data['molecule']}
             
             Market Data:
-            - Market Size: ${aggregated_data['market_data'].get('market_size_usd', 'N/A'):,.0f}
-            - Growth Rate: {aggregated_data['market_data'].get('growth_rate', 0) * 100:.1f}%
-            - Therapeutic Area: {aggregated_data['market_data'].get('therapeutic_area', 'N/A')}
+            - Market Size: {figure(market_data, 'market_size_usd', '${:,.0f}')}
+            - Growth Rate: {figure(market_data, 'growth_rate', '{:.1f}%', default=0, scale=100)}
+            - Therapeutic Area: {market_data.get('therapeutic_area', 'N/A')}
             
             Clinical Development:
-            - Active Trials: {aggregated_data['clinical_data'].get('trials_count', 0)}
-            - Total Enrollment: {aggregated_data['clinical_data'].get('total_enrollment', 0) if 'trials_count' in aggregated_data['clinical_data'] else 'N/A'}
+            - Active Trials: {figure(clinical_data, 'trials_count', default=0)}
+            - Total Enrollment: {figure(clinical_data, 'total_enrollment', default=0) if 'trials_count' in clinical_data else 'N/A'}
             
             Patent Landscape:
-            - Total Patents: {aggregated_data['patent_data'].get('total_patents', 0)}
-            - Active Patents: {aggregated_data['patent_data'].get('active_patents', 0)}
+            - Total Patents: {figure(patent_data, 'total_patents', default=0)}
+            - Active Patents: {figure(patent_data, 'active_patents', default=0)}
             
             Publications:
-            - Recent Publications: {aggregated_data['web_data'].get('total_publications_found', 0)}
+            - Recent Publications: {figure(web_data, 'total_publications_found', default=0)}
             """
 
-            insights = self.groq_client.generate_insights({"data": summary})
-            return insights
+    @staticmethod
+    def _format_figure(section: Dict, key: str, template: str = "{}", default=None, scale: float = 1) -> str:
+        """
+        Format one numeric figure of an agent section for the summary.
+
+        Args:
+            section (Dict): Agent result (possibly an error dict from a failed agent).
+            key (str): Figure to format.
+            template (str): ``str.format`` template for the value.
+            default: Value used when the key is missing.
+            scale (float): Multiplier applied before formatting (e.g. 100 for percentages).
+
+        Returns:
+            str: Formatted figure, or "N/A" when the section errored or the value is not a number.
+        """
+        value = section.get(key, default)
+        if "error" in section or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return "N/A"
+        return template.format(value * scale)
+
+    def _generate_combined_analysis(self, aggregated_data: Dict) -> Tuple[str, str]:
+        """
+        Generate insights and recommendations with a single structured Groq call.
+
+        Falls back to the separate per-section calls when the response cannot
+        be parsed into both sections.
+
+        Args:
+            aggregated_data (Dict): All aggregated pharmaceutical data.
+
+        Returns:
+            Tuple[str, str]: (AI insights, strategic recommendations), markdown removed.
+        """
+        try:
+            # Only replies that parse are cached, so a malformed one is not replayed until the TTL
+            response = self.groq_client.query(
+                self._analysis_prompt(aggregated_data),
+                system_message=self.ANALYSIS_SYSTEM_MESSAGE,
+                max_tokens=1500,
+                caller="analysis",
+                validate=lambda reply: self.parse_analysis_response(reply) is not None,
+            )
         except Exception as e:
-            return f"Error generating insights: {str(e)}"
+            return f"Error generating insights: {str(e)}", f"Error generating recommendations: {str(e)}"
+
+        if response.startswith("Error querying Groq API"):
+            return response, response
+
+        sections = self.parse_analysis_response(response)
+        if sections is None:
+            print("⚠️ Unparseable combined analysis, falling back to separate calls")
+            if self.concurrent:
+                recommendations_future = self._submit(self._generate_recommendations, aggregated_data)
+                return self._generate_ai_insights(aggregated_data), recommendations_future.result()
+            return self._generate_ai_insights(aggregated_data), self._generate_recommendations(aggregated_data)
+
+        insights, recommendations = sections
+        return (
+            self.groq_client._clean_markdown(insights),
+            self.groq_client._clean_markdown(recommendations),
+        )
+
+    def _analysis_prompt(self, aggregated_data: Dict) -> str:
+        """
+        Build the combined insights + recommendations prompt.
+
+        Args:
+            aggregated_data (Dict): All aggregated pharmaceutical data.
+
+        Returns:
+            str: Prompt asking for a JSON object with "insights" and "recommendations".
+        """
+        return f"""
+            Analyze the following pharmaceutical research data:
+            {self._insights_summary(aggregated_data)}
+            Return a JSON object with exactly two string fields:
+            "insights": key opportunities, risk factors, market potential assessment
+            and clinical viability.
+            "recommendations": strategic recommendations for drug repurposing considering
+            market attractiveness, clinical development status, patent landscape and
+            freedom-to-operate, and scientific trends, with actionable next steps for R&D teams.
+            Use plain text inside the strings (numbered lists are fine, no markdown).
+            """
+
+    @staticmethod
+    def parse_analysis_response(response: str) -> Optional[Tuple[str, str]]:
+        """
+        Extract the insights and recommendations sections from a combined response.
+
+        Accepts a bare JSON object, one wrapped in a code fence or surrounded by
+        prose, list-valued sections, and as a last resort plain text with
+        "Insights:" / "Recommendations:" headings.
+
+        Args:
+            response (str): Raw model output.
+
+        Returns:
+            Tuple[str, str] or None: (insights, recommendations), or None if either is missing.
+        """
+        if not response:
+            return None
+
+        def as_text(value) -> str:
+            if isinstance(value, list):
+                return "\n".join(as_text(item) for item in value)
+            if isinstance(value, dict):
+                return "\n".join(f"{key}: {as_text(item)}" for key, item in value.items())
+            return str(value).strip() if value is not None else ""
+
+        decoder = json.JSONDecoder(strict=False)
+
+        def decode(text: str):
+            # raw_decode stops at the end of the first object, ignoring whatever prose follows
+            for attempt in (text, re.sub(r",\s*([}\]])", r"\1", text)):  # also tolerate trailing commas
+                try:
+                    return decoder.raw_decode(attempt)[0]
+                except ValueError:
+                    continue
+            return None
+
+        candidates = [response.strip()]
+        fenced = re.search(r"```(?:json)?\s*(.*?)```", response, re.DOTALL)
+        if fenced:
+            candidates.append(fenced.group(1).strip())
+        start = response.find("{")
+        if start != -1:
+            candidates.append(response[start:])
+
+        for candidate in candidates:
+            parsed = decode(candidate)
+            if not isinstance(parsed, dict):
+                continue
+            fields = {key.lower().strip(): value for key, value in parsed.items()}
+            insights = as_text(fields.get("insights", fields.get("ai_insights")))
+            recommendations = as_text(fields.get("recommendations"))
+            if insights and recommendations:
+                return insights, recommendations
+
+        headed = re.search(
+            r"^[#*\s]*(?:ai\s+)?insights[*:\s]*(.*?)^[#*\s]*recommendations[*:\s]*(.*)",
+            response, re.DOTALL | re.IGNORECASE | re.MULTILINE,
+        )
+        if headed and headed.group(1).strip() and headed.group(2).strip():
+            return headed.group(1).strip(), headed.group(2).strip()
+        return None
 
     def _generate_recommendations(self, aggregated_data: Dict) -> str:
         """
@@ -139,9 +569,30 @@ class MasterAgent:
             str: Strategic recommendations.
         """
         try:
-            recommendation_prompt = f"""
-            Based on the pharmaceutical research analysis for {aggregated_data['molecule']}, 
-            provide strategic recommendations for drug repurposing opportunities considering:
+            recommendations = self.groq_client.query(
+                self._recommendation_prompt(aggregated_data),
+                system_message=self.RECOMMENDATION_SYSTEM_MESSAGE,
+                max_tokens=800,
+                caller="recommendations",
+            )
+            return self.groq_client._clean_markdown(recommendations)
+        except Exception as e:
+            return f"Error generating recommendations: {str(e)}"
+
+    def _recommendation_prompt(self, aggregated_data: Dict) -> str:
+        """
+        Build the strategic-recommendations prompt.
+
+        Args:
+            aggregated_data (Dict): All aggregated pharmaceutical data.
+
+        Returns:
+            str: Recommendation prompt for Groq.
+        """
+        return f"""
+            Based on the pharmaceutical research analysis for {aggregated_data['molecule']}:
+            {self._insights_summary(aggregated_data)}
+            Provide strategic recommendations for drug repurposing opportunities considering:
             
             1. Market attractiveness (size and growth)
             2. Clinical development status (ongoing trials)
@@ -151,15 +602,6 @@ class MasterAgent:
             Focus on actionable next steps for R&D teams.
             """
 
-            recommendations = self.groq_client.query(
-                recommendation_prompt,
-                system_message="You are a pharmaceutical strategy consultant. Provide actionable recommendations.",
-                max_tokens=800,
-            )
-            return self.groq_client._clean_markdown(recommendations)
-        except Exception as e:
-            return f"Error generating recommendations: {str(e)}"
-
     def get_trends(self) -> Dict:
         """
         Get trending therapeutic areas and molecules.
@@ -167,12 +609,13 @@ class MasterAgent:
         Returns:
             Dict: Trending opportunities with AI analysis.
         """
-        print("📈 Master Agent: Analyzing trends...")
-
         # Get trending data from various agents
-        market_trends = self.iqvia_agent.get_therapeutic_area_trends()
-        clinical_trends = self.clinical_agent.get_trending_conditions()
-        web_trends = self.webintel_agent.get_trending_therapeutic_areas()
+        with span("market_trends"):
+            market_trends = self.call_agent(self.iqvia_agent.get_therapeutic_area_trends)
+        with span("clinical_trends"):
+            clinical_trends = self.call_agent(self.clinical_agent.get_trending_conditions)
+        with span("web_trends"):
+            web_trends = self.call_agent(self.webintel_agent.get_trending_therapeutic_areas)
 
         # Transform data for frontend
         trending_therapeutic_areas = []
@@ -211,10 +654,13 @@ class MasterAgent:
         # Generate AI summary
         if self.groq_client:
             try:
+                # Leave the timestamp out so repeat calls produce an identical, cacheable prompt
+                trend_inputs = {k: v for k, v in trends_data.items() if k != "timestamp"}
                 trend_summary = self.groq_client.query(
-                    f"Summarize the key pharmaceutical trends based on: {str(trends_data)}. Focus on drug repurposing opportunities.",
+                    f"Summarize the key pharmaceutical trends based on: {str(trend_inputs)}. Focus on drug repurposing opportunities.",
                     system_message="You are a pharmaceutical trends analyst.",
                     max_tokens=500,
+                    caller="trends",
                 )
                 trends_data["ai_summary"] = self.groq_client._clean_markdown(trend_summary)
             except Exception as e:
@@ -234,39 +680,115 @@ class MasterAgent:
         Returns:
             str or BytesIO: Report in requested format.
         """
-        print(f"📝 Master Agent: Generating {format.upper()} report...")
-
         if format.lower() == "json":
-            return self.report_agent.generate_json_report(aggregated_data, molecule_name)
+            with span("render_json"), REPORT_RENDER_DURATION.time(format="json"):
+                return self.report_agent.generate_json_report(aggregated_data, molecule_name)
         elif format.lower() == "pdf":
-            return self.report_agent.generate_pdf_report(aggregated_data, molecule_name)
+            with span("render_pdf"), REPORT_RENDER_DURATION.time(format="pdf"):
+                return self.report_agent.generate_pdf_report(aggregated_data, molecule_name)
         else:
             raise ValueError(f"Unsupported report format: {format}. Use 'json' or 'pdf'.")
 
-    def batch_analyze(self, molecule_list: list) -> Dict:
+    def batch_analyze(self, molecule_list: list, max_workers: int = None) -> Dict:
         """
         Analyze multiple molecules in batch.
 
+        Names are normalized and de-duplicated first, then analyzed in parallel.
+
         Args:
             molecule_list (list): List of molecule names.
+            max_workers (int, optional): Molecules analyzed concurrently. If None,
+                reads BATCH_MAX_WORKERS (default: 4).
 
         Returns:
-            Dict: Analysis results for all molecules.
+            Dict: Analysis results for all molecules, in input order.
         """
-        print(f"⚙️  Master Agent: Starting batch analysis for {len(molecule_list)} molecules...")
+        molecules = self.dedupe_molecules(molecule_list)
+        print(f"⚙️  Master Agent: Starting batch analysis for {len(molecules)} molecules...")
+
+        completed = dict(self.iter_batch_analyze(molecules, max_workers=max_workers))
 
         batch_results = {
             "timestamp": datetime.now().isoformat(),
-            "molecules_analyzed": len(molecule_list),
-            "results": {},
+            "molecules_analyzed": len(molecules),
+            **self.skipped_molecule_counts(molecule_list),
+            "results": {molecule: completed[molecule] for molecule in molecules},
         }
 
-        for molecule in molecule_list:
-            try:
-                result = self.query_molecule(molecule)
-                batch_results["results"][molecule] = result
-            except Exception as e:
-                batch_results["results"][molecule] = {"error": str(e)}
-
         print("✅ Master Agent: Batch analysis complete!")
         return batch_results
+
+    def iter_batch_analyze(self, molecule_list: list, max_workers: int = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Analyze molecules on a bounded worker pool, yielding each result as it completes.
+
+        Args:
+            molecule_list (list): List of molecule names (normalized and de-duplicated here).
+            max_workers (int, optional): Molecules analyzed concurrently. If None,
+                reads BATCH_MAX_WORKERS (default: 4).
+
+        Yields:
+            Tuple[str, Dict]: (molecule name, analysis result or {"error": ...}), in completion order.
+        """
+        molecules = self.dedupe_molecules(molecule_list)
+        if not molecules:
+            return
+        if max_workers is None:
+            max_workers = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+        max_workers = max(1, min(max_workers, len(molecules)))
+
+        # A dedicated pool per batch: query_molecule itself fans out on self._executor,
+        # so sharing that pool here could starve it.
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-analyze")
+        try:
+            futures = {
+                executor.submit(contextvars.copy_context().run, self.query_molecule, molecule): molecule
+                for molecule in molecules
+            }
+            for future in as_completed(futures):
+                molecule = futures[future]
+                try:
+                    yield molecule, future.result()
+                except Exception as e:
+                    yield molecule, {"error": str(e)}
+        finally:
+            # Stop queued work if the consumer goes away early (e.g. client disconnect)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def dedupe_molecules(molecule_list: list) -> List[str]:
+        """
+        Drop blank and duplicate molecule names, keeping the first spelling of each.
+
+        Args:
+            molecule_list (list): Raw molecule names.
+
+        Returns:
+            List[str]: Trimmed, unique molecule names in input order.
+        """
+        seen = set()
+        molecules = []
+        for molecule in molecule_list:
+            key = normalize_molecule_name(molecule)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            molecules.append(" ".join(str(molecule).split()))
+        return molecules
+
+    @staticmethod
+    def skipped_molecule_counts(molecule_list: list) -> Dict[str, int]:
+        """
+        Count the names ``dedupe_molecules`` drops, by reason.
+
+        Args:
+            molecule_list (list): Raw molecule names.
+
+        Returns:
+            Dict[str, int]: "blank_skipped" (empty or whitespace-only names) and
+            "duplicates_skipped" (repeats of an earlier name once normalized).
+        """
+        keys = [normalize_molecule_name(molecule) for molecule in molecule_list]
+        blank = sum(1 for key in keys if not key)
+        unique = len(set(keys) - {""})
+        return {"blank_skipped": blank, "duplicates_skipped": len(keys) - blank - unique}
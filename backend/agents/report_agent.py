@@ -1,27 +1,13 @@
 """
 Report Generation Agent
 Generates downloadable PDF and JSON reports from aggregated pharmaceutical research data.
-Uses ReportLab for PDF generation.
+Uses ReportLab for PDF generation (imported on first PDF render to keep startup fast).
 """
 
 import json
 from typing import Dict
 from datetime import datetime
 from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-    PageBreak,
-    Image,
-)
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 
 
 class ReportAgent:
@@ -30,17 +16,35 @@ class ReportAgent:
     Aggregates data from all agents into a single, professional document.
     """
 
+    # Bump whenever the PDF layout changes so cached renders are invalidated
+    TEMPLATE_VERSION = "1"
+
     def __init__(self):
-        """Initialize report agent with styling."""
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        """Initialize report agent (PDF styles are built on first use)."""
+        self._styles = None
+
+    @property
+    def styles(self):
+        """ReportLab stylesheet with the custom report styles."""
+        if self._styles is None:
+            from reportlab.lib.styles import getSampleStyleSheet
+
+            styles = getSampleStyleSheet()
+            self._setup_custom_styles(styles)
+            self._styles = styles
+        return self._styles
 
-    def _setup_custom_styles(self):
+    @staticmethod
+    def _setup_custom_styles(styles):
         """Set up custom paragraph styles for reports."""
-        self.styles.add(
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+        from reportlab.lib.styles import ParagraphStyle
+
+        styles.add(
             ParagraphStyle(
                 name="CustomTitle",
-                parent=self.styles["Heading1"],
+                parent=styles["Heading1"],
                 fontSize=24,
                 textColor=colors.HexColor("#1f4788"),
                 spaceAfter=30,
@@ -48,20 +52,20 @@ class ReportAgent:
                 fontName="Helvetica-Bold",
             )
         )
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CustomHeading",
-                parent=self.styles["Heading2"],
+                parent=styles["Heading2"],
                 fontSize=14,
                 textColor=colors.HexColor("#2e5c8a"),
                 spaceAfter=12,
                 fontName="Helvetica-Bold",
             )
         )
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CustomBody",
-                parent=self.styles["BodyText"],
+                parent=styles["BodyText"],
                 fontSize=11,
                 alignment=TA_JUSTIFY,
                 spaceAfter=12,
@@ -112,6 +116,11 @@ class ReportAgent:
         Returns:
             BytesIO: PDF file as bytes buffer.
         """
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
         buffer = BytesIO()
         doc = SimpleDocTemplate(
             buffer,
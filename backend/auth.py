@@ -11,11 +11,13 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+# bcrypt cost factor for new hashes; stored hashes below it are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt(rounds=4)
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt (blocking; run it in the auth executor pool)."""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode(), salt).decode()
 
 
@@ -24,6 +26,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash ("$2b$<cost>$...") uses a cost below BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
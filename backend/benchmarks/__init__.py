@@ -0,0 +1,5 @@
+"""
+Benchmarks
+Standalone performance scripts; run them from the backend directory, e.g.
+``python -m benchmarks.bench_password_hashing``.
+"""
@@ -0,0 +1,317 @@
+"""
+End-to-End API Benchmark
+Boots ``main.app`` in-process against a stub Groq server (configurable latency and
+error rate) and either a real MongoDB or an in-memory stand-in, drives the main
+endpoints at a fixed concurrency and reports p50/p95/p99 latency, throughput,
+errors and peak RSS per scenario.
+
+Results can be written as a JSON baseline and later runs compared against it;
+a p95 or throughput regression beyond the tolerance exits non-zero.
+
+Usage:
+    python -m benchmarks.bench_e2e --requests 50 --concurrency 10 --llm-latency-ms 200
+    python -m benchmarks.bench_e2e --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_e2e --compare benchmarks/baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from .bench_password_hashing import percentile
+from .stub_llm_server import StubLLMServer
+
+SCENARIOS = ["query_molecule", "batch_analyze", "generate_report_pdf", "get_trends", "auth"]
+HOT_MOLECULES = ["aspirin", "metformin", "ibuprofen", "doxycycline", "atorvastatin"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+class InMemoryCollection:
+    """
+    Minimal async stand-in for the MongoDB collection methods used by the auth
+    and report routes: equality-filter ``find_one``, ``insert_one`` and
+    ``update_one`` with ``$set``.
+    """
+
+    def __init__(self):
+        self._documents = []
+
+    @staticmethod
+    def _matches(document: Dict, query: Dict) -> bool:
+        return all(document.get(field) == value for field, value in query.items())
+
+    async def find_one(self, query: Dict, projection=None) -> Optional[Dict]:
+        for document in self._documents:
+            if self._matches(document, query):
+                return copy.deepcopy(document)
+        return None
+
+    async def insert_one(self, document: Dict):
+        from bson import ObjectId
+
+        document.setdefault("_id", ObjectId())
+        self._documents.append(copy.deepcopy(document))
+        return type("InsertOneResult", (), {"inserted_id": document["_id"]})()
+
+    async def update_one(self, query: Dict, update: Dict):
+        for document in self._documents:
+            if self._matches(document, query):
+                document.update(update.get("$set", {}))
+                return type("UpdateResult", (), {"matched_count": 1})()
+        return type("UpdateResult", (), {"matched_count": 0})()
+
+
+def use_in_memory_database():
+    """Route the auth and report routes to in-memory collections."""
+    import routes_auth
+    import routes_reports
+
+    users, reports = InMemoryCollection(), InMemoryCollection()
+    routes_auth.get_users_collection = lambda: users
+    routes_reports.get_reports_collection = lambda: reports
+    routes_reports.get_users_collection = lambda: users
+
+
+def molecule_names(mode: str) -> Callable[[], str]:
+    """
+    Molecule name generator.
+
+    Args:
+        mode (str): "unique" for a new name per request (every cache misses),
+            "hot" to cycle a few known molecules (exercises the caches).
+
+    Returns:
+        Callable[[], str]: Function returning the next molecule name.
+    """
+    if mode == "hot":
+        cycle = itertools.cycle(HOT_MOLECULES)
+        return lambda: next(cycle)
+    counter = itertools.count()
+    return lambda: f"benchmol-{uuid.uuid4().hex[:6]}-{next(counter)}"
+
+
+async def run_scenario(client, name: str, requests: int, concurrency: int,
+                       next_molecule: Callable[[], str], batch_size: int) -> Dict:
+    """
+    Drive one scenario and collect latency statistics.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the in-process app.
+        name (str): Scenario name (see SCENARIOS).
+        requests (int): Iterations to run.
+        concurrency (int): Maximum concurrent iterations.
+        next_molecule (Callable): Molecule name generator.
+        batch_size (int): Molecules per /batch_analyze call.
+
+    Returns:
+        Dict: Latency percentiles (ms), throughput (req/s), errors and peak RSS.
+    """
+    async def query_molecule():
+        return [await client.post("/query_molecule", json={"molecule_name": next_molecule()})]
+
+    async def batch_analyze():
+        return [await client.post("/batch_analyze", json=[next_molecule() for _ in range(batch_size)])]
+
+    async def generate_report_pdf():
+        return [await client.get(f"/generate_report_pdf/{next_molecule()}")]
+
+    async def get_trends():
+        return [await client.get("/get_trends")]
+
+    async def auth():
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        register = await client.post(
+            "/api/auth/register", json={"name": "Bench User", "email": email, "password": "benchpass123"}
+        )
+        login = await client.post("/api/auth/login", json={"email": email, "password": "benchpass123"})
+        token = login.json().get("access_token", "") if login.status_code == 200 else ""
+        me = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+        return [register, login, me]
+
+    iteration = {
+        "query_molecule": query_molecule,
+        "batch_analyze": batch_analyze,
+        "generate_report_pdf": generate_report_pdf,
+        "get_trends": get_trends,
+        "auth": auth,
+    }[name]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                responses = await iteration()
+                if any(response.status_code >= 400 for response in responses):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_benchmark(args) -> Dict:
+    """
+    Boot the app and run every selected scenario.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line options.
+
+    Returns:
+        Dict: Run configuration and per-scenario results.
+    """
+    import httpx
+    import main
+    from database import wait_for_connection
+
+    database = args.database
+    if database == "auto":
+        database = "mongo" if wait_for_connection(2) else "memory"
+    if database == "memory":
+        use_in_memory_database()
+
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            next_molecule = molecule_names(args.molecules)
+            results = {}
+            for scenario in args.scenarios:
+                results[scenario] = await run_scenario(
+                    client, scenario, args.requests, args.concurrency, next_molecule, args.batch_size
+                )
+    finally:
+        await main.app.router.shutdown()
+
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_error_rate": args.llm_error_rate,
+            "molecules": args.molecules,
+            "batch_size": args.batch_size,
+            "database": database,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare a run against a baseline.
+
+    Args:
+        results (Dict): Per-scenario results of this run.
+        baseline (Dict): Per-scenario results of the baseline run.
+        tolerance (float): Allowed relative regression (0.2 = 20%).
+
+    Returns:
+        List[str]: Descriptions of regressions (empty if none).
+    """
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p95 {current['p95_ms']:.1f} ms vs {previous['p95_ms']:.1f} ms")
+        if previous["throughput"] and current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{scenario}: throughput {current['throughput']:.1f} vs {previous['throughput']:.1f} req/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end API benchmark with a stub LLM")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=50, help="iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5, help="molecules per /batch_analyze call")
+    parser.add_argument("--molecules", choices=["unique", "hot"], default="unique",
+                        help="unique names defeat every cache; hot cycles a few known molecules")
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--database", choices=["auto", "mongo", "memory"], default="auto")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression vs baseline")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms,
+                         error_rate=args.llm_error_rate).start()
+    # Must be set before the app (and the Groq SDK) is imported
+    os.environ["GROQ_BASE_URL"] = stub.base_url
+    os.environ.setdefault("GROQ_API_KEY", "stub-key")
+    os.environ["JOB_WORKERS"] = "0"
+
+    try:
+        report = asyncio.run(run_benchmark(args))
+    finally:
+        stub.stop()
+    report["config"]["llm_requests"] = stub.requests
+
+    print(f"📈 End-to-end benchmark: {args.requests} iterations/scenario, concurrency {args.concurrency}, "
+          f"LLM {args.llm_latency_ms:.0f} ms ± {args.llm_jitter_ms:.0f} ms, error rate {args.llm_error_rate}, "
+          f"database {report['config']['database']}")
+    print(f"{'scenario':<20} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'rss MiB':>8}")
+    for scenario, result in report["results"].items():
+        print(f"{scenario:<20} {result['throughput']:>8.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+              f"{result['p99_ms']:>9.1f} {result['errors']:>7} {result['peak_rss_mb']:>8.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print("❌ Regressions vs baseline:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
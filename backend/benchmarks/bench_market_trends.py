@@ -0,0 +1,116 @@
+"""
+Market Trend Aggregation Benchmark
+Generates a synthetic molecule x region market table and times the therapeutic-area
+trend aggregation as the columnar group-by against the original per-molecule dict loop,
+plus dataset build time and single-molecule lookups.
+
+Usage:
+    python -m benchmarks.bench_market_trends --rows 1000000 --areas 40 --regions 4
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from utils.market_dataset import MarketDataset
+
+
+def synthetic_columns(rows: int, areas: int, regions: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Build raw market columns with ``regions`` rows per molecule.
+
+    Args:
+        rows (int): Total rows (rounded down to a multiple of ``regions``).
+        areas (int): Number of therapeutic areas.
+        regions (int): Regions per molecule.
+        seed (int): Random seed.
+
+    Returns:
+        Dict[str, np.ndarray]: Columns accepted by MarketDataset.
+    """
+    rng = np.random.default_rng(seed)
+    molecules = rows // regions
+    molecule_ids = np.repeat(np.arange(molecules), regions)
+    molecule_areas = rng.integers(0, areas, molecules)
+    return {
+        "molecule": np.char.add("mol-", molecule_ids.astype(str)),
+        "region": np.tile(np.array([f"Region {i}" for i in range(regions)]), molecules),
+        "therapeutic_area": np.char.add("Area ", molecule_areas[molecule_ids].astype(str)),
+        "market_size_usd": rng.uniform(1e6, 1e9, molecules * regions),
+        "growth_rate": rng.uniform(-0.02, 0.12, molecules * regions),
+    }
+
+
+def loop_trends(records: Dict[str, Dict]) -> List[Dict]:
+    """The pre-columnar aggregation: one Python iteration per molecule."""
+    therapeutic_areas = {}
+    for data in records.values():
+        area = therapeutic_areas.setdefault(data["therapeutic_area"], {
+            "area": data["therapeutic_area"], "total_market_size": 0, "avg_growth_rate": 0, "molecule_count": 0,
+        })
+        area["total_market_size"] += data["market_size_usd"]
+        area["avg_growth_rate"] += data["growth_rate"]
+        area["molecule_count"] += 1
+    for area in therapeutic_areas.values():
+        area["avg_growth_rate"] = area["avg_growth_rate"] / area["molecule_count"]
+    return sorted(therapeutic_areas.values(), key=lambda x: x["avg_growth_rate"], reverse=True)[:5]
+
+
+def best_of(repeat: int, function) -> float:
+    """Fastest of ``repeat`` calls, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Therapeutic-area trend aggregation benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--areas", type=int, default=40)
+    parser.add_argument("--regions", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    columns = synthetic_columns(args.rows, args.areas, args.regions)
+    started = time.perf_counter()
+    dataset = MarketDataset(columns)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # The same molecules in the nested per-molecule shape the dict loop iterated
+    records = {
+        str(name): {
+            "therapeutic_area": str(dataset.areas[area]),
+            "market_size_usd": float(size),
+            "growth_rate": float(growth),
+        }
+        for name, area, size, growth in zip(
+            dataset.molecules, dataset.molecule_area_codes, dataset.molecule_market_size, dataset.molecule_growth
+        )
+    }
+
+    vectorized_ms = best_of(args.repeat, dataset.therapeutic_area_trends)
+    loop_ms = best_of(args.repeat, lambda: loop_trends(records))
+    lookup_ms = best_of(args.repeat, lambda: dataset.molecule_record(str(dataset.molecules[-1])))
+
+    vectorized, loop = dataset.therapeutic_area_trends(), loop_trends(records)
+    agree = [area["area"] for area in vectorized] == [area["area"] for area in loop] and all(
+        abs(a["total_market_size"] - b["total_market_size"]) <= 1e-6 * b["total_market_size"]
+        and a["molecule_count"] == b["molecule_count"]
+        for a, b in zip(vectorized, loop)
+    )
+
+    print(f"📊 {len(dataset):,} rows, {len(records):,} molecules, {len(dataset.areas)} areas")
+    print(f"   dataset build:          {build_ms:>9.1f} ms")
+    print(f"   trends (vectorized):    {vectorized_ms:>9.2f} ms")
+    print(f"   trends (dict loop):     {loop_ms:>9.2f} ms  ({loop_ms / vectorized_ms:.0f}x slower)")
+    print(f"   molecule lookup:        {lookup_ms:>9.3f} ms")
+    print(f"   {'✅' if agree else '❌'} top areas {'match' if agree else 'differ'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Password Hashing Benchmark
+Measures registration (hash) and login (verify) throughput and latency through
+the auth executor pool, as the API handlers run them, for one or more bcrypt costs.
+
+Usage:
+    python -m benchmarks.bench_password_hashing --rounds 10 12 --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from auth import hash_password, verify_password
+from utils.executors import AUTH_POOL, get_executor, run_blocking, shutdown_executors
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        samples (List[float]): Measurements.
+        pct (float): Percentile in [0, 100].
+
+    Returns:
+        float: The percentile value (0.0 for no samples).
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+async def run_phase(operation, args_list: List[tuple], concurrency: int) -> Dict:
+    """
+    Run ``operation`` once per argument tuple with bounded concurrency.
+
+    Args:
+        operation (Callable): Blocking function run in the auth pool.
+        args_list (List[tuple]): Arguments for each simulated request.
+        concurrency (int): Maximum in-flight requests.
+
+    Returns:
+        Dict: Request count, throughput (req/s) and p50/p99 latency (ms).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request(args):
+        async with semaphore:
+            started = time.perf_counter()
+            await run_blocking(AUTH_POOL, operation, *args)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(args) for args in args_list))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(args_list),
+        "throughput": len(args_list) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def benchmark(rounds: int, requests: int, concurrency: int) -> Dict[str, Dict]:
+    """
+    Benchmark registration and login at one bcrypt cost.
+
+    Args:
+        rounds (int): bcrypt cost factor.
+        requests (int): Simulated requests per phase.
+        concurrency (int): Maximum in-flight requests.
+
+    Returns:
+        Dict[str, Dict]: "register" and "login" phase results.
+    """
+    passwords = [f"benchmark-password-{i}" for i in range(requests)]
+    register = await run_phase(
+        lambda password: hash_password(password, rounds), [(p,) for p in passwords], concurrency
+    )
+    hashes = [hash_password(p, rounds) for p in passwords[:min(requests, 20)]]
+    login = await run_phase(
+        verify_password,
+        [(passwords[i % len(hashes)], hashes[i % len(hashes)]) for i in range(requests)],
+        concurrency,
+    )
+    return {"register": register, "login": login}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt cost factors through the auth pool")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    workers = get_executor(AUTH_POOL).max_workers
+    print(f"🔐 bcrypt benchmark: {args.requests} requests/phase, concurrency {args.concurrency}, "
+          f"{workers} auth workers")
+    print(f"{'cost':>4}  {'phase':<8}  {'req/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}")
+    try:
+        for rounds in args.rounds:
+            results = asyncio.run(benchmark(rounds, args.requests, args.concurrency))
+            for phase, result in results.items():
+                print(f"{rounds:>4}  {phase:<8}  {result['throughput']:>8.1f}  "
+                      f"{result['p50_ms']:>8.1f}  {result['p99_ms']:>8.1f}")
+    finally:
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
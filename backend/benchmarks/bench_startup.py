@@ -0,0 +1,158 @@
+"""
+Startup Benchmark
+Measures cold-start cost of the API: ``import main`` time with a ``-X importtime``
+breakdown of the heaviest top-level packages, and time-to-first-request for a fresh
+uvicorn process answering ``/health``. Exits non-zero when a budget is exceeded, so
+it can gate CI.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 3 --import-budget-ms 1500 --first-request-budget-ms 4000
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))
+STARTUP_FIRST_REQUEST_BUDGET_MS = float(os.getenv("STARTUP_FIRST_REQUEST_BUDGET_MS", "4000"))
+
+
+def measure_import(module: str = "main") -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Import a module in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        module (str): Module to import.
+
+    Returns:
+        Tuple[float, List[Tuple[str, float]]]: Cumulative import time of ``module``
+        in ms, and (top-level package, cumulative ms) pairs, heaviest first.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    total_ms = 0.0
+    packages = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            cumulative_ms = int(cumulative) / 1000
+        except ValueError:
+            continue  # header row
+        name = name.strip()
+        if name == module:
+            total_ms = cumulative_ms
+        elif "." not in name:
+            packages[name] = max(packages.get(name, 0.0), cumulative_ms)
+    return total_ms, sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(timeout: float = 60) -> float:
+    """
+    Start ``uvicorn main:app`` and time until ``/health`` first answers 200.
+
+    Args:
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        float: Time to first successful request, in ms.
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run(runs: int, top: int) -> Dict:
+    """
+    Run the benchmark ``runs`` times and summarize with medians.
+
+    Args:
+        runs (int): Number of cold starts per measurement.
+        top (int): Number of heaviest packages to report.
+
+    Returns:
+        Dict: Median import ms, median first-request ms and the package breakdown.
+    """
+    import_samples, first_request_samples = [], []
+    breakdown = []
+    for _ in range(runs):
+        total_ms, breakdown = measure_import()
+        import_samples.append(total_ms)
+        first_request_samples.append(measure_first_request())
+    return {
+        "import_ms": statistics.median(import_samples),
+        "first_request_ms": statistics.median(first_request_samples),
+        "breakdown": breakdown[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API cold start against a budget")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="heaviest top-level packages to show")
+    parser.add_argument("--import-budget-ms", type=float, default=STARTUP_IMPORT_BUDGET_MS)
+    parser.add_argument("--first-request-budget-ms", type=float, default=STARTUP_FIRST_REQUEST_BUDGET_MS)
+    args = parser.parse_args()
+
+    result = run(args.runs, args.top)
+
+    print(f"🚀 Startup benchmark (median of {args.runs} cold starts)")
+    print(f"   import main:        {result['import_ms']:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"   first /health 200:  {result['first_request_ms']:8.1f} ms  "
+          f"(budget {args.first_request_budget_ms:.0f} ms)")
+    print("   heaviest imports (cumulative ms):")
+    for package, cumulative_ms in result["breakdown"]:
+        print(f"     {package:<24} {cumulative_ms:8.1f}")
+
+    failures = []
+    if result["import_ms"] > args.import_budget_ms:
+        failures.append("import time")
+    if result["first_request_ms"] > args.first_request_budget_ms:
+        failures.append("time to first request")
+    if failures:
+        print(f"❌ Over budget: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
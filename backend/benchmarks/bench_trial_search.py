@@ -0,0 +1,87 @@
+"""
+Clinical Trial Search Benchmark
+Generates a synthetic ClinicalTrials.gov-sized corpus and times therapeutic-area
+queries through the inverted index against the original flatten-and-substring scan.
+
+Usage:
+    python -m benchmarks.bench_trial_search --trials 500000 --queries 200
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from .bench_password_hashing import percentile
+from utils.trial_index import TrialIndex
+
+CONDITIONS = [
+    "Cardiovascular Disease", "Type 2 Diabetes", "Breast Cancer", "Lung Cancer", "Oncology",
+    "Periodontal Disease", "Hypertension", "Alzheimer Disease", "Asthma", "Rheumatoid Arthritis",
+    "Major Depressive Disorder", "Chronic Kidney Disease", "Heart Failure", "Obesity", "HIV Infections",
+]
+SPONSORS = [
+    "Mayo Clinic", "National Cancer Institute", "Stanford University", "Johns Hopkins University",
+    "University of Pennsylvania", "Pfizer", "Novartis", "Merck Sharp & Dohme", "AstraZeneca", "Roche",
+]
+QUERIES = ["oncology", "cancer", "cardio", "diabetes", "disease", "heart failure", "kidney", "arthritis", "hiv"]
+
+
+def synthetic_trials(count: int, seed: int = 0) -> List[Dict]:
+    """Random trial records with the fields the clinical agent serves."""
+    rng = random.Random(seed)
+    trials = []
+    for i in range(count):
+        condition = rng.choice(CONDITIONS)
+        trials.append({
+            "trial_id": f"NCT{i:08d}",
+            "title": f"Study {i} of Compound-{rng.randrange(5000)} in {condition}",
+            "condition": condition,
+            "sponsor": rng.choice(SPONSORS),
+            "start_date": f"{rng.randint(2000, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    return trials
+
+
+def scan(trials: List[Dict], area: str, limit: int) -> List[Dict]:
+    """The pre-index query: copy every trial, then substring-match the condition."""
+    all_trials = list(trials)
+    return [t for t in all_trials if area.lower() in t["condition"].lower()][:limit]
+
+
+def time_queries(function, queries: List[str]) -> List[float]:
+    """Latency of each query, in milliseconds."""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        function(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clinical trial area search benchmark")
+    parser.add_argument("--trials", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--scan-queries", type=int, default=10, help="queries for the (slow) full scan")
+    args = parser.parse_args()
+
+    trials = synthetic_trials(args.trials)
+    started = time.perf_counter()
+    index = TrialIndex(trials)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    indexed = time_queries(lambda query: index.search(query, limit=args.page_size), queries)
+    deep = time_queries(lambda query: index.search(query, offset=100 * args.page_size, limit=args.page_size), queries)
+    scanned = time_queries(lambda query: scan(trials, query, args.page_size), queries[:args.scan_queries])
+
+    print(f"🔎 {len(index):,} trials, index built in {build_ms:.0f} ms")
+    print(f"{'query path':<24} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, latencies in [("index, page 1", indexed), ("index, page 101", deep), ("full scan", scanned)]:
+        print(f"{name:<24} {percentile(latencies, 50):>9.3f} {percentile(latencies, 95):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Stub Groq Server
+Local Groq/OpenAI-compatible chat completions endpoint with configurable latency
+and error rate, so load tests exercise the real SDK and HTTP path without quota.
+
+Point the app at it with GROQ_BASE_URL=http://127.0.0.1:<port>. Run standalone with:
+    python -m benchmarks.stub_llm_server --port 8099 --latency-ms 300 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from utils.llm_providers import synthetic_completion
+
+
+class StubLLMServer:
+    """
+    Threaded HTTP server answering ``POST /openai/v1/chat/completions``.
+
+    Each request sleeps ``latency_ms`` (plus up to ``jitter_ms``), then fails
+    with a 503 at ``error_rate`` or returns a completion, streamed as SSE
+    chunks when the request sets ``stream``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 200,
+                 jitter_ms: float = 50, error_rate: float = 0.0, seed: int = 0):
+        """
+        Initialize the server (call ``start`` to serve).
+
+        Args:
+            host (str): Bind address.
+            port (int): Bind port (0 picks a free one).
+            latency_ms (float): Base latency per completion.
+            jitter_ms (float): Extra uniform random latency.
+            error_rate (float): Probability of answering 503.
+            seed (int): Random seed for reproducible jitter and failures.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as GROQ_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                server._respond(self, body)
+
+        return Handler
+
+    def _respond(self, handler: BaseHTTPRequestHandler, body: Dict):
+        with self._random_lock:
+            self.requests += 1
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+
+        if fail:
+            payload = json.dumps({"error": {"message": "stub overloaded", "type": "server_error"}}).encode()
+            handler.send_response(503)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+
+        messages = body.get("messages", [])
+        system_message = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        prompt = next((m["content"] for m in messages if m.get("role") == "user"), "")
+        text = synthetic_completion(system_message, int(body.get("max_tokens") or 512), prompt)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = body.get("model", "stub")
+
+        if body.get("stream"):
+            handler.send_response(200)
+            handler.send_header("Content-Type", "text/event-stream")
+            handler.send_header("Connection", "close")
+            handler.end_headers()
+            for word in text.split(" "):
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                }
+                handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            handler.wfile.write(b"data: [DONE]\n\n")
+            handler.close_connection = True
+            return
+
+        payload = json.dumps({
+            "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": len(text) // 4, "total_tokens": 100 + len(text) // 4},
+        }).encode()
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def start(self) -> "StubLLMServer":
+        """Serve in a background daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub Groq-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate).start()
+    print(f"🧪 Stub LLM server on {server.base_url} (set GROQ_BASE_URL to this)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
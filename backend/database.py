@@ -1,47 +1,247 @@
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+from pymongo import AsyncMongoClient, MongoClient
+import asyncio
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from utils.metrics import InstrumentedCollection
+
 
 load_dotenv()
 
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "pharma_agent_ai")
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+# Connection pool tuning for the async client used by the API routes
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# Background connection monitor: retry backoff while down, health check interval while up
+MONGO_RECONNECT_MIN_DELAY = float(os.getenv("MONGO_RECONNECT_MIN_DELAY", "1"))
+MONGO_RECONNECT_MAX_DELAY = float(os.getenv("MONGO_RECONNECT_MAX_DELAY", "30"))
+MONGO_HEALTHCHECK_INTERVAL = float(os.getenv("MONGO_HEALTHCHECK_INTERVAL", "10"))
+
+STATE_IDLE = "idle"
+STATE_CONNECTING = "connecting"
+STATE_READY = "ready"
+STATE_UNAVAILABLE = "unavailable"
+
+# Nothing connects at import: the first use starts a monitor thread that pings
+# MongoDB, marks it ready/unavailable, and keeps retrying with backoff.
+_client = None
+_state = STATE_IDLE
+_last_error = None
+_last_change = None
+_indexes_created = False
+_state_lock = threading.Lock()
+_first_attempt_done = threading.Event()
+_stop_monitor = None
+_monitor_thread = None
+
+
+def _set_state(state, error=None):
+    global _state, _last_error, _last_change
+    with _state_lock:
+        changed = state != _state
+        _state = state
+        _last_error = error
+        if changed:
+            _last_change = time.time()
+    if changed and state == STATE_READY:
+        print("✓ MongoDB connection successful")
+    elif changed and state == STATE_UNAVAILABLE:
+        print(f"✗ MongoDB connection failed - Using local mode until it comes back ({error})")
+
+
+def _monitor_connection(client, stop):
+    """Ping MongoDB until stopped: back off exponentially while it is down, check periodically while up."""
+    delay = MONGO_RECONNECT_MIN_DELAY
+    while not stop.is_set():
+        try:
+            client.admin.command("ping")
+            if stop.is_set():
+                break
+            _set_state(STATE_READY)
+            delay = MONGO_RECONNECT_MIN_DELAY
+            wait = MONGO_HEALTHCHECK_INTERVAL
+        except Exception as e:
+            if stop.is_set():
+                break
+            _set_state(STATE_UNAVAILABLE, str(e))
+            wait = delay
+            delay = min(delay * 2, MONGO_RECONNECT_MAX_DELAY)
+        _first_attempt_done.set()
+        stop.wait(wait)
+
+
+def start_connection_monitor():
+    """Create the sync client and start the monitor thread (idempotent; called on first use)."""
+    global _client, _monitor_thread, _stop_monitor
+    if _monitor_thread is not None:
+        return
+    with _state_lock:
+        if _monitor_thread is not None:
+            return
+        # connect=False: the client connects lazily and never blocks here
+        _client = MongoClient(
+            MONGO_URL, serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS, connect=False
+        )
+        _stop_monitor = threading.Event()
+        _first_attempt_done.clear()
+        _monitor_thread = threading.Thread(
+            target=_monitor_connection, args=(_client, _stop_monitor), name="mongo-monitor", daemon=True
+        )
+    _set_state(STATE_CONNECTING)
+    _monitor_thread.start()
+
+
+def stop_connection_monitor():
+    """Stop the monitor thread and close the sync client (call on shutdown)."""
+    global _client, _monitor_thread, _stop_monitor
+    with _state_lock:
+        client, _client = _client, None
+        stop, _stop_monitor = _stop_monitor, None
+        _monitor_thread = None
+    if stop is not None:
+        stop.set()
+    if client is not None:
+        client.close()
+    _set_state(STATE_IDLE)
+
+
+def wait_for_connection(timeout: float) -> bool:
+    """Block until the first connection attempt finishes (at most `timeout` seconds); return readiness."""
+    start_connection_monitor()
+    _first_attempt_done.wait(timeout)
+    return is_ready()
+
+
+def is_ready() -> bool:
+    """Whether the last ping succeeded."""
+    return _state == STATE_READY
 
-try:
-    client = MongoClient(MONGO_URL, serverSelectionTimeoutMS=5000)
-    # Test the connection
-    client.admin.command('ping')
-    db = client[DB_NAME]
-    print("✓ MongoDB connection successful")
-except ServerSelectionTimeoutError:
-    print("✗ MongoDB connection failed - Using local mode")
-    db = None
-except Exception as e:
-    print(f"✗ MongoDB error: {e}")
-    db = None
-
-# Collections
+
+def database_status():
+    """Readiness state for /health."""
+    with _state_lock:
+        return {
+            "state": _state,
+            "ready": _state == STATE_READY,
+            "indexes_created": _indexes_created,
+            "last_error": _last_error,
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_last_change)) if _last_change else None,
+        }
+
+
+def get_db():
+    """Return the sync database handle (background workers), or None while MongoDB is unavailable."""
+    start_connection_monitor()
+    if _state != STATE_READY:
+        return None
+    return _client[DB_NAME]
+
+
+# Async client for the API routes (the sync client above serves background workers).
+# Its pool is bound to the event loop that first uses it.
+_async_client = None
+_async_client_loop = None
+_closing_clients = set()
+
+
+def _close_async_client_later(client, loop):
+    """Close a replaced async client without blocking the caller."""
+    async def close():
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Async MongoDB client close warning: {e}")
+
+    if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+        # Its loop still runs in another thread: close it there
+        asyncio.run_coroutine_threadsafe(close(), loop)
+    else:
+        task = asyncio.get_running_loop().create_task(close())
+        _closing_clients.add(task)
+        task.add_done_callback(_closing_clients.discard)
+
+
+def get_async_db():
+    """Return the async database handle for the running event loop, or None until MongoDB is ready."""
+    global _async_client, _async_client_loop
+    start_connection_monitor()
+    # Until the monitor's ping succeeds, callers answer 503 at once instead of
+    # waiting out server selection
+    if _state != STATE_READY:
+        return None
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        if _async_client is not None:
+            _close_async_client_later(_async_client, _async_client_loop)
+        _async_client = AsyncMongoClient(
+            MONGO_URL,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        )
+        _async_client_loop = loop
+    return _async_client[DB_NAME]
+
+
+async def close_async_client():
+    """Close the async client's connection pool (call on shutdown)."""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+        _async_client_loop = None
+
+
+# Collections (async; await their methods)
 def get_users_collection():
-    if db is not None:
-        return db.users
+    async_db = get_async_db()
+    if async_db is not None:
+        return InstrumentedCollection(async_db.users, "users")
     return None
 
 def get_reports_collection():
-    if db is not None:
-        return db.reports
+    async_db = get_async_db()
+    if async_db is not None:
+        return InstrumentedCollection(async_db.reports, "reports")
     return None
 
 # Create indexes
-def create_indexes():
-    try:
-        if db is not None:
-            db.users.create_index("email", unique=True)
-            db.reports.create_index("user_id")
-            db.reports.create_index("created_at")
-            print("✓ Database indexes created")
-    except Exception as e:
-        print(f"Index creation warning: {e}")
-
-create_indexes()
+async def create_indexes():
+    async_db = get_async_db()
+    if async_db is None:
+        return False
+    await async_db.users.create_index("email", unique=True)
+    await async_db.reports.create_index("user_id")
+    await async_db.reports.create_index("created_at")
+    # Keyset pagination of /api/reports/user-reports on (created_at, _id)
+    await async_db.reports.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
+    # Batch job queue (jobs.MongoJobStore): claim order and one checkpoint per molecule
+    await async_db.jobs.create_index([("status", 1), ("created_at", 1)])
+    await async_db.job_results.create_index([("job_id", 1), ("molecule", 1)], unique=True)
+    print("✓ Database indexes created")
+    return True
+
+
+async def ensure_indexes():
+    """Startup task: create indexes once, as soon as MongoDB is (or becomes) reachable."""
+    global _indexes_created
+    delay = MONGO_RECONNECT_MIN_DELAY
+    while not _indexes_created:
+        if is_ready():
+            try:
+                _indexes_created = await create_indexes()
+            except Exception as e:
+                print(f"Index creation warning: {e}")
+        if not _indexes_created:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MONGO_RECONNECT_MAX_DELAY)
@@ -0,0 +1,560 @@
+"""
+Background Job Queue
+Durable queue for long-running batch analyses.
+
+Jobs live in the MongoDB ``jobs`` collection (with per-molecule checkpoints in
+``job_results``) or, when the database is unavailable, in a local directory of
+JSON files. Workers claim queued jobs under a time-limited lease and checkpoint
+every finished molecule, so a job interrupted by a crash or restart is picked up
+again and only the molecules without a checkpoint are recomputed. Molecules whose
+analysis failed are not checkpointed until the job's last attempt, so they are
+retried too.
+
+Run a standalone worker process with:  python jobs.py
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from utils.metrics import InstrumentedCollection
+
+load_dotenv()
+
+JOB_STORE_DIR = os.getenv("JOB_STORE_DIR", os.path.join(os.path.dirname(__file__), ".jobs"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# How long to wait for MongoDB's first connection attempt before falling back to files
+JOB_STORE_DB_WAIT = float(os.getenv("JOB_STORE_DB_WAIT", "5"))
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def _new_job(molecules: List[str], options: Optional[Dict] = None) -> Dict:
+    """Build a fresh job document."""
+    now = datetime.utcnow()
+    return {
+        "_id": uuid.uuid4().hex,
+        "type": "batch_analyze",
+        "status": STATUS_QUEUED,
+        "molecules": molecules,
+        "options": options or {},
+        "total": len(molecules),
+        "completed": 0,
+        "attempts": 0,
+        "worker_id": None,
+        "lease_expires_at": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "finished_at": None,
+    }
+
+
+class MongoJobStore:
+    """Job store backed by the ``jobs`` and ``job_results`` MongoDB collections."""
+
+    def __init__(self, db):
+        """
+        Initialize the store.
+
+        Args:
+            db: pymongo Database handle.
+        """
+        # Instrumented like the async handles, so job traffic shows in the Mongo metrics
+        self.jobs = InstrumentedCollection(db.jobs, "jobs")
+        self.results = InstrumentedCollection(db.job_results, "job_results")
+        # Indexes are created by database.ensure_indexes at startup
+
+    def create(self, molecules: List[str], options: Optional[Dict] = None) -> Dict:
+        """Persist a new queued job and return it."""
+        job = _new_job(molecules, options)
+        self.jobs.insert_one(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job document, or None if it does not exist."""
+        return self.jobs.find_one({"_id": job_id})
+
+    def claim(self, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[Dict]:
+        """
+        Atomically claim the oldest queued job, or a running job whose lease expired.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+            lease_seconds (int): Lease length; renewed on every checkpoint.
+
+        Returns:
+            Dict or None: The claimed job.
+        """
+        now = datetime.utcnow()
+        job = self.jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": STATUS_QUEUED},
+                    {"status": STATUS_RUNNING, "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": STATUS_RUNNING,
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is not None and job.get("started_at") is None:
+            self.jobs.update_one({"_id": job["_id"]}, {"$set": {"started_at": now}})
+            job["started_at"] = now
+        return job
+
+    def completed_molecules(self, job_id: str) -> List[str]:
+        """Return the molecules that already have a checkpointed result."""
+        return [doc["molecule"] for doc in self.results.find({"job_id": job_id}, {"molecule": 1})]
+
+    def checkpoint(self, job_id: str, worker_id: str, molecule: str, result: Dict,
+                   lease_seconds: int = JOB_LEASE_SECONDS):
+        """Store one molecule's result, bump progress and renew the lease."""
+        now = datetime.utcnow()
+        try:
+            self.results.insert_one(
+                {"job_id": job_id, "molecule": molecule, "result": result, "completed_at": now}
+            )
+        except DuplicateKeyError:
+            pass
+        self.jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {
+                "$set": {
+                    "completed": self.results.count_documents({"job_id": job_id}),
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+            },
+        )
+
+    def finish(self, job_id: str, worker_id: str, status: str, error: Optional[str] = None):
+        """Mark a job completed or failed."""
+        now = datetime.utcnow()
+        self.jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {
+                "$set": {
+                    "status": status,
+                    "error": error,
+                    "lease_expires_at": None,
+                    "updated_at": now,
+                    "finished_at": now,
+                }
+            },
+        )
+
+    def release(self, job_id: str, worker_id: str, error: Optional[str] = None):
+        """Put a job back in the queue so another worker can retry it."""
+        self.jobs.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {
+                "$set": {
+                    "status": STATUS_QUEUED,
+                    "worker_id": None,
+                    "lease_expires_at": None,
+                    "error": error,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+        )
+
+    def get_results(self, job_id: str) -> Dict:
+        """Return {molecule: result} for every checkpointed molecule."""
+        return {doc["molecule"]: doc["result"] for doc in self.results.find({"job_id": job_id})}
+
+
+class FileJobStore:
+    """
+    Job store for local mode: one JSON document plus one append-only
+    ``.results.jsonl`` checkpoint file per job. A lock file serializes claims
+    across worker processes sharing the directory.
+    """
+
+    _DATETIME_FIELDS = ("created_at", "updated_at", "started_at", "finished_at", "lease_expires_at")
+
+    def __init__(self, directory: str = JOB_STORE_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Directory holding the job files (created if missing).
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, ".lock")
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self, stale_after: float = 30.0):
+        """Cross-process mutex based on exclusive creation of a lock file."""
+        with self._thread_lock:
+            while True:
+                try:
+                    fd = os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    break
+                except FileExistsError:
+                    try:
+                        if time.time() - os.path.getmtime(self._lock_path) > stale_after:
+                            os.remove(self._lock_path)
+                            continue
+                    except FileNotFoundError:
+                        continue
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                os.close(fd)
+                os.remove(self._lock_path)
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _results_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.results.jsonl")
+
+    def _read(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._job_path(job_id), encoding="utf-8") as f:
+                job = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        for field in self._DATETIME_FIELDS:
+            if job.get(field):
+                job[field] = datetime.fromisoformat(job[field])
+        return job
+
+    def _write(self, job: Dict):
+        tmp_path = self._job_path(job["_id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+        os.replace(tmp_path, self._job_path(job["_id"]))
+
+    def _update(self, job_id: str, owner: Optional[str], **fields) -> Optional[Dict]:
+        """Apply field updates to a job if worker ``owner`` (when given) still owns it."""
+        with self._locked():
+            job = self._read(job_id)
+            if job is None or (owner is not None and job.get("worker_id") != owner):
+                return None
+            job.update(fields, updated_at=datetime.utcnow())
+            self._write(job)
+            return job
+
+    def create(self, molecules: List[str], options: Optional[Dict] = None) -> Dict:
+        """Persist a new queued job and return it."""
+        job = _new_job(molecules, options)
+        with self._locked():
+            self._write(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job document, or None if it does not exist."""
+        if not job_id.isalnum():
+            return None
+        return self._read(job_id)
+
+    def claim(self, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[Dict]:
+        """Claim the oldest queued job, or a running job whose lease expired."""
+        now = datetime.utcnow()
+        with self._locked():
+            candidates = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                job = self._read(name[: -len(".json")])
+                if job is None:
+                    continue
+                expired = job["status"] == STATUS_RUNNING and (
+                    job.get("lease_expires_at") is None or job["lease_expires_at"] < now
+                )
+                if job["status"] == STATUS_QUEUED or expired:
+                    candidates.append(job)
+            if not candidates:
+                return None
+
+            job = min(candidates, key=lambda j: j["created_at"])
+            job.update(
+                status=STATUS_RUNNING,
+                worker_id=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                started_at=job.get("started_at") or now,
+                attempts=job.get("attempts", 0) + 1,
+                updated_at=now,
+            )
+            self._write(job)
+            return job
+
+    def completed_molecules(self, job_id: str) -> List[str]:
+        """Return the molecules that already have a checkpointed result."""
+        return list(self.get_results(job_id))
+
+    def checkpoint(self, job_id: str, worker_id: str, molecule: str, result: Dict,
+                   lease_seconds: int = JOB_LEASE_SECONDS):
+        """Append one molecule's result (fsynced), bump progress and renew the lease."""
+        with open(self._results_path(job_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"molecule": molecule, "result": result}, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._update(
+            job_id,
+            worker_id,
+            completed=len(self.get_results(job_id)),
+            lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds),
+        )
+
+    def finish(self, job_id: str, worker_id: str, status: str, error: Optional[str] = None):
+        """Mark a job completed or failed."""
+        now = datetime.utcnow()
+        self._update(job_id, worker_id, status=status, error=error,
+                     lease_expires_at=None, finished_at=now)
+
+    def release(self, job_id: str, worker_id: str, error: Optional[str] = None):
+        """Put a job back in the queue so another worker can retry it."""
+        self._update(job_id, worker_id, status=STATUS_QUEUED, worker_id=None,
+                     lease_expires_at=None, error=error)
+
+    def get_results(self, job_id: str) -> Dict:
+        """Return {molecule: result} for every checkpointed molecule."""
+        results = {}
+        try:
+            with open(self._results_path(job_id), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; that molecule is recomputed
+                        continue
+                    results.setdefault(entry["molecule"], entry["result"])
+        except FileNotFoundError:
+            pass
+        return results
+
+
+_file_job_store = None
+_file_job_store_lock = threading.Lock()
+
+
+def get_file_job_store() -> "FileJobStore":
+    """Get the process-wide local-file job store."""
+    global _file_job_store
+    with _file_job_store_lock:
+        if _file_job_store is None:
+            _file_job_store = FileJobStore()
+        return _file_job_store
+
+
+def get_job_store():
+    """
+    Get the job store to use right now: MongoDB when connected, local files otherwise.
+
+    The choice is made on every call, so new jobs move back to MongoDB as soon as
+    the connection monitor sees it again. The first call waits up to
+    JOB_STORE_DB_WAIT seconds for the initial connection attempt, so call it from a
+    worker thread rather than the event loop.
+
+    Returns:
+        MongoJobStore or FileJobStore: Current job store.
+    """
+    from database import get_db, wait_for_connection
+
+    wait_for_connection(JOB_STORE_DB_WAIT)
+    db = get_db()
+    return MongoJobStore(db) if db is not None else get_file_job_store()
+
+
+def get_job_stores() -> List:
+    """
+    Get every store that may hold jobs, current store first.
+
+    Jobs queued in local files while MongoDB was down stay there, so once it is
+    back they are still found (and drained by the workers) through the file store.
+
+    Returns:
+        List: The current store, followed by the file store when the current one is MongoDB.
+    """
+    store = get_job_store()
+    if isinstance(store, FileJobStore):
+        return [store]
+    return [store, get_file_job_store()]
+
+
+def find_job(job_id: str):
+    """
+    Look a job up in every store.
+
+    Args:
+        job_id (str): Job id.
+
+    Returns:
+        Tuple: (store holding the job, job document), or (None, None) if not found.
+    """
+    for store in get_job_stores():
+        job = store.get(job_id)
+        if job:
+            return store, job
+    return None, None
+
+
+class JobWorker:
+    """
+    Claims queued batch jobs and runs them through the Master Agent,
+    checkpointing each molecule as soon as it completes.
+    """
+
+    def __init__(self, store, master_agent, worker_id: Optional[str] = None,
+                 poll_interval: float = JOB_POLL_INTERVAL, lease_seconds: int = JOB_LEASE_SECONDS):
+        """
+        Initialize the worker.
+
+        Args:
+            store: Job store to poll, or None to poll the current stores (see ``get_job_stores``)
+                on every claim, following MongoDB as it goes down and comes back.
+            master_agent (MasterAgent): Agent used to analyze molecules.
+            worker_id (str, optional): Unique worker id. Defaults to host:pid:random.
+            poll_interval (float): Seconds to sleep when the queue is empty.
+            lease_seconds (int): Lease length; a job whose worker stops checkpointing
+                for this long is handed to another worker.
+        """
+        self.store = store
+        self.master_agent = master_agent
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> bool:
+        """
+        Claim and process a single job.
+
+        Returns:
+            bool: True if a job was processed, False if the queue was empty.
+        """
+        job = None
+        for store in [self.store] if self.store is not None else get_job_stores():
+            job = store.claim(self.worker_id, self.lease_seconds)
+            if job is not None:
+                break
+        if job is None:
+            return False
+        return self._run_job(store, job)
+
+    def _run_job(self, store, job: Dict) -> bool:
+        """Process a claimed job, checkpointing into the store it was claimed from."""
+        job_id = job["_id"]
+        done = set(store.completed_molecules(job_id))
+        remaining = [m for m in job["molecules"] if m not in done]
+        print(f"🧾 Job {job_id}: {len(done)}/{job['total']} done, {len(remaining)} to go "
+              f"(attempt {job['attempts']}, worker {self.worker_id})")
+
+        final_attempt = job["attempts"] >= JOB_MAX_ATTEMPTS
+        failed = []
+        try:
+            for molecule, result in self.master_agent.iter_batch_analyze(
+                remaining, max_workers=job.get("options", {}).get("workers")
+            ):
+                if "error" in result and not final_attempt:
+                    # Not checkpointed, so the next attempt retries it (errors are often transient)
+                    failed.append(molecule)
+                else:
+                    store.checkpoint(job_id, self.worker_id, molecule, result, self.lease_seconds)
+                if self._stop.is_set():
+                    # Lease lapses and the remaining molecules resume on another worker
+                    return True
+        except Exception as e:
+            if final_attempt:
+                store.finish(job_id, self.worker_id, STATUS_FAILED, error=str(e))
+            else:
+                store.release(job_id, self.worker_id, error=str(e))
+            print(f"✗ Job {job_id} failed: {e}")
+            return True
+
+        if failed:
+            error = f"{len(failed)} molecule(s) failed and will be retried: {', '.join(failed)}"
+            store.release(job_id, self.worker_id, error=error)
+            print(f"⚠️  Job {job_id}: {error}")
+            return True
+
+        store.finish(job_id, self.worker_id, STATUS_COMPLETED)
+        print(f"✅ Job {job_id} complete")
+        return True
+
+    def run_forever(self):
+        """Process jobs until ``stop`` is called."""
+        while not self._stop.is_set():
+            try:
+                if not self.run_once():
+                    self._stop.wait(self.poll_interval)
+            except Exception as e:
+                print(f"✗ Job worker error: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Run the worker loop in a daemon thread."""
+        self._thread = threading.Thread(target=self.run_forever, name=f"job-worker-{self.worker_id}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the worker loop to exit after the current molecule."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def serialize_job(job: Dict) -> Dict:
+    """
+    Convert a job document into an API-friendly status dict.
+
+    Args:
+        job (Dict): Job document from the store.
+
+    Returns:
+        Dict: Job status with progress and ISO timestamps.
+    """
+    return {
+        "job_id": job["_id"],
+        "type": job.get("type"),
+        "status": job["status"],
+        "total": job["total"],
+        "completed": job["completed"],
+        "progress": job["completed"] / job["total"] if job["total"] else 1.0,
+        "attempts": job.get("attempts", 0),
+        "error": job.get("error"),
+        "created_at": job["created_at"].isoformat() if job.get("created_at") else None,
+        "started_at": job["started_at"].isoformat() if job.get("started_at") else None,
+        "finished_at": job["finished_at"].isoformat() if job.get("finished_at") else None,
+    }
+
+
+if __name__ == "__main__":
+    from agents.master_agent import MasterAgent
+
+    worker = JobWorker(None, MasterAgent(groq_api_key=os.getenv("GROQ_API_KEY")))
+    print(f"⚙️  Job worker {worker.worker_id} polling {type(get_job_store()).__name__}...")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
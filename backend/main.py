@@ -6,20 +6,48 @@ Orchestrates all worker agents for pharmaceutical research.
 
 import os
 import json
-from typing import Optional
+import asyncio
+import threading
+from typing import List, Optional
 from io import BytesIO
 from datetime import datetime
 
 
-from fastapi import FastAPI, HTTPException, File, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Body, FastAPI, HTTPException, File, UploadFile, Header
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from agents.master_agent import MasterAgent
-from routes_auth import router as auth_router
+from utils.groq_client import GroqClient
+from utils.llm_cache import get_default_cache
+from utils.agent_cache import get_agent_cache
+from utils.metrics import REGISTRY, HTTPMetricsMiddleware
+from utils.tracing import TracingMiddleware, slow_traces, span
+from utils.report_store import ReportStore
+from utils.pdf_cache import PDFCache, etag_matches
+from utils.singleflight import SingleFlight
+from utils.molecules import normalize_molecule_name
+from utils.executors import (
+    CPU_POOL,
+    DB_POOL,
+    LLM_POOL,
+    executor_stats,
+    run_blocking,
+    shutdown_executors,
+)
+from routes_auth import router as auth_router, principal_cache
 from routes_reports import router as reports_router
+from routes_jobs import router as jobs_router
+from routes_admin import router as admin_router
+from jobs import JobWorker, get_job_store
+from database import (
+    close_async_client,
+    database_status,
+    ensure_indexes,
+    start_connection_monitor,
+    stop_connection_monitor,
+)
 
 # Load environment variables
 load_dotenv()
@@ -38,17 +66,198 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing"],
 )
 
+# In-flight gauge and per-endpoint latency histogram for /metrics
+app.add_middleware(HTTPMetricsMiddleware)
+
+# Request id, per-stage spans and Server-Timing header; slow traces kept for /api/admin/traces
+app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(reports_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
+
+# Master Agent, built by the startup hook (or on first use) so importing this module stays cheap
+master_agent = None
+_master_agent_lock = threading.Lock()
+
+
+def get_master_agent():
+    """Return the shared Master Agent, building it on first use."""
+    global master_agent
+    if master_agent is None:
+        with _master_agent_lock:
+            if master_agent is None:
+                from agents.master_agent import MasterAgent
+
+                master_agent = MasterAgent(groq_api_key=os.getenv("GROQ_API_KEY"))
+                app.state.master_agent = master_agent
+    return master_agent
+
+# Latest analysis per molecule, bounded by REPORTS_STORE_* (in production, use database)
+reports_store = ReportStore.from_env()
+
+# Rendered PDF bytes keyed by content hash, bounded by PDF_CACHE_MAX_BYTES
+pdf_cache = PDFCache.from_env()
+
+# Concurrent requests for the same molecule share one Master Agent run
+analysis_flights = SingleFlight("molecule_analysis")
+
+# In-process background job workers (standalone workers: python jobs.py)
+job_workers = []
+
+# Startup work that must not delay serving requests (index creation, job workers)
+startup_tasks = []
+
+
+def collect_runtime_metrics():
+    """Expose component counters kept by ``stats()`` (caches, stores, pools) on /metrics."""
+    caches = {
+        "principal": principal_cache.stats(),
+        "pdf": pdf_cache.stats(),
+        "reports_store": reports_store.stats(),
+    }
+    llm_cache = get_default_cache()
+    if llm_cache is not None:
+        caches["llm"] = llm_cache.stats()
+    agent_cache = get_agent_cache()
+    if agent_cache is not None:
+        for source, source_stats in agent_cache.stats()["sources"].items():
+            caches[f"agent_{source}"] = source_stats
+
+    hits, misses, ratios, entries = [], [], [], []
+    for cache, stats in caches.items():
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        hits.append(({"cache": cache}, stats.get("hits", 0)))
+        misses.append(({"cache": cache}, stats.get("misses", 0)))
+        ratios.append(({"cache": cache}, stats["hits"] / lookups if lookups else 0.0))
+        entries.append(({"cache": cache}, stats.get("entries", 0)))
+
+    store = caches["reports_store"]
+    executors = executor_stats()
+    flights = analysis_flights.stats()
+    return [
+        ("pharmai_cache_hits_total", "counter", "Cache hits.", hits),
+        ("pharmai_cache_misses_total", "counter", "Cache misses.", misses),
+        ("pharmai_cache_hit_ratio", "gauge", "Cache hits over lookups since start.", ratios),
+        ("pharmai_cache_entries", "gauge", "Entries held by each cache.", entries),
+        ("pharmai_reports_store_bytes", "gauge", "Approximate size of the stored analyses.",
+         [({}, store.get("bytes", 0))]),
+        ("pharmai_executor_active", "gauge", "Tasks running on each executor pool.",
+         [({"pool": pool}, stats["active"]) for pool, stats in executors.items()]),
+        ("pharmai_executor_queued", "gauge", "Tasks waiting for a worker in each executor pool.",
+         [({"pool": pool}, stats["queued"]) for pool, stats in executors.items()]),
+        ("pharmai_analysis_in_flight", "gauge", "Molecule analyses currently running.",
+         [({}, flights["in_flight"])]),
+        ("pharmai_analysis_coalesced_total", "counter", "Analyses served by joining one already in flight.",
+         [({}, flights["coalesced"])]),
+        ("pharmai_database_ready", "gauge", "1 when MongoDB is connected.",
+         [({}, 1 if database_status()["ready"] else 0)]),
+    ]
+
+
+REGISTRY.register_collector(collect_runtime_metrics)
+
+
+async def analyze_molecule(molecule_name: str) -> dict:
+    """Run the full Master Agent analysis, joining an identical one already in flight."""
+    # The stage spans land in the trace of the request that started the flight
+    with span("analysis", molecule=molecule_name):
+        return await analysis_flights.run(
+            normalize_molecule_name(molecule_name),
+            lambda: run_blocking(LLM_POOL, get_master_agent().query_molecule, molecule_name),
+        )
+
+
+async def iter_batch_results(molecules: List[str], max_workers: Optional[int] = None):
+    """
+    Analyze molecules through ``analyze_molecule`` (LLM_POOL, single-flight) and the
+    report store, at most ``max_workers`` at a time, yielding each as it completes.
+
+    Pending analyses are cancelled if the consumer stops early (e.g. client disconnect).
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+    limit = asyncio.Semaphore(max(1, max_workers))
+
+    async def analyze(molecule: str):
+        async with limit:
+            try:
+                result = await analyze_molecule(molecule)
+            except Exception as e:
+                return molecule, {"error": str(e)}
+            reports_store.put(molecule, result)
+            return molecule, result
+
+    tasks = [asyncio.ensure_future(analyze(molecule)) for molecule in molecules]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.on_event("startup")
+async def build_master_agent():
+    """Build the Master Agent (and its worker agents) before serving requests."""
+    get_master_agent()
+
+
+@app.on_event("startup")
+async def connect_database():
+    """Start connecting to MongoDB in the background and create indexes once it is reachable."""
+    start_connection_monitor()
+    startup_tasks.append(asyncio.create_task(ensure_indexes()))
+
+
+async def _start_job_workers(count: int):
+    # Wait for the first MongoDB connection attempt; workers then pick the store per claim
+    await run_blocking(DB_POOL, get_job_store)
+    for _ in range(count):
+        worker = JobWorker(None, get_master_agent())
+        worker.start()
+        job_workers.append(worker)
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the in-process batch job workers (JOB_WORKERS, default 1; 0 disables)."""
+    count = int(os.getenv("JOB_WORKERS", "1"))
+    if count > 0:
+        startup_tasks.append(asyncio.create_task(_start_job_workers(count)))
+
 
-# Initialize Master Agent
-master_agent = MasterAgent(groq_api_key=os.getenv("GROQ_API_KEY"))
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop in-process job workers; unfinished jobs resume from their last checkpoint."""
+    for task in startup_tasks:
+        task.cancel()
+    for worker in job_workers:
+        worker.stop(timeout=0)
 
-# Store generated reports in memory (in production, use database)
-reports_store = {}
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """Close the pooled async Groq connections on worker shutdown."""
+    await GroqClient.aclose_shared()
+
+
+@app.on_event("shutdown")
+async def close_executors():
+    """Shut down the blocking-work thread pools."""
+    shutdown_executors()
+
+
+@app.on_event("shutdown")
+async def close_database_clients():
+    """Close the MongoDB connection pools and stop the connection monitor."""
+    await close_async_client()
+    stop_connection_monitor()
 
 
 # ============================================================================
@@ -99,9 +308,14 @@ async def root():
         "endpoints": {
             "health": "/health",
             "query_molecule": "/query_molecule",
+            "query_molecule_stream": "/query_molecule/{molecule_name}/stream",
             "get_trends": "/get_trends",
             "generate_report": "/generate_report",
             "saved_reports": "/saved_reports",
+            "batch_jobs": "/api/jobs/batch_analyze",
+            "agent_cache": "/api/admin/agent-cache",
+            "metrics": "/metrics",
+            "slow_traces": "/api/admin/traces",
         },
     }
 
@@ -113,9 +327,20 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "groq_configured": os.getenv("GROQ_API_KEY") is not None,
+        "executors": executor_stats(),
+        "database": database_status(),
+        "principal_cache": principal_cache.stats(),
+        "analysis_singleflight": analysis_flights.stats(),
+        "slow_traces": slow_traces.stats(),
     }
 
 
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 # ============================================================================
 # Main Query Endpoints
 # ============================================================================
@@ -141,11 +366,10 @@ async def query_molecule(query: MoleculeQuery):
             raise HTTPException(status_code=400, detail="Molecule name cannot be empty")
 
         # Query the Master Agent
-        results = master_agent.query_molecule(query.molecule_name)
+        results = await analyze_molecule(query.molecule_name)
 
         # Store report for later download
-        report_id = f"{query.molecule_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        reports_store[report_id] = results
+        reports_store.put(query.molecule_name, results)
 
         return JSONResponse(content=results, status_code=200)
 
@@ -167,9 +391,8 @@ async def query_molecule_get(molecule_name: str):
         dict: Comprehensive analysis results.
     """
     try:
-        results = master_agent.query_molecule(molecule_name)
-        report_id = f"{molecule_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        reports_store[report_id] = results
+        results = await analyze_molecule(molecule_name)
+        reports_store.put(molecule_name, results)
         return JSONResponse(content=results, status_code=200)
     except Exception as e:
         raise HTTPException(
@@ -177,6 +400,62 @@ async def query_molecule_get(molecule_name: str):
         )
 
 
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.get("/query_molecule/{molecule_name}/stream", tags=["Analysis"])
+async def query_molecule_stream(molecule_name: str):
+    """
+    Stream the analysis for a molecule as Server-Sent Events.
+
+    Emits the structured agent data as soon as it is gathered, then the AI
+    insight and recommendation tokens (markdown already stripped) as they are
+    generated, and finally the complete aggregated result.
+
+    Events:
+        agent_data: {molecule, timestamp, market_data, clinical_data, patent_data, web_data}
+        ai_insights / recommendations: {"delta": "..."}
+        complete: full aggregated result, same shape as GET /query_molecule/{name}
+        error: {"error": "..."}
+
+    Args:
+        molecule_name (str): Name of the molecule.
+
+    Returns:
+        StreamingResponse: text/event-stream response.
+    """
+    if not molecule_name.strip():
+        raise HTTPException(status_code=400, detail="Molecule name cannot be empty")
+
+    async def event_stream():
+        try:
+            aggregated_data = await run_blocking(
+                LLM_POOL, get_master_agent().gather_molecule_data, molecule_name
+            )
+            yield _sse_event("agent_data", aggregated_data)
+
+            generated = {"ai_insights": [], "recommendations": []}
+            async for section, delta in get_master_agent().astream_ai_analysis(aggregated_data):
+                generated[section].append(delta)
+                yield _sse_event(section, {"delta": delta})
+
+            aggregated_data["ai_insights"] = "".join(generated["ai_insights"])
+            aggregated_data["recommendations"] = "".join(generated["recommendations"])
+
+            reports_store.put(molecule_name, aggregated_data)
+            yield _sse_event("complete", aggregated_data)
+        except Exception as e:
+            yield _sse_event("error", {"error": f"Error analyzing molecule: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================================
 # Trends and Insights Endpoints
 # ============================================================================
@@ -194,7 +473,7 @@ async def get_trends():
         GET /get_trends
     """
     try:
-        trends = master_agent.get_trends()
+        trends = await run_blocking(LLM_POOL, get_master_agent().get_trends)
         return JSONResponse(content=trends, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trends: {str(e)}")
@@ -209,7 +488,8 @@ async def get_therapeutic_areas():
         list: Top therapeutic areas with market data.
     """
     try:
-        areas = master_agent.iqvia_agent.get_therapeutic_area_trends()
+        master = get_master_agent()
+        areas = await run_blocking(LLM_POOL, master.call_agent, master.iqvia_agent.get_therapeutic_area_trends)
         return JSONResponse(content={"therapeutic_areas": areas}, status_code=200)
     except Exception as e:
         raise HTTPException(
@@ -226,7 +506,8 @@ async def get_trending_conditions():
         list: Top trending medical conditions in clinical development.
     """
     try:
-        conditions = master_agent.clinical_agent.get_trending_conditions()
+        master = get_master_agent()
+        conditions = await run_blocking(LLM_POOL, master.call_agent, master.clinical_agent.get_trending_conditions)
         return JSONResponse(content={"trending_conditions": conditions}, status_code=200)
     except Exception as e:
         raise HTTPException(
@@ -243,7 +524,8 @@ async def get_market_trends():
         list: Top therapeutic areas by market metrics.
     """
     try:
-        trends = master_agent.webintel_agent.get_trending_therapeutic_areas()
+        master = get_master_agent()
+        trends = await run_blocking(LLM_POOL, master.call_agent, master.webintel_agent.get_trending_therapeutic_areas)
         return JSONResponse(content={"web_trends": trends}, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market trends: {str(e)}")
@@ -271,30 +553,25 @@ async def generate_report(query: MoleculeQuery):
     """
     try:
         # Check if we already have analysis for this molecule
-        report_id = None
-        for existing_id, data in reports_store.items():
-            if data.get("molecule").lower() == query.molecule_name.lower():
-                report_id = existing_id
-                aggregated_data = data
-                break
-
-        # If not found, perform analysis
-        if not report_id:
-            aggregated_data = master_agent.query_molecule(query.molecule_name)
-            report_id = f"{query.molecule_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            reports_store[report_id] = aggregated_data
+        stored = reports_store.lookup(query.molecule_name)
+        if stored:
+            report_id, aggregated_data = stored
+        else:
+            # If not found, perform analysis
+            aggregated_data = await analyze_molecule(query.molecule_name)
+            report_id = reports_store.put(query.molecule_name, aggregated_data)
 
         # Generate JSON report
-        json_report = master_agent.generate_report(
-            query.molecule_name, aggregated_data, format="json"
+        json_report = await run_blocking(
+            CPU_POOL, get_master_agent().generate_report, query.molecule_name, aggregated_data, format="json"
         )
 
         # Save metadata
-        reports_store[f"meta_{report_id}"] = {
+        reports_store.add_metadata(report_id, {
             "molecule": query.molecule_name,
             "generated_date": datetime.now().isoformat(),
             "report_id": report_id,
-        }
+        })
 
         return JSONResponse(
             content=json.loads(json_report),
@@ -309,40 +586,56 @@ async def generate_report(query: MoleculeQuery):
 
 
 @app.get("/generate_report_pdf/{molecule_name}", tags=["Reports"])
-async def generate_report_pdf(molecule_name: str):
+async def generate_report_pdf(molecule_name: str, if_none_match: Optional[str] = Header(None)):
     """
     Generate and download a PDF report for a molecule.
 
+    Rendered PDFs are cached by a hash of the analysis data and template version,
+    served with an ETag; a matching If-None-Match returns 304 Not Modified.
+
     Args:
         molecule_name (str): Name of the molecule.
+        if_none_match (str, optional): ETag of the client's cached copy.
 
     Returns:
-        BytesIO: PDF file as stream.
+        Response: PDF file (or 304 when the client's copy is current).
     """
     try:
         # Check for existing analysis
-        report_id = None
-        for existing_id, data in reports_store.items():
-            if data.get("molecule").lower() == molecule_name.lower():
-                report_id = existing_id
-                aggregated_data = data
-                break
-
-        # If not found, perform analysis
-        if not report_id:
-            aggregated_data = master_agent.query_molecule(molecule_name)
-            report_id = f"{molecule_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            reports_store[report_id] = aggregated_data
-
-        # Generate PDF
-        pdf_buffer = master_agent.generate_report(
-            molecule_name, aggregated_data, format="pdf"
+        stored = reports_store.lookup(molecule_name)
+        if stored:
+            report_id, aggregated_data = stored
+        else:
+            # If not found, perform analysis
+            aggregated_data = await analyze_molecule(molecule_name)
+            report_id = reports_store.put(molecule_name, aggregated_data)
+
+        etag = await run_blocking(
+            CPU_POOL,
+            PDFCache.make_etag,
+            aggregated_data,
+            molecule_name,
+            get_master_agent().report_agent.TEMPLATE_VERSION,
         )
-
-        return StreamingResponse(
-            iter([pdf_buffer.getvalue()]),
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        pdf_bytes = pdf_cache.get(etag)
+        if pdf_bytes is None:
+            pdf_buffer = await run_blocking(
+                CPU_POOL, get_master_agent().generate_report, molecule_name, aggregated_data, format="pdf"
+            )
+            pdf_bytes = pdf_buffer.getvalue()
+            pdf_cache.put(etag, pdf_bytes)
+
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=report_{molecule_name}.pdf"},
+            headers={
+                **headers,
+                "Content-Disposition": f"attachment; filename=report_{molecule_name}.pdf",
+            },
         )
 
     except Exception as e:
@@ -358,11 +651,7 @@ async def get_saved_reports():
         list: Metadata of all generated reports.
     """
     try:
-        reports_list = []
-
-        for key, value in reports_store.items():
-            if key.startswith("meta_"):
-                reports_list.append(value)
+        reports_list = reports_store.list_metadata()
 
         return JSONResponse(
             content={
@@ -376,17 +665,45 @@ async def get_saved_reports():
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
 
+@app.get("/saved_reports/stats", tags=["Reports"])
+async def get_reports_store_stats():
+    """
+    Get occupancy and eviction statistics of the in-memory report store and PDF cache.
+
+    Returns:
+        dict: Entries and bytes against their limits, hits, misses and evictions.
+    """
+    return JSONResponse(
+        content={**reports_store.stats(), "pdf_cache": pdf_cache.stats()},
+        status_code=200,
+    )
+
+
 # ============================================================================
 # Agent-Specific Endpoints
 # ============================================================================
 
 
+async def _agent_section_response(section: str, molecule_name: str, *args) -> JSONResponse:
+    """Serve one agent's (possibly cached) data with X-Cache and Age headers."""
+    data, freshness = await run_blocking(
+        LLM_POOL, get_master_agent().fetch_section, section, molecule_name, *args, raise_errors=True
+    )
+    return JSONResponse(
+        content=data,
+        status_code=200,
+        headers={
+            "X-Cache": "HIT" if freshness["cached"] else "MISS",
+            "Age": str(int(freshness["age_seconds"])),
+        },
+    )
+
+
 @app.get("/market_data/{molecule_name}", tags=["Market Data"])
 async def get_market_data(molecule_name: str):
     """Get IQVIA market data for a molecule."""
     try:
-        data = master_agent.iqvia_agent.query_market_data(molecule_name)
-        return JSONResponse(content=data, status_code=200)
+        return await _agent_section_response("market_data", molecule_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching market data: {str(e)}")
 
@@ -395,8 +712,7 @@ async def get_market_data(molecule_name: str):
 async def get_clinical_trials(molecule_name: str):
     """Get clinical trial data for a molecule."""
     try:
-        data = master_agent.clinical_agent.query_trials(molecule_name)
-        return JSONResponse(content=data, status_code=200)
+        return await _agent_section_response("clinical_data", molecule_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trial data: {str(e)}")
 
@@ -405,8 +721,7 @@ async def get_clinical_trials(molecule_name: str):
 async def get_patent_data(molecule_name: str):
     """Get patent information for a molecule."""
     try:
-        data = master_agent.patent_agent.query_patents(molecule_name)
-        return JSONResponse(content=data, status_code=200)
+        return await _agent_section_response("patent_data", molecule_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching patent data: {str(e)}")
 
@@ -415,7 +730,8 @@ async def get_patent_data(molecule_name: str):
 async def get_fto_analysis(molecule_name: str):
     """Get freedom-to-operate analysis for a molecule."""
     try:
-        data = master_agent.patent_agent.get_freedom_to_operate(molecule_name)
+        master = get_master_agent()
+        data = await run_blocking(LLM_POOL, master.call_agent, master.patent_agent.get_freedom_to_operate, molecule_name)
         return JSONResponse(content=data, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing FTO: {str(e)}")
@@ -425,8 +741,7 @@ async def get_fto_analysis(molecule_name: str):
 async def get_web_publications(molecule_name: str, limit: int = 10):
     """Get recent scientific publications for a molecule."""
     try:
-        data = master_agent.webintel_agent.search_publications(molecule_name, limit)
-        return JSONResponse(content=data, status_code=200)
+        return await _agent_section_response("web_data", molecule_name, limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching publications: {str(e)}")
 
@@ -435,7 +750,8 @@ async def get_web_publications(molecule_name: str, limit: int = 10):
 async def get_web_trends(keyword: str):
     """Get web trends for a keyword (molecule or therapeutic area)."""
     try:
-        data = master_agent.webintel_agent.search_trends(keyword)
+        master = get_master_agent()
+        data = await run_blocking(LLM_POOL, master.call_agent, master.webintel_agent.search_trends, keyword)
         return JSONResponse(content=data, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching web trends: {str(e)}")
@@ -447,27 +763,57 @@ async def get_web_trends(keyword: str):
 
 
 @app.post("/batch_analyze", tags=["Analysis"])
-async def batch_analyze(molecules: list):
+async def batch_analyze(
+    molecules: List[str] = Body(...),
+    stream: bool = False,
+    workers: Optional[int] = None,
+):
     """
     Analyze multiple molecules in batch.
 
+    Names are normalized and de-duplicated ("Aspirin" and "aspirin " are analyzed
+    once). Each molecule runs like /query_molecule: on the bounded LLM pool, joined
+    with identical analyses in flight, and saved to the report store.
+
     Args:
         molecules (list): List of molecule names.
+        stream (bool): If true, respond with NDJSON, one line per molecule as soon
+            as it completes: {"molecule": ..., "result": {...}}.
+        workers (int, optional): Molecules analyzed concurrently (default BATCH_MAX_WORKERS).
 
     Returns:
-        dict: Analysis results for all molecules.
+        dict: Analysis results for all molecules (or an NDJSON stream).
 
     Example:
-        POST /batch_analyze
+        POST /batch_analyze?stream=true
         ["aspirin", "metformin", "doxycycline"]
     """
     try:
         if not molecules or len(molecules) == 0:
             raise HTTPException(status_code=400, detail="Molecules list cannot be empty")
+        if workers is not None and workers < 1:
+            raise HTTPException(status_code=400, detail="workers must be at least 1")
 
-        results = master_agent.batch_analyze(molecules)
+        unique_molecules = get_master_agent().dedupe_molecules(molecules)
+
+        if stream:
+            async def ndjson_lines():
+                async for molecule, result in iter_batch_results(unique_molecules, workers):
+                    yield json.dumps({"molecule": molecule, "result": result}, default=str) + "\n"
+
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+        completed = dict([item async for item in iter_batch_results(unique_molecules, workers)])
+        results = {
+            "timestamp": datetime.now().isoformat(),
+            "molecules_analyzed": len(unique_molecules),
+            **get_master_agent().skipped_molecule_counts(molecules),
+            "results": {molecule: completed[molecule] for molecule in unique_molecules},
+        }
         return JSONResponse(content=results, status_code=200)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in batch analysis: {str(e)}")
 
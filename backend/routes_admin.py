@@ -0,0 +1,80 @@
+from fastapi import APIRouter, HTTPException, status, Header, Query
+from typing import Optional
+import hmac
+import os
+from utils.agent_cache import SOURCE_TTL_CONFIG, get_agent_cache
+from utils.tracing import slow_traces
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin(admin_key: Optional[str]):
+    """Check the X-Admin-Key header against ADMIN_API_KEY (admin endpoints are disabled when it is unset)."""
+    expected = os.getenv("ADMIN_API_KEY")
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Admin API is disabled (set ADMIN_API_KEY to enable it)"
+        )
+    if not hmac.compare_digest(admin_key or "", expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin key required"
+        )
+
+
+def _get_agent_cache_or_503():
+    agent_cache = get_agent_cache()
+    if agent_cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Agent cache is disabled"
+        )
+    return agent_cache
+
+
+@router.get("/agent-cache")
+async def get_agent_cache_stats(x_admin_key: Optional[str] = Header(None)):
+    """Get agent cache occupancy, TTLs and hit ratios per source."""
+    require_admin(x_admin_key)
+    return _get_agent_cache_or_503().stats()
+
+
+@router.delete("/agent-cache")
+async def invalidate_agent_cache(
+    source: Optional[str] = None,
+    molecule: Optional[str] = None,
+    x_admin_key: Optional[str] = Header(None),
+):
+    """Invalidate cached agent results for a source, a molecule, both, or everything."""
+    require_admin(x_admin_key)
+    if source is not None and source not in SOURCE_TTL_CONFIG:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown source. Use one of: {', '.join(SOURCE_TTL_CONFIG)}"
+        )
+    removed = _get_agent_cache_or_503().invalidate(source=source, molecule_name=molecule)
+    return {"invalidated": removed, "source": source, "molecule": molecule}
+
+
+@router.get("/traces")
+async def get_slow_traces(
+    limit: int = Query(20, ge=1, le=1000),
+    x_admin_key: Optional[str] = Header(None),
+):
+    """List the most recent slow request traces, newest first."""
+    require_admin(x_admin_key)
+    return {**slow_traces.stats(), "traces": slow_traces.recent(limit)}
+
+
+@router.get("/traces/{request_id}")
+async def get_slow_trace(request_id: str, x_admin_key: Optional[str] = Header(None)):
+    """Get one slow request trace by request id."""
+    require_admin(x_admin_key)
+    trace = slow_traces.get(request_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trace not found (only slow, recent traces are kept)"
+        )
+    return trace
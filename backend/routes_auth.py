@@ -4,12 +4,17 @@ from bson import ObjectId
 from datetime import datetime
 from schemas import UserRegister, UserLogin, UserResponse, Token
 from database import get_users_collection, get_reports_collection
-from auth import hash_password, verify_password, create_access_token, verify_token
+from auth import hash_password, verify_password, password_needs_rehash, create_access_token, verify_token
+from utils.executors import AUTH_POOL, run_blocking
+from utils.principal_cache import PrincipalCache
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
+# Token -> user record, so repeat requests skip the users lookup
+principal_cache = PrincipalCache.from_env()
 
-def get_current_user(authorization: Optional[str] = Header(None)):
+
+async def get_current_user(authorization: Optional[str] = Header(None)):
     """Extract and verify current user from JWT token."""
     if not authorization:
         return None
@@ -19,6 +24,10 @@ def get_current_user(authorization: Optional[str] = Header(None)):
         if scheme.lower() != "bearer":
             return None
         
+        cached_user = principal_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+        
         payload = verify_token(token)
         user_id = payload.get("sub")
         if not user_id:
@@ -28,10 +37,11 @@ def get_current_user(authorization: Optional[str] = Header(None)):
         if users_collection is None:
             return None
         
-        user = users_collection.find_one({"_id": ObjectId(user_id)})
+        user = await users_collection.find_one({"_id": ObjectId(user_id)})
         if not user:
             return None
         
+        principal_cache.put(token, user, payload.get("exp"))
         return user
     except:
         return None
@@ -49,7 +59,7 @@ async def register(user_data: UserRegister):
         )
     
     # Check if user already exists
-    existing_user = users_collection.find_one({"email": user_data.email})
+    existing_user = await users_collection.find_one({"email": user_data.email})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,7 +67,7 @@ async def register(user_data: UserRegister):
         )
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await run_blocking(AUTH_POOL, hash_password, user_data.password)
     new_user = {
         "name": user_data.name,
         "email": user_data.email,
@@ -65,7 +75,7 @@ async def register(user_data: UserRegister):
         "created_at": datetime.utcnow()
     }
     
-    result = users_collection.insert_one(new_user)
+    result = await users_collection.insert_one(new_user)
     user_id = str(result.inserted_id)
     
     # Create JWT token
@@ -97,8 +107,10 @@ async def login(user_data: UserLogin):
         )
     
     # Find user by email
-    user = users_collection.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user.get("password_hash", "")):
+    user = await users_collection.find_one({"email": user_data.email})
+    if not user or not await run_blocking(
+        AUTH_POOL, verify_password, user_data.password, user.get("password_hash", "")
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -106,6 +118,18 @@ async def login(user_data: UserLogin):
     
     user_id = str(user["_id"])
     
+    # Upgrade hashes created with a lower cost factor while we have the plaintext
+    if password_needs_rehash(user["password_hash"]):
+        try:
+            new_hash = await run_blocking(AUTH_POOL, hash_password, user_data.password)
+            await users_collection.update_one(
+                {"_id": user["_id"], "password_hash": user["password_hash"]},
+                {"$set": {"password_hash": new_hash}}
+            )
+            principal_cache.invalidate_user(user_id)
+        except Exception as e:
+            print(f"⚠️ Password rehash failed for user {user_id}: {e}")
+    
     # Create JWT token
     access_token = create_access_token(data={"sub": user_id, "email": user_data.email})
     
@@ -126,7 +150,7 @@ async def login(user_data: UserLogin):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(authorization: Optional[str] = Header(None)):
     """Get current logged-in user info."""
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,15 +166,17 @@ async def get_current_user_info(authorization: Optional[str] = Header(None)):
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (token invalidation handled on frontend)."""
+async def logout(authorization: Optional[str] = Header(None)):
+    """Logout user (token invalidation handled on frontend; the cached principal is dropped here)."""
+    if authorization and len(authorization.split()) == 2:
+        principal_cache.invalidate_token(authorization.split()[1])
     return {"message": "Logged out successfully"}
 
 
 @router.get("/verify")
 async def verify_user(authorization: Optional[str] = Header(None)):
     """Verify if user is authenticated."""
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     if not user:
         return {"authenticated": False}
     
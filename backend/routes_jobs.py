@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, status, Body
+from typing import List, Optional
+from pymongo.errors import PyMongoError
+from jobs import find_job, get_job_store, serialize_job
+from utils.executors import DB_POOL, run_blocking
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+async def _run_store_call(function, *args):
+    # MongoDB can drop between two monitor pings; report that as unavailable, not a crash
+    try:
+        return await run_blocking(DB_POOL, function, *args)
+    except PyMongoError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job store not available, retry shortly"
+        )
+
+
+async def _get_job_or_404(job_id: str):
+    store, job = await _run_store_call(find_job, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return store, job
+
+
+@router.post("/batch_analyze", status_code=status.HTTP_202_ACCEPTED)
+async def submit_batch_job(molecules: List[str] = Body(...), workers: Optional[int] = None):
+    """Queue a batch analysis and return its job id immediately."""
+    from agents.master_agent import MasterAgent
+
+    unique_molecules = MasterAgent.dedupe_molecules(molecules)
+    if not unique_molecules:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Molecules list cannot be empty"
+        )
+    if workers is not None and workers < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="workers must be at least 1"
+        )
+
+    store = await _run_store_call(get_job_store)
+    job = await _run_store_call(store.create, unique_molecules, {"workers": workers})
+    return serialize_job(job)
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str):
+    """Get status and progress of a job."""
+    store, job = await _get_job_or_404(job_id)
+    return serialize_job(job)
+
+
+@router.get("/{job_id}/results")
+async def get_job_results(job_id: str):
+    """Get the results checkpointed so far (all of them once the job is completed)."""
+    store, job = await _get_job_or_404(job_id)
+    completed = await _run_store_call(store.get_results, job_id)
+    return {
+        **serialize_job(job),
+        "results": {m: completed[m] for m in job["molecules"] if m in completed},
+    }
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, status, Header
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, status, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from bson import ObjectId
 from datetime import datetime
+import base64
+import hashlib
+import json
 from schemas import ReportCreate, ReportResponse
 from database import get_reports_collection, get_users_collection
 from routes_auth import get_current_user
+from utils.agent_cache import SOURCE_TTL_CONFIG, source_ttls
+from utils.executors import LLM_POOL, run_blocking
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 
@@ -20,18 +26,20 @@ async def save_report(report_data: ReportCreate, authorization: Optional[str] =
             detail="Database not available"
         )
     
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     user_id = str(user["_id"]) if user else None
     
+    now = datetime.utcnow()
     new_report = {
         "user_id": user_id,
         "molecule_name": report_data.molecule_name,
         "data": report_data.data,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "section_updated_at": initial_section_timestamps(report_data.data, now),
+        "created_at": now,
+        "updated_at": now
     }
     
-    result = reports_collection.insert_one(new_report)
+    result = await reports_collection.insert_one(new_report)
     report_id = str(result.inserted_id)
     
     return {
@@ -41,10 +49,99 @@ async def save_report(report_data: ReportCreate, authorization: Optional[str] =
     }
 
 
-@router.get("/user-reports", response_model=List[ReportResponse])
-async def get_user_reports(authorization: Optional[str] = Header(None)):
-    """Get all reports for logged-in user."""
-    user = get_current_user(authorization)
+def initial_section_timestamps(data: dict, default: datetime) -> dict:
+    """Per-section fetch times for a new report, taken from the analysis' data_freshness when present."""
+    freshness = data.get("data_freshness") or {}
+    timestamps = {}
+    for section in SOURCE_TTL_CONFIG:
+        if section not in data:
+            continue
+        fetched_at = (freshness.get(section) or {}).get("fetched_at")
+        try:
+            # fetched_at is server local time; stored timestamps are UTC
+            timestamps[section] = datetime.utcfromtimestamp(datetime.fromisoformat(fetched_at).timestamp())
+        except (TypeError, ValueError):
+            timestamps[section] = default
+    return timestamps
+
+
+# Section fields recording when the agent answered rather than what it answered
+SECTION_VOLATILE_FIELDS = ("query_date",)
+
+
+def section_hash(value) -> str:
+    """Content hash of one report section (ignoring SECTION_VOLATILE_FIELDS)."""
+    if isinstance(value, dict):
+        value = {key: item for key, item in value.items() if key not in SECTION_VOLATILE_FIELDS}
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# Fields returned by the summary listing; "data" is only included on request
+SUMMARY_PROJECTION = {
+    "user_id": 1,
+    "molecule_name": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "data_points": {"$size": {"$objectToArray": {"$ifNull": ["$data", {}]}}},
+}
+
+
+def encode_report_cursor(report: dict) -> str:
+    """Encode the (created_at, _id) position of a report as an opaque cursor."""
+    position = {"created_at": report["created_at"].isoformat(), "id": str(report["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_report_cursor(cursor: str) -> dict:
+    """Decode a cursor into a filter matching reports strictly after it in listing order."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(position["created_at"])
+        report_oid = ObjectId(position["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": report_oid}},
+        ]
+    }
+
+
+def serialize_report(report: dict) -> dict:
+    """Convert a report document into a JSON-ready dict."""
+    serialized = {
+        "_id": str(report["_id"]),
+        "user_id": report.get("user_id"),
+        "molecule_name": report["molecule_name"],
+        "created_at": report["created_at"].isoformat(),
+        "updated_at": report["updated_at"].isoformat() if report.get("updated_at") else None,
+    }
+    if "data_points" in report:
+        serialized["data_points"] = report["data_points"]
+    if "data" in report:
+        serialized["data"] = report["data"]
+    return serialized
+
+
+@router.get("/user-reports")
+async def get_user_reports(
+    authorization: Optional[str] = Header(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_data: bool = False,
+):
+    """
+    Get a page of the logged-in user's reports, newest first.
+
+    Returns {"reports": [...], "next_cursor": ...}; pass next_cursor back to get
+    the following page (null on the last page). Reports are summaries with a
+    data_points count unless include_data=true. The body is streamed row by row.
+    """
+    user = await get_current_user(authorization)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,20 +155,35 @@ async def get_user_reports(authorization: Optional[str] = Header(None)):
             detail="Database not available"
         )
     
-    user_id = str(user["_id"])
-    reports = list(reports_collection.find({"user_id": user_id}).sort("created_at", -1))
-    
-    return [
-        ReportResponse(
-            _id=str(report["_id"]),
-            user_id=report.get("user_id"),
-            molecule_name=report["molecule_name"],
-            data=report["data"],
-            created_at=report["created_at"],
-            updated_at=report.get("updated_at")
-        )
-        for report in reports
-    ]
+    query = {"user_id": str(user["_id"])}
+    if cursor:
+        query.update(decode_report_cursor(cursor))
+
+    projection = None if include_data else SUMMARY_PROJECTION
+    # Served by the (user_id, created_at, _id) index; one extra row tells us if there is a next page
+    reports_cursor = reports_collection.find(query, projection).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(limit + 1)
+
+    async def stream_page():
+        try:
+            yield '{"reports": ['
+            count = 0
+            last_report = None
+            has_more = False
+            async for report in reports_cursor:
+                if count == limit:
+                    has_more = True
+                    break
+                yield ("," if count else "") + json.dumps(serialize_report(report), default=str)
+                count += 1
+                last_report = report
+            next_cursor = encode_report_cursor(last_report) if has_more else None
+            yield '], "next_cursor": ' + json.dumps(next_cursor) + "}"
+        finally:
+            await reports_cursor.close()
+
+    return StreamingResponse(stream_page(), media_type="application/json")
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
@@ -92,7 +204,7 @@ async def get_report(report_id: str, authorization: Optional[str] = Header(None)
             detail="Database not available"
         )
     
-    report = reports_collection.find_one({"_id": report_oid})
+    report = await reports_collection.find_one({"_id": report_oid})
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,7 +212,7 @@ async def get_report(report_id: str, authorization: Optional[str] = Header(None)
         )
     
     # Check if user has access to this report
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     if report.get("user_id") and user and str(user["_id"]) != report.get("user_id"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -128,7 +240,7 @@ async def delete_report(report_id: str, authorization: Optional[str] = Header(No
             detail="Invalid report ID"
         )
     
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,7 +254,7 @@ async def delete_report(report_id: str, authorization: Optional[str] = Header(No
             detail="Database not available"
         )
     
-    report = reports_collection.find_one({"_id": report_oid})
+    report = await reports_collection.find_one({"_id": report_oid})
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -155,7 +267,7 @@ async def delete_report(report_id: str, authorization: Optional[str] = Header(No
             detail="Can only delete your own reports"
         )
     
-    reports_collection.delete_one({"_id": report_oid})
+    await reports_collection.delete_one({"_id": report_oid})
     return {"message": "Report deleted successfully"}
 
 
@@ -170,7 +282,7 @@ async def update_report(report_id: str, report_data: dict, authorization: Option
             detail="Invalid report ID"
         )
     
-    user = get_current_user(authorization)
+    user = await get_current_user(authorization)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -184,7 +296,7 @@ async def update_report(report_id: str, report_data: dict, authorization: Option
             detail="Database not available"
         )
     
-    report = reports_collection.find_one({"_id": report_oid})
+    report = await reports_collection.find_one({"_id": report_oid})
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -197,7 +309,7 @@ async def update_report(report_id: str, report_data: dict, authorization: Option
             detail="Can only update your own reports"
         )
     
-    reports_collection.update_one(
+    await reports_collection.update_one(
         {"_id": report_oid},
         {
             "$set": {
@@ -207,7 +319,7 @@ async def update_report(report_id: str, report_data: dict, authorization: Option
         }
     )
     
-    updated_report = reports_collection.find_one({"_id": report_oid})
+    updated_report = await reports_collection.find_one({"_id": report_oid})
     return ReportResponse(
         _id=str(updated_report["_id"]),
         user_id=updated_report.get("user_id"),
@@ -216,3 +328,134 @@ async def update_report(report_id: str, report_data: dict, authorization: Option
         created_at=updated_report["created_at"],
         updated_at=updated_report.get("updated_at")
     )
+
+
+@router.post("/{report_id}/refresh")
+async def refresh_report(
+    report_id: str,
+    request: Request,
+    force: bool = False,
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Refresh a saved report in place, re-running only the stale sections.
+
+    A section is stale once its age exceeds its source TTL (AGENT_CACHE_TTL_*);
+    force=true re-runs every agent. Stale sections always bypass the agent cache (a cached copy is as
+    old as the report's own), and the fresh results are cached again. The AI sections are regenerated only if the
+    figures they are built from changed. Only the changed fields are written.
+    """
+    try:
+        report_oid = ObjectId(report_id)
+    except:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid report ID"
+        )
+    
+    user = await get_current_user(authorization)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    
+    reports_collection = get_reports_collection()
+    if reports_collection is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database not available"
+        )
+    
+    master_agent = getattr(request.app.state, "master_agent", None)
+    if master_agent is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis service not ready"
+        )
+    
+    report = await reports_collection.find_one({"_id": report_oid})
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    
+    if report.get("user_id") != str(user["_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Can only refresh your own reports"
+        )
+    
+    data = report.get("data") or {}
+    molecule_name = report["molecule_name"]
+    section_updated_at = report.get("section_updated_at") or {}
+    fallback_updated_at = report.get("updated_at") or report["created_at"]
+    ttls = source_ttls()
+    now = datetime.utcnow()
+    
+    stale_sections = [
+        section for section in SOURCE_TTL_CONFIG
+        if force or section not in data
+        or (now - section_updated_at.get(section, fallback_updated_at)).total_seconds() >= ttls[section]
+    ]
+    
+    updates = {}
+    changed_sections = []
+    refreshed_data = dict(data)
+    has_freshness = isinstance(data.get("data_freshness"), dict)
+    new_freshness = {}
+    for section in stale_sections:
+        # The section is stamped as fetched now, so it must really be fetched now
+        value, freshness = await run_blocking(
+            LLM_POOL, master_agent.fetch_section, section, molecule_name, use_cache=False
+        )
+        if "error" in value and set(value) == {"molecule", "error"}:
+            # Keep the old section; it will be retried on the next refresh
+            continue
+        updates[f"section_updated_at.{section}"] = now
+        new_freshness[section] = freshness
+        if section_hash(value) != section_hash(data.get(section)):
+            updates[f"data.{section}"] = value
+            refreshed_data[section] = value
+            changed_sections.append(section)
+    
+    ai_regenerated = False
+    if changed_sections:
+        old_input_hash = master_agent.ai_input_hash(data)
+        new_input_hash = master_agent.ai_input_hash(refreshed_data)
+        if new_input_hash is None or new_input_hash != old_input_hash:
+            ai_insights, recommendations = await run_blocking(
+                LLM_POOL, master_agent.generate_ai_analysis, refreshed_data
+            )
+            updates["data.ai_insights"] = ai_insights
+            updates["data.recommendations"] = recommendations
+            ai_regenerated = True
+    
+    if new_freshness:
+        if has_freshness:
+            for section, freshness in new_freshness.items():
+                updates[f"data.data_freshness.{section}"] = freshness
+        else:
+            updates["data.data_freshness"] = new_freshness
+    
+    if updates:
+        updates["updated_at"] = now
+        result = await reports_collection.update_one(
+            {"_id": report_oid, "updated_at": report.get("updated_at")},
+            {"$set": updates}
+        )
+        if result.matched_count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Report was modified concurrently, retry the refresh"
+            )
+    
+    return {
+        "id": report_id,
+        "stale_sections": stale_sections,
+        "changed_sections": changed_sections,
+        "ai_regenerated": ai_regenerated,
+        "updated_fields": sorted(updates),
+        "updated_at": updates.get("updated_at", report.get("updated_at")),
+    }
@@ -0,0 +1,62 @@
+"""
+Shared test setup: make the backend modules importable and keep tests offline
+(no Groq key, no span logging, no MongoDB wait).
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ["GROQ_API_KEY"] = ""
+os.environ["LLM_PROVIDER"] = "groq"
+os.environ.setdefault("TRACE_LOG_SPANS", "false")
+os.environ.setdefault("GROQ_CACHE_PATH", "")
+
+import pytest  # noqa: E402
+
+
+class ScriptedProvider:
+    """LLM provider double returning scripted replies and recording every call."""
+
+    name = "scripted"
+    cache_namespace = "scripted"
+
+    def __init__(self, replies, chunk_size=3):
+        self.replies = list(replies)
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    def complete(self, model, messages, temperature, max_tokens, usage=None):
+        self.calls.append(messages)
+        reply = self.replies[min(len(self.calls), len(self.replies)) - 1]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def acomplete(self, model, messages, temperature, max_tokens, usage=None):
+        return self.complete(model, messages, temperature, max_tokens, usage)
+
+    async def astream(self, model, messages, temperature, max_tokens, usage=None):
+        # Small chunks so markdown markers get split across deltas
+        reply = self.complete(model, messages, temperature, max_tokens, usage)
+        for start in range(0, len(reply), self.chunk_size):
+            yield reply[start:start + self.chunk_size]
+
+
+@pytest.fixture
+def scripted_groq_client():
+    """Build a GroqClient over a ScriptedProvider with a private response cache."""
+    from utils.groq_client import GroqClient
+    from utils.llm_cache import LLMCache
+    from utils.llm_providers import LLMProvider
+
+    LLMProvider.register(ScriptedProvider)
+
+    def build(*replies):
+        provider = ScriptedProvider(replies)
+        return GroqClient(api_key="test-key", provider=provider, cache=LLMCache()), provider
+
+    return build
@@ -0,0 +1,150 @@
+"""Tests for the per-source agent result cache and the admin endpoints that manage it."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import routes_admin
+from agents.master_agent import MasterAgent
+from utils.agent_cache import SOURCE_TTL_CONFIG, AgentCache, source_ttls
+
+
+def test_hit_returns_value_and_store_time():
+    cache = AgentCache(ttls={"market_data": 60})
+    stored_at = cache.put("market_data", "aspirin", {"size": 1})
+
+    assert cache.get("market_data", "aspirin") == ({"size": 1}, stored_at)
+
+
+def test_entries_expire_per_source(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("utils.agent_cache.time.time", lambda: clock[0])
+    cache = AgentCache(ttls={"market_data": 60, "clinical_data": 10})
+    cache.put("market_data", "aspirin", "market")
+    cache.put("clinical_data", "aspirin", "trials")
+
+    clock[0] += 30
+    assert cache.get("market_data", "aspirin") is not None
+    assert cache.get("clinical_data", "aspirin") is None
+    # The expired entry is dropped, not just skipped
+    assert cache.stats()["entries"] == 1
+
+
+def test_zero_or_unknown_ttl_is_not_cached():
+    cache = AgentCache(ttls={"web_data": 0})
+    cache.put("web_data", "aspirin", "papers")
+    cache.put("patent_data", "aspirin", "patents")
+
+    assert cache.get("web_data", "aspirin") is None
+    assert cache.get("patent_data", "aspirin") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_molecule_names_are_normalized_and_args_are_part_of_the_key():
+    cache = AgentCache(ttls={"clinical_data": 60})
+    cache.put("clinical_data", "  Aspirin ", "phase 3", args=("Phase 3",))
+
+    assert cache.get("clinical_data", "aspirin", ("Phase 3",))[0] == "phase 3"
+    assert cache.get("clinical_data", "ASPIRIN") is None
+
+
+def test_invalidate_by_source_molecule_or_everything():
+    cache = AgentCache(ttls={"market_data": 60, "clinical_data": 60})
+    for source in ("market_data", "clinical_data"):
+        for molecule in ("aspirin", "metformin"):
+            cache.put(source, molecule, "value")
+
+    assert cache.invalidate(source="market_data", molecule_name="Aspirin") == 1
+    assert cache.invalidate(molecule_name="metformin") == 2
+    assert cache.invalidate(source="market_data") == 0
+    assert cache.invalidate() == 1
+    assert cache.stats()["invalidations"] == 4
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AgentCache(ttls={"market_data": 60}, max_entries=2)
+    cache.put("market_data", "aspirin", 1)
+    cache.put("market_data", "metformin", 2)
+    cache.get("market_data", "aspirin")
+    cache.put("market_data", "ibuprofen", 3)
+
+    assert cache.get("market_data", "metformin") is None
+    assert cache.get("market_data", "aspirin") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stats_report_hit_ratio_per_source():
+    cache = AgentCache(ttls={"market_data": 60})
+    cache.put("market_data", "aspirin", 1)
+    cache.get("market_data", "aspirin")
+    cache.get("market_data", "metformin")
+
+    market = cache.stats()["sources"]["market_data"]
+    assert market == {"ttl_seconds": 60, "entries": 1, "hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_source_ttls_read_from_environment(monkeypatch):
+    monkeypatch.setenv("AGENT_CACHE_TTL_CLINICAL", "120")
+
+    ttls = source_ttls()
+    assert ttls["clinical_data"] == 120
+    assert ttls["market_data"] == SOURCE_TTL_CONFIG["market_data"][1]
+
+
+def test_master_agent_serves_fresh_sections_from_cache():
+    master = MasterAgent(concurrent=False, agent_cache=AgentCache(ttls={"market_data": 60}))
+
+    first = master.gather_molecule_data("aspirin")
+    second = master.gather_molecule_data("Aspirin")
+
+    assert second["data_freshness"]["market_data"]["cached"] is True
+    assert second["data_freshness"]["clinical_data"]["cached"] is False
+    assert second["market_data"] is first["market_data"]
+
+
+def test_failed_agent_call_is_not_cached(monkeypatch):
+    cache = AgentCache(ttls={"market_data": 60})
+    master = MasterAgent(concurrent=False, agent_cache=cache)
+
+    def failing(self, molecule_name):
+        raise RuntimeError("feed down")
+
+    failing.__name__ = "query_market_data"
+    monkeypatch.setattr(type(master.iqvia_agent), "query_market_data", failing)
+    result, freshness = master.fetch_section("market_data", "aspirin")
+
+    assert "error" in result and freshness["cached"] is False
+    assert cache.get("market_data", "aspirin") is None
+
+
+def test_admin_api_disabled_without_key(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_KEY", raising=False)
+
+    with pytest.raises(HTTPException) as error:
+        routes_admin.require_admin("anything")
+    assert error.value.status_code == 404
+
+
+def test_admin_api_rejects_wrong_key(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_KEY", "secret")
+
+    with pytest.raises(HTTPException) as error:
+        routes_admin.require_admin("guess")
+    assert error.value.status_code == 403
+    with pytest.raises(HTTPException):
+        routes_admin.require_admin(None)
+
+
+def test_admin_invalidate_endpoint(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_KEY", "secret")
+    cache = AgentCache(ttls={"market_data": 60})
+    cache.put("market_data", "aspirin", 1)
+    monkeypatch.setattr(routes_admin, "get_agent_cache", lambda: cache)
+
+    response = asyncio.run(routes_admin.invalidate_agent_cache(source="market_data", molecule=None, x_admin_key="secret"))
+    assert response == {"invalidated": 1, "source": "market_data", "molecule": None}
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(routes_admin.invalidate_agent_cache(source="bogus", molecule=None, x_admin_key="secret"))
+    assert error.value.status_code == 400
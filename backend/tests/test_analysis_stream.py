@@ -0,0 +1,137 @@
+"""Tests for streamed AI analysis: incremental markdown cleaning and the SSE endpoint."""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+import main
+from agents.iqvia_agent import IQVIAAgent
+from agents.master_agent import MasterAgent
+from utils.agent_cache import AgentCache
+from utils.groq_client import MarkdownStreamCleaner
+
+SAMPLES = [
+    "## Key **Opportunities**\n\n- Strong *growth* in `Asia`\n- See [the report](https://example.com)\n",
+    "  Leading spaces\n\n\n\nCollapsed blank lines\n* item one\n+ item two\n   - nested item",
+    "Before\n```python\nprint('code')\n``` after\nAfter the __fence__ and _emphasis_",
+    "Summary:\n\n\n- first\n\n  \n- second\n\nClosing line",
+    "# Title\nPlain line with no markdown at all that is fairly long\n\n1. numbered **bold**   \n",
+]
+
+
+def streamed(text, chunks):
+    cleaner = MarkdownStreamCleaner()
+    return "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.flush()
+
+
+def random_chunks(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(1, 12))))
+    return [text[start:stop] for start, stop in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.fixture
+def clean_markdown(scripted_groq_client):
+    client, _ = scripted_groq_client("unused")
+    return client._clean_markdown
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_stream_matches_batch_cleaner_for_any_chunking(clean_markdown, text):
+    rng = random.Random(text)
+    expected = clean_markdown(text)
+
+    assert streamed(text, [text]) == expected
+    assert streamed(text, list(text)) == expected
+    for _ in range(50):
+        assert streamed(text, random_chunks(text, rng)) == expected
+
+
+LINES = ["## Head", "# Title", "- item", "* star item", "+ plus", "  - nested", "**bold**", "*italic*",
+         "__under__", "`code`", "[link](http://x)", "```", "plain words here", "", "   ", "1. numbered"]
+
+
+def test_stream_matches_batch_cleaner_on_generated_markdown(clean_markdown):
+    rng = random.Random(4)
+    checked = 0
+    while checked < 300:
+        text = "\n".join(rng.choice(LINES) + rng.choice(("", " tail")) for _ in range(rng.randint(1, 10)))
+        if text.count("```") % 2:
+            continue  # an unclosed fence is not something both cleaners handle alike
+        checked += 1
+        assert streamed(text, random_chunks(text + " ", rng)) == clean_markdown(text + " "), text
+
+
+def test_plain_text_is_released_before_the_line_ends():
+    cleaner = MarkdownStreamCleaner()
+
+    assert cleaner.feed("Market growth is strong") == "Market growth is"
+    # An open emphasis marker holds the rest of the line back
+    assert cleaner.feed(" in **Asia") == ""
+    assert cleaner.feed("**\n") == " strong in Asia"
+    assert cleaner.flush() == ""
+
+
+def stream_events(monkeypatch, master, molecule="aspirin"):
+    monkeypatch.setattr(main, "get_master_agent", lambda: master)
+
+    async def read():
+        response = await main.query_molecule_stream(molecule)
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    events = []
+    for frame in asyncio.run(read()).strip().split("\n\n"):
+        event, data = frame.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def streaming_master(scripted_groq_client, reply):
+    master = MasterAgent(concurrent=False, llm_mode="separate", agent_cache=AgentCache(ttls={}))
+    master.groq_client, _ = scripted_groq_client(reply)
+    return master
+
+
+def test_endpoint_streams_agent_data_then_deltas_then_complete(monkeypatch, scripted_groq_client):
+    master = streaming_master(scripted_groq_client, "**Strong** demand across regions")
+
+    events = stream_events(monkeypatch, master)
+    names = [name for name, _ in events]
+
+    assert names[0] == "agent_data"
+    assert names[-1] == "complete"
+    assert set(names[1:-1]) == {"ai_insights", "recommendations"}
+    complete = events[-1][1]
+    for section in ("ai_insights", "recommendations"):
+        deltas = "".join(data["delta"] for name, data in events if name == section)
+        assert deltas == complete[section] == "Strong demand across regions"
+
+
+def test_endpoint_streams_analysis_when_an_agent_failed(monkeypatch, scripted_groq_client):
+    def broken(self, molecule_name):
+        raise RuntimeError("feed down")
+    broken.__name__ = "query_market_data"
+    monkeypatch.setattr(IQVIAAgent, "query_market_data", broken)
+    master = streaming_master(scripted_groq_client, "Generated text")
+
+    events = stream_events(monkeypatch, master)
+    names = [name for name, _ in events]
+
+    assert "error" not in names
+    assert names[-1] == "complete"
+    assert events[-1][1]["recommendations"] == "Generated text"
+
+
+def test_recommendation_prompt_failure_falls_back_to_an_error_chunk(monkeypatch, scripted_groq_client):
+    master = streaming_master(scripted_groq_client, "Generated text")
+
+    def failing_prompt(aggregated_data):
+        raise ValueError("bad figures")
+
+    monkeypatch.setattr(master, "_recommendation_prompt", failing_prompt)
+    events = stream_events(monkeypatch, master)
+
+    assert events[-1][0] == "complete"
+    assert events[-1][1]["ai_insights"] == "Generated text"
+    assert events[-1][1]["recommendations"] == "Error generating recommendations: bad figures"
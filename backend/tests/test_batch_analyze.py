@@ -0,0 +1,137 @@
+"""Tests for parallel, de-duplicated batch analysis in the Master Agent."""
+
+import asyncio
+import json
+import threading
+import time
+
+from agents.master_agent import MasterAgent
+from utils.molecules import normalize_molecule_name
+
+
+def fake_master(monkeypatch, analyze=None) -> MasterAgent:
+    master = MasterAgent(concurrent=False)
+    calls = []
+
+    def query_molecule(molecule_name):
+        calls.append(molecule_name)
+        if analyze is not None:
+            return analyze(molecule_name)
+        return {"molecule": molecule_name}
+
+    monkeypatch.setattr(master, "query_molecule", query_molecule)
+    master.calls = calls
+    return master
+
+
+def test_normalize_molecule_name():
+    assert normalize_molecule_name("  Acetyl   Salicylic ACID ") == "acetyl salicylic acid"
+
+
+def test_dedupe_keeps_first_spelling_in_input_order():
+    molecules = ["Aspirin", "metformin", " aspirin ", "", "   ", "METFORMIN", "Doxy  cycline", "doxy cycline"]
+
+    assert MasterAgent.dedupe_molecules(molecules) == ["Aspirin", "metformin", "Doxy cycline"]
+
+
+def test_batch_analyze_runs_each_unique_molecule_once(monkeypatch):
+    master = fake_master(monkeypatch)
+
+    result = master.batch_analyze(["Aspirin", "aspirin", "Metformin", "aspirin "], max_workers=2)
+
+    assert sorted(master.calls) == ["Aspirin", "Metformin"]
+    assert result["molecules_analyzed"] == 2
+    assert result["duplicates_skipped"] == 2
+    assert list(result["results"]) == ["Aspirin", "Metformin"]
+
+
+def test_batch_results_keep_input_order_despite_completion_order(monkeypatch):
+    delays = {"slow": 0.4, "medium": 0.2, "fast": 0.0}
+
+    def analyze(molecule_name):
+        time.sleep(delays[molecule_name])
+        return {"molecule": molecule_name}
+
+    master = fake_master(monkeypatch, analyze)
+
+    completion_order = [molecule for molecule, _ in master.iter_batch_analyze(["slow", "medium", "fast"], max_workers=3)]
+    result = master.batch_analyze(["slow", "medium", "fast"], max_workers=3)
+
+    assert completion_order == ["fast", "medium", "slow"]
+    assert list(result["results"]) == ["slow", "medium", "fast"]
+
+
+def test_batch_failure_is_reported_per_molecule(monkeypatch):
+    def analyze(molecule_name):
+        if molecule_name == "broken":
+            raise RuntimeError("agent exploded")
+        return {"molecule": molecule_name}
+
+    master = fake_master(monkeypatch, analyze)
+
+    results = master.batch_analyze(["aspirin", "broken"], max_workers=2)["results"]
+
+    assert results["aspirin"] == {"molecule": "aspirin"}
+    assert results["broken"] == {"error": "agent exploded"}
+
+
+def test_batch_concurrency_is_bounded_by_max_workers(monkeypatch):
+    lock = threading.Lock()
+    running = peak = 0
+
+    def analyze(molecule_name):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return {"molecule": molecule_name}
+
+    master = fake_master(monkeypatch, analyze)
+
+    master.batch_analyze([f"molecule-{i}" for i in range(8)], max_workers=3)
+
+    assert peak == 3
+
+
+def test_batch_max_workers_defaults_from_env(monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_WORKERS", "1")
+    seen_threads = set()
+
+    def analyze(molecule_name):
+        seen_threads.add(threading.current_thread().name)
+        return {"molecule": molecule_name}
+
+    master = fake_master(monkeypatch, analyze)
+
+    master.batch_analyze(["a", "b", "c"])
+
+    assert len(seen_threads) == 1
+
+
+def test_blank_names_are_not_counted_as_duplicates(monkeypatch):
+    master = fake_master(monkeypatch)
+
+    result = master.batch_analyze(["Aspirin", "", "  ", "aspirin", "Metformin"])
+
+    assert result["molecules_analyzed"] == 2
+    assert result["blank_skipped"] == 2
+    assert result["duplicates_skipped"] == 1
+
+
+def test_batch_endpoint_reports_blank_and_duplicate_names(monkeypatch):
+    import main
+
+    master = fake_master(monkeypatch)
+    monkeypatch.setattr(main, "get_master_agent", lambda: master)
+
+    response = asyncio.run(main.batch_analyze(["Aspirin", " ", "ASPIRIN", "Metformin"], stream=False, workers=2))
+    body = json.loads(response.body)
+
+    assert sorted(master.calls) == ["Aspirin", "Metformin"]
+    assert body["molecules_analyzed"] == 2
+    assert body["blank_skipped"] == 1
+    assert body["duplicates_skipped"] == 1
+    assert list(body["results"]) == ["Aspirin", "Metformin"]
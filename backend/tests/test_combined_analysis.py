@@ -0,0 +1,70 @@
+"""Tests for the single structured LLM call producing insights and recommendations."""
+
+import json
+
+import pytest
+
+from agents.master_agent import MasterAgent
+from utils.agent_cache import AgentCache
+
+parse = MasterAgent.parse_analysis_response
+
+GOOD_REPLY = json.dumps({"insights": "**Strong** market", "recommendations": "Pursue *label* expansion"})
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ('{"insights": "a", "recommendations": "b"}', ("a", "b")),
+    ('```json\n{"insights": "a", "recommendations": "b"}\n```', ("a", "b")),
+    ('Sure! Here it is: {"insights": "a", "recommendations": "b"} Hope this helps.', ("a", "b")),
+    ('{"insights": "use {x}", "recommendations": "ok"} trailing {junk}', ("use {x}", "ok")),
+    ('{"insights": "a", "recommendations": ["b", "c"],}', ("a", "b\nc")),
+    ('{"Insights": {"market": "big"}, "RECOMMENDATIONS": "b"}', ("market: big", "b")),
+    ('{"ai_insights": "a", "recommendations": "b"}', ("a", "b")),
+    ("## Insights\nGrowing market.\n## Recommendations\nExpand.", ("Growing market.", "Expand.")),
+])
+def test_parse_accepts_common_reply_shapes(reply, expected):
+    assert parse(reply) == expected
+
+
+@pytest.mark.parametrize("reply", [
+    "",
+    "I cannot help with that.",
+    '{"insights": "only one section"}',
+    '{"insights": "", "recommendations": "b"}',
+    '["insights", "recommendations"]',
+])
+def test_parse_rejects_incomplete_replies(reply):
+    assert parse(reply) is None
+
+
+def combined_master(scripted_groq_client, *replies):
+    master = MasterAgent(concurrent=False, llm_mode="combined", agent_cache=AgentCache(ttls={}))
+    master.groq_client, provider = scripted_groq_client(*replies)
+    return master, master.gather_molecule_data("aspirin"), provider
+
+
+def test_combined_mode_makes_one_call_and_strips_markdown(scripted_groq_client):
+    master, data, provider = combined_master(scripted_groq_client, GOOD_REPLY)
+
+    assert master.generate_ai_analysis(data) == ("Strong market", "Pursue label expansion")
+    assert len(provider.calls) == 1
+
+
+def test_unparseable_reply_falls_back_to_separate_calls(scripted_groq_client):
+    master, data, provider = combined_master(scripted_groq_client, "not json at all", "Fallback text")
+
+    assert master.generate_ai_analysis(data) == ("Fallback text", "Fallback text")
+    assert len(provider.calls) == 3
+
+
+def test_unparseable_reply_is_not_cached(scripted_groq_client):
+    master, data, provider = combined_master(scripted_groq_client, "not json", "fallback", "fallback", GOOD_REPLY)
+
+    master.generate_ai_analysis(data)
+    # The next analysis asks the model again instead of replaying the bad reply
+    assert master.generate_ai_analysis(data) == ("Strong market", "Pursue label expansion")
+    assert len(provider.calls) == 4
+
+    # A parseable reply is cached
+    assert master.generate_ai_analysis(data) == ("Strong market", "Pursue label expansion")
+    assert len(provider.calls) == 4
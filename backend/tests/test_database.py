@@ -0,0 +1,173 @@
+"""Tests for the lazy MongoDB connection monitor and the readiness-gated handles."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import database
+
+
+class FakeMongoClient:
+    """Sync client double whose pings follow a script (an Exception entry fails that ping)."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.pings = 0
+        self.closed = False
+        self.admin = self
+
+    def command(self, name):
+        self.pings += 1
+        outcome = self.outcomes[min(self.pings, len(self.outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"ok": 1}
+
+    def close(self):
+        self.closed = True
+
+    def __getitem__(self, name):
+        return ("db", self, name)
+
+
+class FakeAsyncMongoClient:
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+        FakeAsyncMongoClient.instances.append(self)
+
+    async def close(self):
+        self.closed = True
+
+    def __getitem__(self, name):
+        return ("async-db", self, name)
+
+
+class RecordingStop(threading.Event):
+    """Stop event that records the monitor's waits and stops it after ``limit`` of them."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        if len(self.waits) >= self.limit:
+            self.set()
+        return self.is_set()
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Install a fake sync client factory; returns a setter for the ping script."""
+    clients = []
+    script = {"outcomes": [{"ok": 1}]}
+
+    def make_client(*args, **kwargs):
+        assert kwargs.get("connect") is False
+        client = FakeMongoClient(script["outcomes"])
+        clients.append(client)
+        return client
+
+    database.stop_connection_monitor()
+    monkeypatch.setattr(database, "MongoClient", make_client)
+    monkeypatch.setattr(database, "AsyncMongoClient", FakeAsyncMongoClient)
+    monkeypatch.setattr(database, "MONGO_RECONNECT_MIN_DELAY", 0.01)
+    monkeypatch.setattr(database, "MONGO_RECONNECT_MAX_DELAY", 0.04)
+    monkeypatch.setattr(database, "MONGO_HEALTHCHECK_INTERVAL", 0.01)
+    FakeAsyncMongoClient.instances.clear()
+
+    def use(*outcomes):
+        script["outcomes"] = list(outcomes)
+        return clients
+
+    yield use
+    database.stop_connection_monitor()
+    monkeypatch.setattr(database, "_async_client", None)
+    monkeypatch.setattr(database, "_async_client_loop", None)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.005)
+
+
+def test_nothing_connects_until_first_use(mongo):
+    clients = mongo({"ok": 1})
+
+    assert database.database_status()["state"] == database.STATE_IDLE
+    assert clients == []
+
+    assert database.wait_for_connection(2) is True
+    assert len(clients) == 1
+    assert database.get_db() == ("db", clients[0], database.DB_NAME)
+
+
+def test_handles_are_none_while_unavailable(mongo):
+    clients = mongo(ConnectionError("refused"))
+
+    assert database.wait_for_connection(2) is False
+    status = database.database_status()
+    assert status["state"] == database.STATE_UNAVAILABLE
+    assert status["ready"] is False
+    assert "refused" in status["last_error"]
+
+    async def handles():
+        return database.get_async_db(), database.get_users_collection(), database.get_reports_collection()
+
+    assert database.get_db() is None
+    assert asyncio.run(handles()) == (None, None, None)
+    # Not even a client was created for the routes
+    assert FakeAsyncMongoClient.instances == []
+    assert len(clients) == 1
+
+
+def test_monitor_reconnects_in_the_background(mongo):
+    clients = mongo(ConnectionError("down"), ConnectionError("down"), {"ok": 1})
+
+    assert database.wait_for_connection(2) is False
+    wait_until(database.is_ready)
+
+    assert clients[0].pings >= 3
+    assert database.database_status()["last_error"] is None
+    assert database.get_db() is not None
+
+    database.stop_connection_monitor()
+    assert clients[0].closed
+    assert database.database_status()["state"] == database.STATE_IDLE
+
+
+def test_monitor_backs_off_exponentially_and_resets_after_success(monkeypatch, mongo):
+    monkeypatch.setattr(database, "_set_state", lambda state, error=None: None)
+    down = ConnectionError("down")
+    client = FakeMongoClient([down, down, down, down, {"ok": 1}, down])
+    stop = RecordingStop(limit=6)
+
+    database._monitor_connection(client, stop)
+
+    assert stop.waits == [0.01, 0.02, 0.04, 0.04, 0.01, 0.01]
+
+
+def test_async_handle_is_bound_to_the_running_loop(mongo):
+    mongo({"ok": 1})
+    assert database.wait_for_connection(2)
+
+    async def handle():
+        db = database.get_async_db()
+        assert database.get_async_db() is not None
+        # Let a replaced client's close task run
+        await asyncio.sleep(0)
+        return db
+
+    first = asyncio.run(handle())
+    second = asyncio.run(handle())
+
+    assert first[1] is not second[1]
+    assert first[1].closed and not second[1].closed
+    assert len(FakeAsyncMongoClient.instances) == 2
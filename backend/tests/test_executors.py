@@ -0,0 +1,91 @@
+"""Tests for the bounded blocking-work executors."""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from utils.executors import BoundedExecutor, get_executor, run_blocking, LLM_POOL
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_concurrency_is_capped_and_stats_track_running_and_queued_work():
+    executor = BoundedExecutor("test", max_workers=2)
+    release = threading.Event()
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(5)
+        with lock:
+            running -= 1
+        return "done"
+
+    async def main():
+        tasks = [asyncio.ensure_future(executor.run(work)) for _ in range(5)]
+        while executor.stats()["active"] < 2:
+            await asyncio.sleep(0.01)
+        busy = executor.stats()
+        release.set()
+        return busy, await asyncio.gather(*tasks)
+
+    busy, results = asyncio.run(main())
+
+    assert busy == {"max_workers": 2, "active": 2, "queued": 3, "completed": 0, "cancelled": 0}
+    assert results == ["done"] * 5
+    assert peak == 2
+    assert executor.stats() == {"max_workers": 2, "active": 0, "queued": 0, "completed": 5, "cancelled": 0}
+    executor.shutdown()
+
+
+def test_cancelled_queued_work_is_not_counted_as_queued():
+    executor = BoundedExecutor("test", max_workers=1)
+    release = threading.Event()
+    ran = []
+
+    async def main():
+        blocker = asyncio.ensure_future(executor.run(release.wait, 5))
+        waiting = asyncio.ensure_future(executor.run(ran.append, "late"))
+        while executor.stats()["active"] < 1:
+            await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        await blocker
+
+    asyncio.run(main())
+
+    assert ran == []
+    assert executor.stats() == {"max_workers": 1, "active": 0, "queued": 0, "completed": 1, "cancelled": 1}
+    executor.shutdown()
+
+
+def test_exceptions_and_context_variables_reach_the_caller():
+    executor = BoundedExecutor("test", max_workers=1)
+
+    def fail():
+        raise ValueError(f"failed for {request_id.get()}")
+
+    async def main():
+        request_id.set("req-1")
+        seen = await executor.run(request_id.get)
+        with pytest.raises(ValueError, match="failed for req-1"):
+            await executor.run(fail)
+        return seen
+
+    assert asyncio.run(main()) == "req-1"
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+
+def test_run_blocking_uses_the_shared_named_pool():
+    thread_name = asyncio.run(run_blocking(LLM_POOL, lambda: threading.current_thread().name))
+
+    assert get_executor(LLM_POOL) is get_executor(LLM_POOL)
+    assert thread_name.startswith("llm-pool")
@@ -0,0 +1,125 @@
+"""Tests for the durable batch-job queue: claims, leases, checkpoints and retries."""
+
+import pytest
+
+import jobs
+from jobs import STATUS_COMPLETED, STATUS_QUEUED, STATUS_RUNNING, FileJobStore, JobWorker
+
+
+class FakeMaster:
+    """Stands in for MasterAgent.iter_batch_analyze, failing the scripted molecules."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})  # molecule -> attempts that fail
+        self.batches = []
+
+    def iter_batch_analyze(self, molecules, max_workers=None):
+        self.batches.append(list(molecules))
+        for molecule in molecules:
+            if self.failures.get(molecule, 0) > 0:
+                self.failures[molecule] -= 1
+                yield molecule, {"error": "upstream timeout"}
+            else:
+                yield molecule, {"molecule": molecule}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileJobStore(str(tmp_path))
+
+
+def test_claim_takes_oldest_queued_job_once(store):
+    first = store.create(["aspirin"])
+    second = store.create(["metformin"])
+
+    claimed = store.claim("worker-a")
+    assert claimed["_id"] == first["_id"]
+    assert claimed["status"] == STATUS_RUNNING
+    assert claimed["worker_id"] == "worker-a"
+    assert claimed["attempts"] == 1
+    assert store.claim("worker-b")["_id"] == second["_id"]
+    assert store.claim("worker-c") is None
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(store):
+    job = store.create(["aspirin", "metformin"])
+    store.claim("worker-a", lease_seconds=-1)
+
+    reclaimed = store.claim("worker-b")
+
+    assert reclaimed["_id"] == job["_id"]
+    assert reclaimed["worker_id"] == "worker-b"
+    assert reclaimed["attempts"] == 2
+    # The old owner can no longer finish the job it lost
+    store.finish(job["_id"], "worker-a", STATUS_COMPLETED)
+    assert store.get(job["_id"])["status"] == STATUS_RUNNING
+
+
+def test_live_lease_is_not_reclaimed(store):
+    store.create(["aspirin"])
+    store.claim("worker-a", lease_seconds=300)
+
+    assert store.claim("worker-b") is None
+
+
+def test_resumed_job_skips_checkpointed_molecules(store):
+    job = store.create(["aspirin", "metformin", "doxycycline"])
+    # A previous worker checkpointed one molecule and then died
+    claimed = store.claim("crashed", lease_seconds=-1)
+    store.checkpoint(job["_id"], "crashed", "aspirin", {"molecule": "aspirin", "from": "first run"},
+                     lease_seconds=-1)
+    master = FakeMaster()
+
+    assert JobWorker(store, master).run_once() is True
+
+    assert claimed["attempts"] == 1
+    assert master.batches == [["metformin", "doxycycline"]]
+    finished = store.get(job["_id"])
+    assert finished["status"] == STATUS_COMPLETED
+    assert finished["completed"] == 3
+    results = store.get_results(job["_id"])
+    assert set(results) == {"aspirin", "metformin", "doxycycline"}
+    assert results["aspirin"]["from"] == "first run"
+
+
+def test_failed_molecules_are_retried_on_the_next_attempt(store):
+    job = store.create(["aspirin", "metformin"])
+    master = FakeMaster(failures={"metformin": 1})
+    worker = JobWorker(store, master)
+
+    worker.run_once()
+    released = store.get(job["_id"])
+    assert released["status"] == STATUS_QUEUED
+    assert "metformin" in released["error"]
+    assert set(store.get_results(job["_id"])) == {"aspirin"}
+
+    worker.run_once()
+    assert master.batches == [["aspirin", "metformin"], ["metformin"]]
+    finished = store.get(job["_id"])
+    assert finished["status"] == STATUS_COMPLETED
+    assert finished["error"] is None
+    assert store.get_results(job["_id"])["metformin"] == {"molecule": "metformin"}
+
+
+def test_errors_are_kept_after_the_last_attempt(store, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 2)
+    job = store.create(["aspirin"])
+    master = FakeMaster(failures={"aspirin": 5})
+    worker = JobWorker(store, master)
+
+    worker.run_once()
+    worker.run_once()
+
+    assert worker.run_once() is False
+    assert len(master.batches) == 2
+    assert store.get(job["_id"])["status"] == STATUS_COMPLETED
+    assert store.get_results(job["_id"]) == {"aspirin": {"error": "upstream timeout"}}
+
+
+def test_torn_checkpoint_line_is_recomputed(store):
+    job = store.create(["aspirin", "metformin"])
+    store.checkpoint(job["_id"], None, "aspirin", {"molecule": "aspirin"})
+    with open(store._results_path(job["_id"]), "a", encoding="utf-8") as f:
+        f.write('{"molecule": "metformin", "resu')
+
+    assert store.completed_molecules(job["_id"]) == ["aspirin"]
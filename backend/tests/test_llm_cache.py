@@ -0,0 +1,126 @@
+"""Tests for the two-tier LLM response cache and how GroqClient uses it."""
+
+import asyncio
+import sqlite3
+
+from utils.llm_cache import LLMCache
+
+
+def fake_clock(monkeypatch, start=1000.0):
+    clock = [start]
+    monkeypatch.setattr("utils.llm_cache.time.time", lambda: clock[0])
+    return clock
+
+
+def disk_rows(path):
+    with sqlite3.connect(path) as db:
+        return [key for (key,) in db.execute("SELECT key FROM llm_cache ORDER BY created_at")]
+
+
+def test_make_key_covers_every_completion_parameter():
+    base = LLMCache.make_key("model", "system", "prompt", 0.7, 100)
+
+    assert base == LLMCache.make_key("model", "system", "prompt", 0.7, 100)
+    assert base != LLMCache.make_key("model", "system", "prompt", 0.2, 100)
+    assert base != LLMCache.make_key("model", "system", "prompt", 0.7, 200)
+    assert base != LLMCache.make_key("other", "system", "prompt", 0.7, 100)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    cache = LLMCache(ttl_seconds=60)
+    cache.set("key", "response")
+
+    clock[0] += 59
+    assert cache.get("key") == "response"
+    clock[0] += 1
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LLMCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMCache(db_path=path).set("key", "response")
+
+    restarted = LLMCache(db_path=path)
+
+    assert restarted.get("key") == "response"
+    assert restarted.stats()["disk_hits"] == 1
+    # Promoted into memory: the next hit does not touch the disk
+    assert restarted.get("key") == "response"
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_expired_disk_rows_are_not_served_after_a_restart(tmp_path, monkeypatch):
+    clock = fake_clock(monkeypatch)
+    path = str(tmp_path / "cache.sqlite3")
+    LLMCache(db_path=path, ttl_seconds=60).set("key", "response")
+
+    clock[0] += 120
+    assert LLMCache(db_path=path, ttl_seconds=60).get("key") is None
+    assert disk_rows(path) == []
+
+
+def test_writes_prune_expired_and_oldest_disk_rows(tmp_path, monkeypatch):
+    clock = fake_clock(monkeypatch)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(db_path=path, ttl_seconds=60, max_disk_entries=3)
+
+    cache.set("stale", "0")
+    clock[0] += 61
+    for key in ("a", "b", "c", "d"):
+        cache.set(key, key)
+        clock[0] += 1
+
+    # "stale" expired without ever being read again; "a" is the oldest beyond the cap
+    assert disk_rows(path) == ["b", "c", "d"]
+    assert cache.stats()["disk_evictions"] == 2
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(db_path=path)
+    cache.set("key", "response")
+
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert disk_rows(path) == []
+
+
+def test_error_responses_are_never_cached(scripted_groq_client):
+    client, provider = scripted_groq_client(RuntimeError("rate limited"), "Fresh answer")
+
+    assert client.query("prompt").startswith("Error querying Groq API")
+    assert client.cache.stats()["entries"] == 0
+    assert client.query("prompt") == "Fresh answer"
+    assert client.query("prompt") == "Fresh answer"
+    assert len(provider.calls) == 2
+
+
+def test_async_and_streamed_errors_are_never_cached(scripted_groq_client):
+    client, provider = scripted_groq_client(RuntimeError("timeout"), RuntimeError("timeout"), "Fresh answer")
+
+    async def main():
+        first = await client.aquery("prompt")
+        streamed = "".join([delta async for delta in client.astream_query("prompt")])
+        return first, streamed, await client.aquery("prompt")
+
+    first, streamed, fresh = asyncio.run(main())
+
+    assert first.startswith("Error querying Groq API")
+    assert streamed.startswith("Error querying Groq API")
+    assert fresh == "Fresh answer"
+    assert len(provider.calls) == 3
@@ -0,0 +1,133 @@
+"""Tests for the record/replay cassette and LLM_PROVIDER selection."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import ScriptedProvider
+from utils.groq_client import GroqClient
+from utils.llm_cache import LLMCache
+from utils.llm_providers import (
+    CassetteProvider,
+    GroqProvider,
+    LLMProvider,
+    LLMProviderError,
+    MissingAPIKeyError,
+    SyntheticProvider,
+    create_provider,
+)
+
+LLMProvider.register(ScriptedProvider)
+
+MODEL = "llama-3.3-70b-versatile"
+MESSAGES = [{"role": "system", "content": "You are an analyst."}, {"role": "user", "content": "Summarize aspirin."}]
+
+
+def collect(stream):
+    async def run():
+        return [delta async for delta in stream]
+
+    return asyncio.run(run())
+
+
+def test_record_appends_responses_and_replay_serves_them(tmp_path):
+    path = str(tmp_path / "cassettes" / "llm.jsonl")
+    inner = ScriptedProvider(["first answer", "second answer"])
+    recorder = CassetteProvider(path, mode="record", inner=inner)
+
+    assert recorder.complete(MODEL, MESSAGES, 0.7, 100) == "first answer"
+    assert asyncio.run(recorder.acomplete(MODEL, MESSAGES, 0.7, 200)) == "second answer"
+
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["response"] for entry in entries] == ["first answer", "second answer"]
+    assert entries[0]["messages"] == MESSAGES
+
+    player = CassetteProvider(path, mode="replay")
+    assert player.complete(MODEL, MESSAGES, 0.7, 100) == "first answer"
+    assert asyncio.run(player.acomplete(MODEL, MESSAGES, 0.7, 200)) == "second answer"
+
+
+def test_later_recording_of_same_request_wins(tmp_path):
+    path = str(tmp_path / "llm.jsonl")
+    recorder = CassetteProvider(path, mode="record", inner=ScriptedProvider(["old", "new"]))
+    recorder.complete(MODEL, MESSAGES, 0.7, 100)
+    recorder.complete(MODEL, MESSAGES, 0.7, 100)
+
+    assert CassetteProvider(path, mode="replay").complete(MODEL, MESSAGES, 0.7, 100) == "new"
+
+
+def test_recorded_stream_replays_as_the_same_text(tmp_path):
+    path = str(tmp_path / "llm.jsonl")
+    recorder = CassetteProvider(path, mode="record", inner=ScriptedProvider(["streamed reply text"]))
+
+    recorded = collect(recorder.astream(MODEL, MESSAGES, 0.7, 100))
+    replayed = collect(CassetteProvider(path, mode="replay").astream(MODEL, MESSAGES, 0.7, 100))
+
+    assert "".join(recorded) == "streamed reply text"
+    assert "".join(replayed) == "streamed reply text"
+
+
+def test_replay_miss_raises_and_client_returns_error(tmp_path):
+    path = str(tmp_path / "llm.jsonl")
+    CassetteProvider(path, mode="record", inner=ScriptedProvider(["answer"])).complete(MODEL, MESSAGES, 0.7, 100)
+    player = CassetteProvider(path, mode="replay")
+
+    # Any change to the request (here max_tokens) is a different cassette key
+    with pytest.raises(LLMProviderError):
+        player.complete(MODEL, MESSAGES, 0.7, 101)
+    with pytest.raises(LLMProviderError):
+        collect(player.astream(MODEL, MESSAGES, 0.3, 100))
+
+    client = GroqClient(provider=player, cache=LLMCache())
+    assert client.query("Another prompt").startswith("Error")
+
+
+def test_replay_without_cassette_file_misses(tmp_path):
+    player = CassetteProvider(str(tmp_path / "missing.jsonl"), mode="replay")
+
+    with pytest.raises(LLMProviderError):
+        player.complete(MODEL, MESSAGES, 0.7, 100)
+    assert not (tmp_path / "missing.jsonl").exists()
+
+
+def test_cassette_rejects_bad_modes(tmp_path):
+    with pytest.raises(ValueError):
+        CassetteProvider(str(tmp_path / "llm.jsonl"), mode="rewind")
+    with pytest.raises(ValueError):
+        CassetteProvider(str(tmp_path / "llm.jsonl"), mode="record")
+
+
+def test_create_provider_reads_llm_provider(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CASSETTE_PATH", str(tmp_path / "llm.jsonl"))
+    monkeypatch.setenv("LLM_SYNTHETIC_LATENCY_MS", "5")
+    monkeypatch.setenv("LLM_SYNTHETIC_ERROR_RATE", "0.25")
+    monkeypatch.setenv("LLM_SYNTHETIC_SEED", "7")
+
+    monkeypatch.setenv("LLM_PROVIDER", "Synthetic")
+    synthetic = create_provider()
+    assert isinstance(synthetic, SyntheticProvider)
+    assert (synthetic.latency_ms, synthetic.error_rate) == (5.0, 0.25)
+
+    monkeypatch.setenv("LLM_PROVIDER", "replay")
+    replay = create_provider()
+    assert isinstance(replay, CassetteProvider)
+    assert (replay.mode, replay.path) == ("replay", str(tmp_path / "llm.jsonl"))
+
+    monkeypatch.setenv("LLM_PROVIDER", "groq")
+    assert isinstance(create_provider(api_key="test-key"), GroqProvider)
+
+    # An explicit name overrides the environment
+    assert isinstance(create_provider("synthetic"), SyntheticProvider)
+
+
+def test_create_provider_errors(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    with pytest.raises(ValueError):
+        create_provider()
+
+    # groq and record need a key; replay and synthetic do not
+    for name in ("groq", "record"):
+        with pytest.raises(MissingAPIKeyError):
+            create_provider(name)
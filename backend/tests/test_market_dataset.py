@@ -0,0 +1,129 @@
+"""Tests for the columnar market dataset behind IQVIAAgent."""
+
+import random
+
+import numpy as np
+import pytest
+
+from agents.iqvia_agent import IQVIAAgent
+from utils.market_dataset import MarketDataset
+
+MOCK = IQVIAAgent.MOCK_MARKET_DATA
+
+
+def loop_trends(records):
+    """The per-molecule loop get_therapeutic_area_trends used before the dataset."""
+    areas = {}
+    for data in records.values():
+        area = areas.setdefault(data["therapeutic_area"], {
+            "area": data["therapeutic_area"], "total_market_size": 0, "avg_growth_rate": 0, "molecule_count": 0,
+        })
+        area["total_market_size"] += data["market_size_usd"]
+        area["avg_growth_rate"] += data["growth_rate"]
+        area["molecule_count"] += 1
+    for area in areas.values():
+        area["avg_growth_rate"] = area["avg_growth_rate"] / area["molecule_count"]
+    return sorted(areas.values(), key=lambda area: area["avg_growth_rate"], reverse=True)[:5]
+
+
+def random_records(molecules, seed):
+    rng = random.Random(seed)
+    records = {}
+    for index in range(molecules):
+        regions = {
+            region: {"market_size": rng.randint(1, 100) * 1e6, "growth": rng.choice((0.01, 0.02, 0.05))}
+            for region in rng.sample(["North America", "Europe", "Asia", "LATAM"], rng.randint(1, 4))
+        }
+        records[f"molecule-{index}"] = {
+            "market_size_usd": rng.randint(1, 1000) * 1e6,
+            # Few distinct growth rates so several areas tie on average growth
+            "growth_rate": rng.choice((0.02, 0.04, 0.06)),
+            "therapeutic_area": f"Area {rng.randint(0, 11)}",
+            "regions": regions,
+        }
+    return records
+
+
+def test_trends_match_loop_on_mock_data():
+    assert MarketDataset.from_records(MOCK).therapeutic_area_trends(top=5) == loop_trends(MOCK)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_trends_match_loop_on_random_data_with_ties(seed):
+    records = random_records(300, seed)
+
+    assert MarketDataset.from_records(records).therapeutic_area_trends(top=5) == loop_trends(records)
+
+
+def test_query_market_data_matches_mock_records():
+    agent = IQVIAAgent(dataset=MarketDataset.from_records(MOCK))
+
+    for molecule, record in MOCK.items():
+        data = agent.query_market_data(molecule.upper())
+        expected = {**record, "molecule": molecule.upper(), "data_source": "IQVIA"}
+        assert list(data)[:len(record)] == list(record)
+        assert {key: data[key] for key in expected} == expected
+        assert data["competitors_count"] == len(record.get("top_competitors", []))
+        assert agent.get_regional_analysis(molecule) == record.get("regions", {})
+
+
+def test_unknown_molecule_gets_generic_data():
+    agent = IQVIAAgent(dataset=MarketDataset.from_records(MOCK))
+
+    data = agent.query_market_data("unobtainium")
+    assert data["therapeutic_area"] == "Unknown"
+    assert "note" in data
+    assert set(agent.get_regional_analysis("unobtainium")) == {"North America", "Europe", "Asia"}
+
+
+def test_load_csv_derives_molecule_figures_from_regions(tmp_path):
+    path = tmp_path / "market.csv"
+    path.write_text(
+        "molecule,region,therapeutic_area,market_size_usd,growth_rate\n"
+        "Aspirin,Europe,Cardiology,100,0.02\n"
+        "Metformin,Europe,Diabetes,50,0.08\n"
+        "aspirin,Asia,Cardiology,300,0.06\n"
+    )
+    dataset = MarketDataset.load(str(path))
+
+    assert len(dataset) == 3 and "ASPIRIN" in dataset
+    record = dataset.molecule_record("aspirin")
+    assert record["market_size_usd"] == 400
+    assert record["growth_rate"] == pytest.approx((100 * 0.02 + 300 * 0.06) / 400)
+    assert "market_size_units" not in record
+    assert record["regions"] == {
+        "Europe": {"market_size": 100, "growth": 0.02},
+        "Asia": {"market_size": 300, "growth": 0.06},
+    }
+    assert [area["area"] for area in dataset.therapeutic_area_trends(top=None)] == ["Diabetes", "Cardiology"]
+
+
+def test_molecule_columns_override_derived_figures(tmp_path):
+    path = tmp_path / "market.csv"
+    path.write_text(
+        "molecule,region,therapeutic_area,market_size_usd,growth_rate,molecule_market_size_usd,molecule_growth_rate\n"
+        "Aspirin,Europe,Cardiology,100,0.02,1000,0.07\n"
+        "Aspirin,Asia,Cardiology,300,0.06,1000,0.07\n"
+        "Metformin,Europe,Diabetes,50,0.05,,\n"
+    )
+    dataset = MarketDataset.load(str(path))
+
+    assert dataset.molecule_record("aspirin")["market_size_usd"] == 1000
+    assert dataset.molecule_record("aspirin")["growth_rate"] == 0.07
+    assert dataset.molecule_record("metformin")["market_size_usd"] == 50
+
+
+def test_missing_columns_are_rejected():
+    with pytest.raises(ValueError, match="growth_rate"):
+        MarketDataset({
+            "molecule": np.array(["a"]), "region": np.array(["EU"]),
+            "therapeutic_area": np.array(["X"]), "market_size_usd": np.array([1.0]),
+        })
+
+
+def test_empty_dataset():
+    dataset = MarketDataset.from_records({})
+
+    assert len(dataset) == 0
+    assert dataset.molecule_record("aspirin") is None
+    assert dataset.therapeutic_area_trends() == []
@@ -0,0 +1,114 @@
+"""Tests for the Master Agent fan-out (data agents and LLM calls run concurrently)."""
+
+import threading
+
+import pytest
+
+from agents.clinical_agent import ClinicalAgent
+from agents.iqvia_agent import IQVIAAgent
+from agents.master_agent import MasterAgent
+from agents.patent_agent import PatentAgent
+from agents.webintel_agent import WebIntelAgent
+from utils.agent_cache import AgentCache
+
+SECTIONS = ("market_data", "clinical_data", "patent_data", "web_data")
+
+
+def no_cache() -> AgentCache:
+    return AgentCache(ttls={section: 0 for section in SECTIONS})
+
+
+def comparable(aggregated: dict) -> dict:
+    """Drop the fields that depend on when the analysis ran."""
+    result = {key: value for key, value in aggregated.items() if key not in ("timestamp", "data_freshness")}
+    for section in SECTIONS:
+        result[section] = {k: v for k, v in result[section].items() if k not in ("query_date", "search_date")}
+    return result
+
+
+def test_concurrent_and_sequential_gather_agree():
+    concurrent = MasterAgent(concurrent=True, agent_cache=no_cache()).gather_molecule_data("aspirin")
+    sequential = MasterAgent(concurrent=False, agent_cache=no_cache()).gather_molecule_data("aspirin")
+
+    assert set(SECTIONS) <= set(concurrent)
+    assert comparable(concurrent) == comparable(sequential)
+    assert set(concurrent["data_freshness"]) == set(SECTIONS)
+
+
+def test_data_agents_run_in_parallel(monkeypatch):
+    # Every agent waits for all four to be running; a sequential gather would break the barrier
+    barrier = threading.Barrier(len(SECTIONS), timeout=5)
+
+    def meeting(original):
+        def method(self, molecule_name, *args):
+            barrier.wait()
+            return original(self, molecule_name, *args)
+        method.__name__ = original.__name__
+        return method
+
+    for agent_class, name in [
+        (IQVIAAgent, "query_market_data"),
+        (ClinicalAgent, "query_trials"),
+        (PatentAgent, "query_patents"),
+        (WebIntelAgent, "search_publications"),
+    ]:
+        monkeypatch.setattr(agent_class, name, meeting(getattr(agent_class, name)))
+
+    aggregated = MasterAgent(concurrent=True, agent_cache=no_cache()).gather_molecule_data("metformin")
+
+    assert not barrier.broken
+    assert all("error" not in aggregated[section] for section in SECTIONS)
+
+
+def test_agent_failure_is_isolated_to_its_section(monkeypatch):
+    def broken(self, molecule_name):
+        raise RuntimeError("registry down")
+    broken.__name__ = "query_trials"
+    monkeypatch.setattr(ClinicalAgent, "query_trials", broken)
+
+    aggregated = MasterAgent(concurrent=True, agent_cache=no_cache()).gather_molecule_data("aspirin")
+
+    assert "registry down" in aggregated["clinical_data"]["error"]
+    assert aggregated["market_data"]["therapeutic_area"] == "Cardiovascular"
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_separate_mode_makes_both_llm_calls(scripted_groq_client, concurrent):
+    master = MasterAgent(concurrent=concurrent, llm_mode="separate", agent_cache=no_cache())
+    master.groq_client, provider = scripted_groq_client("**Generated** text")
+
+    result = master.query_molecule("doxycycline")
+
+    assert len(provider.calls) == 2
+    assert result["ai_insights"] == "Generated text"
+    assert result["recommendations"] == "Generated text"
+
+
+def test_missing_api_key_disables_ai_analysis():
+    master = MasterAgent(agent_cache=no_cache())
+
+    insights, recommendations = master.generate_ai_analysis(master.gather_molecule_data("aspirin"))
+
+    assert master.groq_client is None
+    assert "not configured" in insights
+
+
+@pytest.mark.parametrize("llm_mode, reply", [
+    ("separate", "Generated text"),
+    ("combined", '{"insights": "Generated text", "recommendations": "Generated text"}'),
+])
+def test_failed_agent_does_not_break_ai_analysis(monkeypatch, scripted_groq_client, llm_mode, reply):
+    def broken(self, molecule_name):
+        raise RuntimeError("feed down")
+    broken.__name__ = "query_market_data"
+    monkeypatch.setattr(IQVIAAgent, "query_market_data", broken)
+    master = MasterAgent(concurrent=False, llm_mode=llm_mode, agent_cache=no_cache())
+    master.groq_client, provider = scripted_groq_client(reply)
+
+    result = master.query_molecule("aspirin")
+
+    assert "feed down" in result["market_data"]["error"]
+    assert result["ai_insights"] == "Generated text"
+    assert result["recommendations"] == "Generated text"
+    assert all("Market Size: N/A" in str(messages) for messages in provider.calls)
+    assert master.ai_input_hash(result) is None
@@ -0,0 +1,94 @@
+"""Tests for the MongoDB latency instrumentation of sync and async collections."""
+
+import asyncio
+
+import pytest
+
+from jobs import MongoJobStore
+from utils.metrics import MONGO_DURATION, MONGO_ERRORS, InstrumentedCollection
+
+
+def observed(metric, suffix, collection, operation) -> float:
+    prefix = f'{metric.name}{suffix}{{collection="{collection}",operation="{operation}"}} '
+    for line in metric.render():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return 0.0
+
+
+def mongo_count(collection, operation) -> float:
+    return observed(MONGO_DURATION, "_count", collection, operation)
+
+
+class SyncCollection:
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+
+    def find_one(self, query):
+        return next((doc for doc in self.documents if doc.items() >= query.items()), None)
+
+    def find(self, query, projection=None):
+        return iter([doc for doc in self.documents if doc.items() >= query.items()])
+
+    def insert_one(self, document):
+        if any(doc["_id"] == document["_id"] for doc in self.documents):
+            raise ValueError("duplicate key")
+        self.documents.append(document)
+
+
+class AsyncCollection:
+    async def find_one(self, query):
+        await asyncio.sleep(0)
+        return {"_id": 1}
+
+
+def test_sync_operations_are_timed():
+    collection = InstrumentedCollection(SyncCollection([{"_id": 1}]), "sync_test")
+    before = mongo_count("sync_test", "find_one")
+
+    assert collection.find_one({"_id": 1}) == {"_id": 1}
+    assert mongo_count("sync_test", "find_one") == before + 1
+
+
+def test_sync_cursor_is_timed_once_when_exhausted():
+    collection = InstrumentedCollection(SyncCollection([{"_id": 1}, {"_id": 2}]), "sync_test")
+    before = mongo_count("sync_test", "find")
+
+    assert [doc["_id"] for doc in collection.find({})] == [1, 2]
+    assert mongo_count("sync_test", "find") == before + 1
+
+
+def test_sync_errors_are_counted():
+    collection = InstrumentedCollection(SyncCollection([{"_id": 1}]), "sync_test")
+    before = observed(MONGO_ERRORS, "", "sync_test", "insert_one")
+
+    with pytest.raises(ValueError):
+        collection.insert_one({"_id": 1})
+    assert observed(MONGO_ERRORS, "", "sync_test", "insert_one") == before + 1
+
+
+def test_async_operations_are_timed_when_awaited():
+    collection = InstrumentedCollection(AsyncCollection(), "async_test")
+    before = mongo_count("async_test", "find_one")
+
+    pending = collection.find_one({"_id": 1})
+    assert mongo_count("async_test", "find_one") == before
+    assert asyncio.run(pending) == {"_id": 1}
+    assert mongo_count("async_test", "find_one") == before + 1
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.jobs = SyncCollection()
+        self.job_results = SyncCollection()
+
+
+def test_job_store_traffic_is_instrumented():
+    store = MongoJobStore(FakeDatabase())
+    before = mongo_count("jobs", "insert_one")
+
+    job = store.create(["aspirin"])
+
+    assert mongo_count("jobs", "insert_one") == before + 1
+    assert store.get(job["_id"])["molecules"] == ["aspirin"]
+    assert mongo_count("jobs", "find_one") >= 1
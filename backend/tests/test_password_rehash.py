@@ -0,0 +1,88 @@
+"""Tests for upgrading weak password hashes on login."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import auth
+import routes_auth
+from schemas import UserLogin
+
+PASSWORD = "correct horse battery"
+
+
+class FakeUsers:
+    """Users collection double supporting the lookups and the guarded update done by login."""
+
+    def __init__(self, user):
+        self.user = user
+        self.updates = []
+
+    async def find_one(self, query):
+        if all(self.user.get(key) == value for key, value in query.items()):
+            return dict(self.user)
+        return None
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+        if all(self.user.get(key) == value for key, value in query.items()):
+            self.user.update(update["$set"])
+
+
+@pytest.fixture
+def users(monkeypatch):
+    # Low costs keep bcrypt fast: stored hash at 4, target cost 5
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 5)
+    collection = FakeUsers({
+        "_id": ObjectId(),
+        "name": "Ada",
+        "email": "ada@example.com",
+        "password_hash": auth.hash_password(PASSWORD, rounds=4),
+        "created_at": datetime(2024, 1, 1),
+    })
+    monkeypatch.setattr(routes_auth, "get_users_collection", lambda: collection)
+    return collection
+
+
+def test_password_needs_rehash_compares_cost(monkeypatch):
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 5)
+
+    assert auth.password_needs_rehash(auth.hash_password(PASSWORD, rounds=4))
+    assert not auth.password_needs_rehash(auth.hash_password(PASSWORD, rounds=5))
+    assert not auth.password_needs_rehash("not-a-bcrypt-hash")
+
+
+def test_successful_login_replaces_old_cost_hash(users):
+    old_hash = users.user["password_hash"]
+
+    token = asyncio.run(routes_auth.login(UserLogin(email="ada@example.com", password=PASSWORD)))
+
+    new_hash = users.user["password_hash"]
+    assert token.access_token
+    assert new_hash != old_hash
+    assert new_hash.split("$")[2] == "05"
+    assert auth.verify_password(PASSWORD, new_hash)
+    # The update only applies if nobody changed the hash since it was read
+    assert users.updates[0][0]["password_hash"] == old_hash
+
+
+def test_failed_login_leaves_old_hash_alone(users):
+    old_hash = users.user["password_hash"]
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(routes_auth.login(UserLogin(email="ada@example.com", password="wrong password")))
+
+    assert exc_info.value.status_code == 401
+    assert users.user["password_hash"] == old_hash
+    assert users.updates == []
+
+
+def test_current_cost_hash_is_not_rewritten(users):
+    users.user["password_hash"] = auth.hash_password(PASSWORD)
+
+    asyncio.run(routes_auth.login(UserLogin(email="ada@example.com", password=PASSWORD)))
+
+    assert users.updates == []
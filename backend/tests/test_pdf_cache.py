@@ -0,0 +1,68 @@
+"""Tests for the content-addressed PDF cache and ETag matching."""
+
+import pytest
+
+from utils.pdf_cache import PDFCache, etag_matches
+
+DATA = {"molecule": "aspirin", "market_data": {"market_size_usd": 2.1e9}}
+
+
+def test_etag_is_stable_for_equal_content():
+    reordered = {"market_data": {"market_size_usd": 2.1e9}, "molecule": "aspirin"}
+
+    etag = PDFCache.make_etag(DATA, "aspirin", "v1")
+
+    assert etag == PDFCache.make_etag(reordered, "aspirin", "v1")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+@pytest.mark.parametrize("data, molecule, template", [
+    ({**DATA, "molecule": "metformin"}, "aspirin", "v1"),
+    (DATA, "Aspirin", "v1"),
+    (DATA, "aspirin", "v2"),
+])
+def test_etag_changes_with_data_name_or_template(data, molecule, template):
+    assert PDFCache.make_etag(data, molecule, template) != PDFCache.make_etag(DATA, "aspirin", "v1")
+
+
+def test_get_and_put_count_hits_and_misses():
+    cache = PDFCache()
+
+    assert cache.get('"a"') is None
+    cache.put('"a"', b"%PDF-1")
+    assert cache.get('"a"') == b"%PDF-1"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_evicts_least_recently_used_over_byte_budget():
+    cache = PDFCache(max_bytes=10)
+    cache.put('"a"', b"aaaa")
+    cache.put('"b"', b"bbbb")
+    cache.get('"a"')
+    cache.put('"c"', b"cccc")
+
+    assert cache.get('"b"') is None
+    assert cache.get('"a"') == b"aaaa"
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_pdf_larger_than_budget_is_not_cached():
+    cache = PDFCache(max_bytes=4)
+    cache.put('"big"', b"too large")
+
+    assert cache.get('"big"') is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
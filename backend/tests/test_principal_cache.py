@@ -0,0 +1,88 @@
+"""Tests for the authenticated-principal cache and its use in get_current_user."""
+
+import asyncio
+import time
+
+from bson import ObjectId
+
+import routes_auth
+from auth import create_access_token
+from utils.principal_cache import PrincipalCache
+
+USER = {"_id": "u1", "email": "a@example.com", "password_hash": "$2b$secret"}
+
+
+def test_put_then_get_strips_password_hash():
+    cache = PrincipalCache()
+    cache.put("token", USER)
+
+    assert cache.get("token") == {"_id": "u1", "email": "a@example.com"}
+    assert cache.get("other-token") is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_entry_never_outlives_the_token():
+    cache = PrincipalCache(ttl_seconds=60)
+    cache.put("expired", USER, token_expires_at=time.time() - 1)
+    cache.put("expiring", USER, token_expires_at=time.time() + 0.05)
+
+    assert cache.get("expired") is None
+    assert cache.get("expiring") is not None
+    time.sleep(0.1)
+    assert cache.get("expiring") is None
+
+
+def test_zero_ttl_disables_caching():
+    cache = PrincipalCache(ttl_seconds=0)
+    cache.put("token", USER)
+
+    assert cache.get("token") is None
+
+
+def test_invalidate_user_drops_all_of_their_tokens():
+    cache = PrincipalCache()
+    cache.put("t1", USER)
+    cache.put("t2", USER)
+    cache.put("t3", {"_id": "u2"})
+
+    cache.invalidate_user("u1")
+
+    assert cache.get("t1") is None and cache.get("t2") is None
+    assert cache.get("t3") == {"_id": "u2"}
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_invalidate_token_and_lru_eviction():
+    cache = PrincipalCache(max_entries=2)
+    cache.put("t1", USER)
+    cache.put("t2", USER)
+    cache.invalidate_token("t2")
+    cache.put("t3", USER)
+    cache.get("t1")
+    cache.put("t4", USER)  # evicts t3, the least recently used
+
+    assert cache.get("t2") is None
+    assert cache.get("t3") is None
+    assert cache.get("t1") is not None and cache.get("t4") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_current_user_reads_the_database_once_per_token(monkeypatch):
+    user_id = ObjectId()
+    lookups = []
+
+    class Users:
+        async def find_one(self, query):
+            lookups.append(query)
+            return {"_id": user_id, "email": "a@example.com", "password_hash": "hash"}
+
+    monkeypatch.setattr(routes_auth, "principal_cache", PrincipalCache())
+    monkeypatch.setattr(routes_auth, "get_users_collection", lambda: Users())
+    header = "Bearer " + create_access_token({"sub": str(user_id)})
+
+    first = asyncio.run(routes_auth.get_current_user(header))
+    second = asyncio.run(routes_auth.get_current_user(header))
+
+    assert first["_id"] == second["_id"] == user_id
+    assert "password_hash" not in second
+    assert len(lookups) == 1
@@ -0,0 +1,129 @@
+"""Tests for keyset (cursor) pagination of the user-reports listing."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import routes_reports
+from routes_reports import decode_report_cursor, encode_report_cursor
+
+
+def matches(document: dict, query: dict) -> bool:
+    """Evaluate the subset of MongoDB filters the listing uses."""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not document[field] < condition["$lt"]:
+                return False
+        elif document[field] != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self._documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self._documents = self._documents[:count]
+        return self
+
+    def __aiter__(self):
+        self._iterator = iter(self._documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+class FakeReports:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        return FakeCursor([document for document in self.documents if matches(document, query)])
+
+
+async def read_page(limit, cursor=None):
+    response = await routes_reports.get_user_reports(authorization="Bearer t", limit=limit, cursor=cursor,
+                                                     include_data=False)
+    body = "".join([chunk async for chunk in response.body_iterator])
+    return json.loads(body)
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    base = datetime(2026, 1, 1)
+    documents = [
+        # Pairs share a created_at, so the _id tiebreaker matters
+        {"_id": ObjectId(), "user_id": "u1", "molecule_name": f"m{i}", "created_at": base + timedelta(hours=i // 2)}
+        for i in range(7)
+    ]
+    documents.append({"_id": ObjectId(), "user_id": "someone-else", "molecule_name": "x", "created_at": base})
+
+    async def current_user(authorization):
+        return {"_id": "u1"}
+
+    monkeypatch.setattr(routes_reports, "get_current_user", current_user)
+    monkeypatch.setattr(routes_reports, "get_reports_collection", lambda: FakeReports(documents))
+    return documents
+
+
+def test_cursor_round_trip_filters_strictly_after_position():
+    report = {"_id": ObjectId(), "created_at": datetime(2026, 3, 4, 5, 6, 7, 890000)}
+
+    query = decode_report_cursor(encode_report_cursor(report))
+
+    assert query == {"$or": [
+        {"created_at": {"$lt": report["created_at"]}},
+        {"created_at": report["created_at"], "_id": {"$lt": report["_id"]}},
+    ]}
+    assert not matches(report, query)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", "eyJjcmVhdGVkX2F0IjogIngiLCAiaWQiOiAieSJ9"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_report_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_pages_cover_every_report_once_newest_first(reports):
+    async def read_all():
+        seen, cursor = [], None
+        while True:
+            page = await read_page(limit=3, cursor=cursor)
+            assert len(page["reports"]) <= 3
+            seen.extend(page["reports"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(read_all())
+
+    own = sorted((d for d in reports if d["user_id"] == "u1"), key=lambda d: (d["created_at"], d["_id"]), reverse=True)
+    assert [report["_id"] for report in seen] == [str(document["_id"]) for document in own]
+
+
+def test_last_page_has_no_cursor(reports):
+    page = asyncio.run(read_page(limit=7))
+
+    assert len(page["reports"]) == 7
+    assert page["next_cursor"] is None
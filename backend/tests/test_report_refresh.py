@@ -0,0 +1,170 @@
+"""Tests for incremental refresh of saved reports (stale sections, AI skip, concurrency guard)."""
+
+import asyncio
+import copy
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import routes_reports
+from agents.master_agent import MasterAgent
+from utils.agent_cache import AgentCache
+
+
+class FakeReports:
+    """Single-document stand-in for the async reports collection."""
+
+    def __init__(self, document):
+        self.document = document
+        self.before_update = None
+
+    async def find_one(self, query):
+        return copy.deepcopy(self.document) if query["_id"] == self.document["_id"] else None
+
+    async def update_one(self, query, update):
+        if self.before_update is not None:
+            self.before_update()
+        matched = all(self.document.get(field) == value for field, value in query.items())
+        if matched:
+            for path, value in update["$set"].items():
+                *parents, leaf = path.split(".")
+                target = self.document
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[leaf] = value
+        return SimpleNamespace(matched_count=int(matched))
+
+
+@pytest.fixture
+def master(monkeypatch):
+    agent = MasterAgent(concurrent=False, agent_cache=AgentCache(ttls={}))
+    agent.fetched = []
+    agent.replacements = {}
+    agent.analyses = 0
+    original_fetch = agent.fetch_section
+
+    def fetch_section(section, molecule_name, *args, use_cache=True, **kwargs):
+        agent.fetched.append((section, use_cache))
+        value, freshness = original_fetch(section, molecule_name, *args, use_cache=use_cache, **kwargs)
+        replace = agent.replacements.get(section)
+        return (replace(value) if replace else value), freshness
+
+    def generate_ai_analysis(aggregated_data):
+        agent.analyses += 1
+        return "New insights", "New recommendations"
+
+    monkeypatch.setattr(agent, "fetch_section", fetch_section)
+    monkeypatch.setattr(agent, "generate_ai_analysis", generate_ai_analysis)
+    return agent
+
+
+@pytest.fixture
+def reports(monkeypatch, master):
+    now = datetime.utcnow()
+    data = master.gather_molecule_data("aspirin")
+    data.update(ai_insights="Old insights", recommendations="Old recommendations")
+    master.fetched.clear()
+    document = {
+        "_id": ObjectId(),
+        "user_id": "u1",
+        "molecule_name": "aspirin",
+        "data": data,
+        # Market data is past its 7-day TTL; every other section is fresh
+        "section_updated_at": {
+            "market_data": now - timedelta(days=8),
+            "clinical_data": now,
+            "patent_data": now,
+            "web_data": now,
+        },
+        "created_at": now - timedelta(days=8),
+        "updated_at": now - timedelta(hours=1),
+    }
+    collection = FakeReports(document)
+
+    async def current_user(authorization):
+        return {"_id": "u1"}
+
+    monkeypatch.setattr(routes_reports, "get_current_user", current_user)
+    monkeypatch.setattr(routes_reports, "get_reports_collection", lambda: collection)
+    return collection
+
+
+def refresh(reports, master, force=False):
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(master_agent=master)))
+    return asyncio.run(routes_reports.refresh_report(
+        str(reports.document["_id"]), request, force=force, authorization="Bearer t"
+    ))
+
+
+def test_only_stale_sections_are_refetched_bypassing_the_agent_cache(reports, master):
+    result = refresh(reports, master)
+
+    assert master.fetched == [("market_data", False)]
+    assert result["stale_sections"] == ["market_data"]
+    assert result["changed_sections"] == []
+    assert result["ai_regenerated"] is False
+    assert "section_updated_at.market_data" in result["updated_fields"]
+    assert not any(field.startswith("data.market_data") for field in result["updated_fields"])
+    assert reports.document["section_updated_at"]["market_data"] > datetime.utcnow() - timedelta(minutes=1)
+
+
+def test_force_refetches_every_section(reports, master):
+    result = refresh(reports, master, force=True)
+
+    assert sorted(section for section, _ in master.fetched) == sorted(result["stale_sections"])
+    assert len(master.fetched) == 4
+
+
+def test_ai_is_skipped_when_its_inputs_are_unchanged(reports, master):
+    # Competitors are not part of the figures the AI sections are generated from
+    master.replacements["market_data"] = lambda value: {**value, "top_competitors": []}
+
+    result = refresh(reports, master)
+
+    assert result["changed_sections"] == ["market_data"]
+    assert result["ai_regenerated"] is False
+    assert master.analyses == 0
+    assert reports.document["data"]["market_data"]["top_competitors"] == []
+    assert reports.document["data"]["ai_insights"] == "Old insights"
+
+
+def test_ai_is_regenerated_when_its_inputs_change(reports, master):
+    master.replacements["market_data"] = lambda value: {**value, "market_size_usd": value["market_size_usd"] * 2}
+
+    result = refresh(reports, master)
+
+    assert result["ai_regenerated"] is True
+    assert master.analyses == 1
+    assert reports.document["data"]["ai_insights"] == "New insights"
+
+
+def test_failed_section_keeps_old_data_and_stays_stale(reports, master):
+    stale_since = reports.document["section_updated_at"]["market_data"]
+    master.replacements["market_data"] = lambda value: {"molecule": "aspirin", "error": "feed down"}
+
+    result = refresh(reports, master)
+
+    assert result["changed_sections"] == []
+    assert result["updated_fields"] == []
+    assert reports.document["section_updated_at"]["market_data"] == stale_since
+    assert "error" not in reports.document["data"]["market_data"]
+
+
+def test_concurrent_update_is_a_conflict_not_an_overwrite(reports, master):
+    master.replacements["market_data"] = lambda value: {**value, "market_size_usd": 1.0}
+
+    def concurrent_writer():
+        reports.document["updated_at"] = datetime.utcnow()
+        reports.document["data"]["ai_insights"] = "Written by someone else"
+
+    reports.before_update = concurrent_writer
+
+    with pytest.raises(HTTPException) as error:
+        refresh(reports, master)
+
+    assert error.value.status_code == 409
+    assert reports.document["data"]["ai_insights"] == "Written by someone else"
+    assert reports.document["data"]["market_data"]["market_size_usd"] != 1.0
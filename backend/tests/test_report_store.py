@@ -0,0 +1,73 @@
+"""Tests for the bounded, indexed in-memory ReportStore."""
+
+import json
+
+from utils.report_store import ReportStore
+
+
+def test_lookup_is_case_and_whitespace_insensitive():
+    store = ReportStore()
+    report_id = store.put("Aspirin", {"molecule": "Aspirin"})
+
+    assert store.lookup("  aspirin ") == (report_id, {"molecule": "Aspirin"})
+    assert store.lookup("metformin") is None
+    assert store.stats()["hits"] == 1
+    assert store.stats()["misses"] == 1
+
+
+def test_storing_a_molecule_again_replaces_it():
+    store = ReportStore()
+    store.put("aspirin", {"version": 1})
+    store.put("ASPIRIN", {"version": 2})
+
+    assert len(store) == 1
+    assert store.lookup("aspirin")[1] == {"version": 2}
+    assert store.stats()["bytes"] == len(json.dumps({"version": 2}))
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    store = ReportStore(max_entries=2)
+    store.put("aspirin", {})
+    store.put("metformin", {})
+    store.lookup("aspirin")  # metformin is now least recently used
+    store.put("doxycycline", {})
+
+    assert store.lookup("metformin") is None
+    assert store.lookup("aspirin") is not None
+    assert store.lookup("doxycycline") is not None
+    assert store.stats()["evictions"] == 1
+
+
+def test_evicts_beyond_byte_budget_but_keeps_the_newest_entry():
+    payload = {"blob": "x" * 100}
+    size = len(json.dumps(payload))
+    store = ReportStore(max_bytes=size * 2)
+    store.put("a", payload)
+    store.put("b", payload)
+    store.put("c", payload)
+
+    assert len(store) == 2
+    assert store.lookup("a") is None
+    assert store.stats()["bytes"] <= store.max_bytes
+
+    oversized = ReportStore(max_bytes=10)
+    oversized.put("huge", payload)
+    assert oversized.lookup("huge") is not None
+
+
+def test_metadata_log_is_bounded_and_oldest_first():
+    store = ReportStore(max_metadata=2)
+    for report_id in ("r1", "r2", "r3"):
+        store.add_metadata(report_id, {"id": report_id})
+
+    assert [entry["id"] for entry in store.list_metadata()] == ["r2", "r3"]
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("REPORTS_STORE_MAX_ENTRIES", "7")
+    monkeypatch.setenv("REPORTS_STORE_MAX_BYTES", "1024")
+    monkeypatch.setenv("REPORTS_STORE_MAX_METADATA", "3")
+
+    stats = ReportStore.from_env().stats()
+
+    assert (stats["max_entries"], stats["max_bytes"], stats["max_metadata"]) == (7, 1024, 3)
@@ -0,0 +1,89 @@
+"""Tests for single-flight coalescing of concurrent identical calls."""
+
+import asyncio
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+def counting_work(result="done", delay=0.05):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+
+    return work, calls
+
+
+def test_concurrent_calls_for_a_key_share_one_execution():
+    flight = SingleFlight("test")
+    work, calls = counting_work()
+
+    async def main():
+        return await asyncio.gather(*(flight.run("aspirin", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["done"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0, "coalesced_ratio": 0.8}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    work, calls = counting_work()
+
+    async def main():
+        return await asyncio.gather(flight.run("aspirin", work), flight.run("metformin", work))
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_finished_flight_is_not_cached():
+    flight = SingleFlight()
+    work, calls = counting_work(delay=0)
+
+    async def main():
+        await flight.run("aspirin", work)
+        await flight.run("aspirin", work)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_exception_reaches_every_caller():
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("aspirin", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    work, calls = counting_work(delay=0.05)
+
+    async def main():
+        first = asyncio.ensure_future(flight.run("aspirin", work))
+        second = asyncio.ensure_future(flight.run("aspirin", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 1
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,113 @@
+"""Tests for the clinical trial search index against the condition scan it replaced."""
+
+import random
+
+import pytest
+
+from agents.clinical_agent import ClinicalAgent
+from utils.trial_index import TrialIndex, tokenize
+
+TRIALS = [trial for trials in ClinicalAgent.MOCK_TRIALS.values() for trial in trials]
+
+
+def scan(trials, therapeutic_area):
+    """The substring scan get_therapeutic_area_trials used before the index."""
+    return [trial for trial in trials if therapeutic_area.lower() in trial["condition"].lower()][:10]
+
+
+def ids(trials):
+    return [trial["trial_id"] for trial in trials]
+
+
+def by_start_date(trials):
+    return sorted(trials, key=lambda trial: trial["start_date"], reverse=True)
+
+
+@pytest.mark.parametrize("query", sorted({word for trial in TRIALS for word in tokenize(trial["condition"])}))
+def test_whole_condition_words_find_everything_the_scan_found(query):
+    found = TrialIndex(TRIALS).search(query)
+
+    assert set(ids(scan(TRIALS, query))) <= set(ids(found))
+    assert found == by_start_date(found)
+
+
+def test_random_trials_agree_with_scan_on_whole_words():
+    rng = random.Random(7)
+    words = ["cardio", "renal", "oncology", "diabetes", "hepatic", "disease", "failure", "type"]
+    trials = [
+        {
+            "trial_id": f"NCT{index:08d}",
+            "condition": " ".join(rng.sample(words, 2)),
+            "title": "",
+            "sponsor": "",
+            "start_date": f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-01",
+        }
+        for index in range(500)
+    ]
+    index = TrialIndex(trials)
+
+    for word in words:
+        expected = by_start_date([trial for trial in trials if word in trial["condition"].split()])
+        assert ids(index.search(word, limit=len(trials))) == ids(expected)
+
+
+def test_results_are_most_recent_first():
+    assert ids(TrialIndex(TRIALS).search("disease")) == ["NCT04345678", "NCT04123456"]
+    assert ids(TrialIndex(TRIALS).search("")) == ids(by_start_date(TRIALS))
+
+
+def test_documented_differences_from_the_scan():
+    index = TrialIndex(TRIALS)
+
+    # Matching is by token prefix, not substring: "vascular" is inside "Cardiovascular"
+    assert ids(scan(TRIALS, "vascular")) == ["NCT04123456"]
+    assert index.search("vascular") == []
+    # Title and sponsor are indexed too
+    assert ids(scan(TRIALS, "Mayo")) == []
+    assert ids(index.search("Mayo")) == ["NCT04123456"]
+
+
+def test_prefixes_and_multi_token_queries():
+    index = TrialIndex(TRIALS)
+
+    assert ids(index.search("cardio")) == ["NCT04123456"]
+    assert ids(index.search("type 2 diab")) == ["NCT04234567"]
+    assert ids(index.search("dis univ")) == ["NCT04345678"]
+    assert index.search("oncology cardio") == []
+
+
+def test_short_tokens_match_exactly():
+    index = TrialIndex(TRIALS)
+
+    assert index.search("c") == []
+    assert index.search("ca") == []
+    assert ids(index.search("2")) == ["NCT04234567"]
+
+
+def test_pagination():
+    index = TrialIndex(TRIALS)
+    everything = ids(index.search("", limit=100))
+
+    assert ids(index.search("", offset=1, limit=2)) == everything[1:3]
+    assert index.search("", offset=10) == []
+    assert index.search("disease", offset=1, limit=1) == [index.search("disease")[1]]
+    assert index.search("disease", offset=2) == []
+    assert index.search("disease", limit=0) == []
+
+
+def test_undated_trials_go_last_in_input_order():
+    trials = [
+        {"trial_id": "A", "condition": "Asthma"},
+        {"trial_id": "B", "condition": "Asthma", "start_date": "2020-01-01"},
+        {"trial_id": "C", "condition": "Asthma"},
+    ]
+
+    assert ids(TrialIndex(trials).search("asthma")) == ["B", "A", "C"]
+
+
+def test_agent_pages_through_area_trials():
+    agent = ClinicalAgent()
+
+    assert ids(agent.get_therapeutic_area_trials("Disease")) == ["NCT04345678", "NCT04123456"]
+    assert ids(agent.get_therapeutic_area_trials("disease", page=2, page_size=1)) == ["NCT04123456"]
+    assert agent.get_therapeutic_area_trials("disease", page=3, page_size=1) == []
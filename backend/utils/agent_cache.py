@@ -0,0 +1,195 @@
+"""
+Agent Result Cache
+Per-source cache of data-agent results (market, clinical, patent, publications),
+each source with its own TTL matching how often its upstream data changes.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+from .molecules import normalize_molecule_name
+
+# Load environment variables
+load_dotenv()
+
+# Source (aggregated-data section) -> (TTL env var, default seconds)
+SOURCE_TTL_CONFIG = {
+    "market_data": ("AGENT_CACHE_TTL_MARKET", 7 * 24 * 3600),  # weekly IQVIA refresh
+    "clinical_data": ("AGENT_CACHE_TTL_CLINICAL", 24 * 3600),  # trial registries update daily
+    "patent_data": ("AGENT_CACHE_TTL_PATENT", 30 * 24 * 3600),  # patent filings move monthly
+    "web_data": ("AGENT_CACHE_TTL_WEB", 24 * 3600),  # publications update daily
+}
+
+
+class AgentCache:
+    """
+    Thread-safe LRU cache of agent results with a TTL per source.
+
+    Entries are keyed by (source, normalized molecule name, extra call
+    arguments) and remember when they were stored, so callers can report
+    whether a section was served from cache and how old it is. Per-source
+    counters make hit ratios visible for tuning the TTLs.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 2048):
+        """
+        Initialize the cache.
+
+        Args:
+            ttls (Dict[str, float]): Source -> time-to-live in seconds (0 disables caching for it).
+            max_entries (int): Maximum entries across all sources before LRU eviction.
+        """
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # (source, molecule, args) -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._counters = {source: {"hits": 0, "misses": 0} for source in self.ttls}
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _key(source: str, molecule_name: str, args: Tuple) -> Tuple:
+        return source, normalize_molecule_name(molecule_name), args
+
+    def get(self, source: str, molecule_name: str, args: Tuple = ()) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a cached agent result.
+
+        Args:
+            source (str): Source name (e.g. "clinical_data").
+            molecule_name (str): Molecule name (case/whitespace-insensitive).
+            args (Tuple): Extra call arguments that change the result.
+
+        Returns:
+            Tuple[Any, float] or None: (result, stored_at epoch seconds), or None on a miss.
+        """
+        key = self._key(source, molecule_name, args)
+        now = time.time()
+        with self._lock:
+            counters = self._counters.setdefault(source, {"hits": 0, "misses": 0})
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttls.get(source, 0):
+                    self._entries.move_to_end(key)
+                    counters["hits"] += 1
+                    return value, stored_at
+                del self._entries[key]
+            counters["misses"] += 1
+            return None
+
+    def put(self, source: str, molecule_name: str, value: Any, args: Tuple = ()) -> float:
+        """
+        Store an agent result.
+
+        Args:
+            source (str): Source name.
+            molecule_name (str): Molecule name.
+            value (Any): Agent result; treat it as read-only once cached.
+            args (Tuple): Extra call arguments that change the result.
+
+        Returns:
+            float: Time the result was stored (epoch seconds).
+        """
+        now = time.time()
+        if self.ttls.get(source, 0) <= 0:
+            return now
+        key = self._key(source, molecule_name, args)
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return now
+
+    def invalidate(self, source: Optional[str] = None, molecule_name: Optional[str] = None) -> int:
+        """
+        Drop cached results for a source, a molecule, both, or everything.
+
+        Args:
+            source (str, optional): Only this source. None matches every source.
+            molecule_name (str, optional): Only this molecule. None matches every molecule.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        molecule = normalize_molecule_name(molecule_name) if molecule_name is not None else None
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if (source is None or key[0] == source) and (molecule is None or key[1] == molecule)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self._invalidations += len(doomed)
+            return len(doomed)
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict: Entry count, evictions, invalidations and per-source TTL/hits/misses/entries.
+        """
+        with self._lock:
+            sources = {}
+            for source, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                sources[source] = {
+                    "ttl_seconds": self.ttls.get(source, 0),
+                    "entries": sum(1 for key in self._entries if key[0] == source),
+                    **counters,
+                    "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+                }
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "sources": sources,
+            }
+
+
+def source_ttls() -> Dict[str, float]:
+    """
+    Get the configured TTL of every source from the AGENT_CACHE_TTL_* env vars.
+
+    Returns:
+        Dict[str, float]: Source -> TTL in seconds.
+    """
+    return {
+        source: float(os.getenv(env_var, str(default)))
+        for source, (env_var, default) in SOURCE_TTL_CONFIG.items()
+    }
+
+
+_agent_cache = None
+_agent_cache_lock = threading.Lock()
+
+
+def get_agent_cache() -> Optional[AgentCache]:
+    """
+    Get the process-wide agent cache configured from the environment.
+
+    Reads AGENT_CACHE_ENABLED (default true), AGENT_CACHE_MAX_ENTRIES (2048) and
+    the AGENT_CACHE_TTL_* seconds per source (see SOURCE_TTL_CONFIG).
+
+    Returns:
+        AgentCache or None: Shared cache, or None when caching is disabled.
+    """
+    global _agent_cache
+    if os.getenv("AGENT_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _agent_cache_lock:
+        if _agent_cache is None:
+            _agent_cache = AgentCache(
+                ttls=source_ttls(),
+                max_entries=int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "2048")),
+            )
+        return _agent_cache
@@ -0,0 +1,175 @@
+"""
+Blocking-Work Executors
+Dedicated, bounded thread pools that keep synchronous work (Groq SDK and agent
+calls, pymongo, ReportLab, bcrypt) off the asyncio event loop.
+"""
+
+import os
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+LLM_POOL = "llm"
+DB_POOL = "db"
+CPU_POOL = "cpu"
+AUTH_POOL = "auth"
+
+# Pool name -> (env var, default size)
+POOL_CONFIG = {
+    LLM_POOL: ("EXECUTOR_LLM_WORKERS", 32),
+    DB_POOL: ("EXECUTOR_DB_WORKERS", 16),
+    CPU_POOL: ("EXECUTOR_CPU_WORKERS", os.cpu_count() or 4),
+    # bcrypt releases the GIL, so hashing scales with cores; kept apart from CPU_POOL
+    # so a login burst cannot starve PDF rendering (and vice versa)
+    AUTH_POOL: ("EXECUTOR_AUTH_WORKERS", os.cpu_count() or 4),
+}
+
+
+class BoundedExecutor:
+    """
+    Named thread pool that tracks how much work is running and waiting.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize the pool.
+
+        Args:
+            name (str): Pool name, used for thread names and stats.
+            max_workers (int): Maximum concurrent threads.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._active = 0
+        self._completed = 0
+        self._cancelled = 0
+
+    def _run(self, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in this pool and await its result.
+
+        The caller's context variables are carried into the worker thread.
+
+        Args:
+            func (Callable): Blocking function.
+            *args, **kwargs: Arguments for ``func``.
+
+        Returns:
+            Any: ``func``'s return value (its exception is re-raised).
+        """
+        with self._lock:
+            self._submitted += 1
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._run, func, *args, **kwargs)
+        future.add_done_callback(self._count_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _count_cancelled(self, future):
+        # Cancelled before starting (shutdown, or the awaiting task was cancelled): never runs _run
+        if future.cancelled():
+            with self._lock:
+                self._cancelled += 1
+
+    def stats(self) -> Dict:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict: Size, running, queued, completed and cancelled task counts.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._submitted - self._completed - self._active - self._cancelled,
+                "completed": self._completed,
+                "cancelled": self._cancelled,
+            }
+
+    def shutdown(self):
+        """Stop accepting work; running tasks finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(pool: str) -> BoundedExecutor:
+    """
+    Get (creating on first use) the named pool, sized from its EXECUTOR_*_WORKERS env var.
+
+    Args:
+        pool (str): One of LLM_POOL, DB_POOL, CPU_POOL, AUTH_POOL.
+
+    Returns:
+        BoundedExecutor: The shared pool.
+    """
+    with _executors_lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            env_var, default = POOL_CONFIG[pool]
+            executor = BoundedExecutor(pool, int(os.getenv(env_var, str(default))))
+            _executors[pool] = executor
+        return executor
+
+
+async def run_blocking(pool: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking work in one of the dedicated pools.
+
+    Args:
+        pool (str): LLM_POOL for Groq/agent calls, DB_POOL for pymongo,
+            CPU_POOL for rendering, AUTH_POOL for password hashing.
+        func (Callable): Blocking function.
+        *args, **kwargs: Arguments for ``func``.
+
+    Returns:
+        Any: ``func``'s return value.
+    """
+    return await get_executor(pool).run(func, *args, **kwargs)
+
+
+def executor_stats() -> Dict:
+    """
+    Get statistics for every pool.
+
+    Returns:
+        Dict: Pool name -> stats (pools not yet used report their configured size only).
+    """
+    stats = {}
+    for pool, (env_var, default) in POOL_CONFIG.items():
+        executor = _executors.get(pool)
+        if executor is not None:
+            stats[pool] = executor.stats()
+        else:
+            stats[pool] = {"max_workers": int(os.getenv(env_var, str(default))), "active": 0,
+                           "queued": 0, "completed": 0, "cancelled": 0}
+    return stats
+
+
+def shutdown_executors():
+    """Shut down every pool (call on application shutdown)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
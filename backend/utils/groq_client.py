@@ -4,36 +4,102 @@ Handles all interactions with Groq LLM API for generating AI-powered insights.
 """
 
 import os
-from typing import Optional
+import re
+import time
+import asyncio
+import weakref
+from typing import AsyncIterator, Callable, List, Optional
 from dotenv import load_dotenv
-from groq import Groq
+
+from .llm_cache import LLMCache, get_default_cache
+from .llm_providers import GroqProvider, LLMProvider, create_provider
+from .metrics import LLM_DURATION, LLM_IN_FLIGHT, LLM_REQUESTS, record_llm_usage
+from .tracing import span
 
 # Load environment variables
 load_dotenv()
 
+# Cap on concurrent in-flight LLM requests per event loop
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "64"))
+
 
 class GroqClient:
     """
     Wrapper class for Groq API interactions.
     Provides methods to query the Groq LLM for analysis and summarization.
+
+    Completions come from an ``LLMProvider``: the Groq API by default, or a
+    record/replay cassette or local synthetic generator selected by
+    LLM_PROVIDER (see ``utils.llm_providers``).
+
+    Every blocking method has an ``a``-prefixed coroutine twin (``aquery``,
+    ``asummarize``, ``agenerate_insights``) for use from ``async def`` handlers.
+    The async variants are throttled by a per-loop semaphore of
+    ``max_concurrency`` in-flight requests.
+
+    Successful responses are memoized in an ``LLMCache`` keyed on
+    (model, system_message, prompt, temperature, max_tokens); error strings
+    are never cached. Pass ``use_cache=False`` to bypass it for one call.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "llama-3.1-8b-instant"):
+    SUMMARY_SYSTEM_MESSAGE = "You are a concise summarization assistant. Keep summaries brief and focused."
+    INSIGHTS_SYSTEM_MESSAGE = "You are a pharmaceutical intelligence analyst. Provide actionable, strategic insights."
+
+    # event loop -> asyncio.Semaphore capping in-flight async requests.
+    _async_semaphores = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "llama-3.1-8b-instant",
+        max_concurrency: int = GROQ_MAX_CONCURRENCY,
+        cache: Optional[LLMCache] = None,
+        provider: Optional[LLMProvider] = None,
+    ):
         """
         Initialize Groq client.
 
         Args:
             api_key (str, optional): Groq API key. If None, reads from GROQ_API_KEY env var.
+                Only needed by the "groq" and "record" providers.
             model (str): Model to use. Default is llama-3.1-8b-instant.
+            max_concurrency (int): Cap on in-flight async requests per event loop.
+                Default reads GROQ_MAX_CONCURRENCY (64).
+            cache (LLMCache, optional): Response cache. If None, uses the shared
+                cache configured by the GROQ_CACHE_* env vars (may be disabled).
+            provider (LLMProvider, optional): Completion backend. If None, uses the
+                one selected by LLM_PROVIDER (default: groq).
+
+        Raises:
+            ValueError: The selected provider needs a Groq API key and none is set.
         """
-        self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError(
-                "GROQ_API_KEY not found. Please set it in .env or pass it to __init__"
-            )
+        self.provider = provider if provider is not None else create_provider(api_key=api_key)
+        self.api_key = getattr(self.provider, "api_key", None)
 
         self.model = model
-        self.client = Groq(api_key=self.api_key)
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else get_default_cache()
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Return the in-flight request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    @classmethod
+    async def aclose_shared(cls):
+        """Close the pooled async clients of the running event loop (call on shutdown)."""
+        await GroqProvider.aclose_shared()
+
+    @staticmethod
+    def _messages(prompt: str, system_message: str) -> List[dict]:
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ]
 
     def query(
         self,
@@ -41,6 +107,9 @@ class GroqClient:
         system_message: str = "You are a pharmaceutical research AI assistant. Provide accurate, evidence-based insights.",
         temperature: float = 0.7,
         max_tokens: int = 1024,
+        use_cache: bool = True,
+        caller: str = "query",
+        validate: Optional[Callable[[str], bool]] = None,
     ) -> str:
         """
         Query Groq API with a prompt and return the response.
@@ -50,23 +119,189 @@ class GroqClient:
             system_message (str): System context for the AI.
             temperature (float): Sampling temperature (0-1). Higher = more creative.
             max_tokens (int): Maximum tokens in response.
+            use_cache (bool): Serve from / store into the response cache.
+            caller (str): Metrics label naming the feature making the call.
+            validate (Callable[[str], bool], optional): Only responses it accepts are
+                cached or served from the cache; a rejected response is still returned.
 
         Returns:
             str: The AI-generated response.
         """
+        cache_key = self._cache_key(prompt, system_message, temperature, max_tokens, use_cache)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None and (validate is None or validate(cached)):
+                LLM_REQUESTS.inc(caller=caller, provider=self.provider.name, outcome="cache_hit")
+                return cached
+
+        usage = {}
+        started = time.perf_counter()
+        try:
+            with span(f"llm_{caller}"), LLM_IN_FLIGHT.track_inprogress():
+                content = self.provider.complete(
+                    self.model, self._messages(prompt, system_message), temperature, max_tokens, usage
+                )
+        except Exception as e:
+            self._record_call(caller, started)
+            return f"Error querying Groq API: {str(e)}"
+        self._record_call(caller, started, usage, system_message + prompt, content)
+
+        if cache_key is not None and content and (validate is None or validate(content)):
+            self.cache.set(cache_key, content)
+        return content
+
+    async def aquery(
+        self,
+        prompt: str,
+        system_message: str = "You are a pharmaceutical research AI assistant. Provide accurate, evidence-based insights.",
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        use_cache: bool = True,
+        caller: str = "query",
+    ) -> str:
+        """
+        Async variant of ``query`` on the shared, pooled async client.
+
+        Waits for a free slot when ``max_concurrency`` requests are already in flight.
+
+        Args:
+            prompt (str): The user prompt/question.
+            system_message (str): System context for the AI.
+            temperature (float): Sampling temperature (0-1). Higher = more creative.
+            max_tokens (int): Maximum tokens in response.
+            use_cache (bool): Serve from / store into the response cache.
+            caller (str): Metrics label naming the feature making the call.
+
+        Returns:
+            str: The AI-generated response.
+        """
+        cache_key = self._cache_key(prompt, system_message, temperature, max_tokens, use_cache)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                LLM_REQUESTS.inc(caller=caller, provider=self.provider.name, outcome="cache_hit")
+                return cached
+
+        usage = {}
+        started = time.perf_counter()
         try:
-            message = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return message.choices[0].message.content
+            async with self._async_semaphore():
+                started = time.perf_counter()
+                with span(f"llm_{caller}"), LLM_IN_FLIGHT.track_inprogress():
+                    content = await self.provider.acomplete(
+                        self.model, self._messages(prompt, system_message), temperature, max_tokens, usage
+                    )
         except Exception as e:
+            self._record_call(caller, started)
             return f"Error querying Groq API: {str(e)}"
+        self._record_call(caller, started, usage, system_message + prompt, content)
+
+        if cache_key is not None and content:
+            self.cache.set(cache_key, content)
+        return content
+
+    async def astream_query(
+        self,
+        prompt: str,
+        system_message: str = "You are a pharmaceutical research AI assistant. Provide accurate, evidence-based insights.",
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        use_cache: bool = True,
+        caller: str = "query",
+        clean_markdown: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a Groq completion token by token.
+
+        Shares the response cache with ``query``/``aquery``: a cached response is
+        replayed as a single chunk, and a completed stream is stored for later calls.
+
+        Args:
+            prompt (str): The user prompt/question.
+            system_message (str): System context for the AI.
+            temperature (float): Sampling temperature (0-1). Higher = more creative.
+            max_tokens (int): Maximum tokens in response.
+            use_cache (bool): Serve from / store into the response cache.
+            caller (str): Metrics label naming the feature making the call.
+            clean_markdown (bool): Strip markdown incrementally as chunks arrive.
+
+        Yields:
+            str: Response text deltas.
+        """
+        cleaner = MarkdownStreamCleaner() if clean_markdown else None
+
+        cache_key = self._cache_key(prompt, system_message, temperature, max_tokens, use_cache)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                LLM_REQUESTS.inc(caller=caller, provider=self.provider.name, outcome="cache_hit")
+                text = cleaner.feed(cached) + cleaner.flush() if cleaner else cached
+                if text:
+                    yield text
+                return
+
+        parts = []
+        usage = {}
+        started = time.perf_counter()
+        try:
+            async with self._async_semaphore():
+                started = time.perf_counter()
+                with span(f"llm_{caller}"), LLM_IN_FLIGHT.track_inprogress():
+                    async for delta in self.provider.astream(
+                        self.model, self._messages(prompt, system_message), temperature, max_tokens, usage
+                    ):
+                        parts.append(delta)
+                        text = cleaner.feed(delta) if cleaner else delta
+                        if text:
+                            yield text
+        except Exception as e:
+            self._record_call(caller, started)
+            yield f"Error querying Groq API: {str(e)}"
+            return
+        self._record_call(caller, started, usage, system_message + prompt, "".join(parts))
+
+        if cleaner:
+            tail = cleaner.flush()
+            if tail:
+                yield tail
+        if cache_key is not None and parts:
+            self.cache.set(cache_key, "".join(parts))
+
+    def _record_call(self, caller: str, started: float, usage: Optional[dict] = None,
+                     prompt_text: str = "", completion: Optional[str] = None):
+        """Record latency and outcome of a provider call; token counts only for successful ones."""
+        LLM_DURATION.observe(time.perf_counter() - started, caller=caller, provider=self.provider.name)
+        outcome = "error" if usage is None else "ok"
+        LLM_REQUESTS.inc(caller=caller, provider=self.provider.name, outcome=outcome)
+        if usage is not None:
+            record_llm_usage(caller, usage, prompt_text, completion)
+
+    def _cache_key(
+        self,
+        prompt: str,
+        system_message: str,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool,
+    ) -> Optional[str]:
+        """Return the response-cache key for a call, or None when caching does not apply."""
+        if not use_cache or self.cache is None:
+            return None
+        # Keep synthetic responses out of the cache entries real responses use
+        namespace = self.provider.cache_namespace
+        model = f"{namespace}/{self.model}" if namespace else self.model
+        return self.cache.make_key(model, system_message, prompt, temperature, max_tokens)
+
+    def cache_stats(self) -> dict:
+        """
+        Get response-cache hit/miss counters.
+
+        Returns:
+            dict: Cache statistics, or {"enabled": False} when caching is off.
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
 
     def summarize(self, content: str, max_tokens: int = 512) -> str:
         """
@@ -82,8 +317,28 @@ class GroqClient:
         prompt = f"Please provide a concise summary of the following content:\n\n{content}"
         return self.query(
             prompt,
-            system_message="You are a concise summarization assistant. Keep summaries brief and focused.",
+            system_message=self.SUMMARY_SYSTEM_MESSAGE,
+            max_tokens=max_tokens,
+            caller="summary",
+        )
+
+    async def asummarize(self, content: str, max_tokens: int = 512) -> str:
+        """
+        Async variant of ``summarize``.
+
+        Args:
+            content (str): Content to summarize.
+            max_tokens (int): Maximum tokens in summary.
+
+        Returns:
+            str: Summarized content.
+        """
+        prompt = f"Please provide a concise summary of the following content:\n\n{content}"
+        return await self.aquery(
+            prompt,
+            system_message=self.SUMMARY_SYSTEM_MESSAGE,
             max_tokens=max_tokens,
+            caller="summary",
         )
 
     def analyze_drug_potential(self, molecule_name: str, indication: str) -> str:
@@ -113,6 +368,7 @@ class GroqClient:
             prompt,
             system_message="You are a pharmaceutical research expert specializing in drug repurposing. Provide detailed, evidence-based analysis.",
             max_tokens=1024,
+            caller="drug_potential",
         )
 
     def generate_insights(self, data_dict: dict) -> str:
@@ -125,7 +381,53 @@ class GroqClient:
         Returns:
             str: AI-generated insights and recommendations.
         """
-        prompt = f"""
+        response = self.query(
+            self._insights_prompt(data_dict),
+            system_message=self.INSIGHTS_SYSTEM_MESSAGE,
+            max_tokens=1024,
+            caller="insights",
+        )
+        return self._clean_markdown(response)
+
+    async def agenerate_insights(self, data_dict: dict) -> str:
+        """
+        Async variant of ``generate_insights``.
+
+        Args:
+            data_dict (dict): Dictionary containing market, trial, patent, and web intelligence data.
+
+        Returns:
+            str: AI-generated insights and recommendations.
+        """
+        response = await self.aquery(
+            self._insights_prompt(data_dict),
+            system_message=self.INSIGHTS_SYSTEM_MESSAGE,
+            max_tokens=1024,
+            caller="insights",
+        )
+        return self._clean_markdown(response)
+
+    def astream_insights(self, data_dict: dict) -> AsyncIterator[str]:
+        """
+        Streaming variant of ``generate_insights`` with incremental markdown stripping.
+
+        Args:
+            data_dict (dict): Dictionary containing market, trial, patent, and web intelligence data.
+
+        Returns:
+            AsyncIterator[str]: Cleaned insight text deltas.
+        """
+        return self.astream_query(
+            self._insights_prompt(data_dict),
+            system_message=self.INSIGHTS_SYSTEM_MESSAGE,
+            max_tokens=1024,
+            caller="insights",
+            clean_markdown=True,
+        )
+
+    def _insights_prompt(self, data_dict: dict) -> str:
+        """Build the insights prompt shared by ``generate_insights`` and its async twin."""
+        return f"""
         Based on the following pharmaceutical research data, generate key insights and recommendations:
         
         {str(data_dict)}
@@ -137,12 +439,6 @@ class GroqClient:
         4. Clinical viability
         5. Recommended next steps
         """
-        response = self.query(
-            prompt,
-            system_message="You are a pharmaceutical intelligence analyst. Provide actionable, strategic insights.",
-            max_tokens=1024,
-        )
-        return self._clean_markdown(response)
 
     def _clean_markdown(self, text: str) -> str:
         """
@@ -173,3 +469,149 @@ class GroqClient:
         # Clean extra whitespace
         text = re.sub(r'\n{3,}', '\n\n', text)
         return text.strip()
+
+
+class MarkdownStreamCleaner:
+    """
+    Incremental counterpart of ``GroqClient._clean_markdown`` for streamed text.
+
+    Markdown rules are mostly line-local, so complete lines are cleaned with the
+    same substitutions as the batch version. To keep latency low, the start of an
+    unfinished line is released early once it is known to contain no markdown
+    syntax. Whitespace is held back until more text follows it, so fenced code
+    blocks, collapsed blank lines and the final trim match the batch cleaner.
+    Blank lines right before a list item are dropped, as the batch list rule's
+    leading whitespace pattern swallows them. Not reproduced: code fences that do not
+    start a line, and a header or list marker with no text after it, which the
+    batch rules join to the following line.
+    """
+
+    _MARKDOWN_CHARS = ("*", "_", "`", "[")
+    _LINE_START_CHARS = ("#", "-", "*", "+", "`")
+
+    def __init__(self):
+        self._buffer = ""
+        self._line_started = False
+        self._in_code_block = False
+        self._pending_whitespace = ""
+        self._blank_lines = ""  # whitespace-only lines since the last line with text
+        self._emitted_any = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of raw model output.
+
+        Args:
+            chunk (str): Raw text delta.
+
+        Returns:
+            str: Cleaned text that is safe to emit now (may be empty).
+        """
+        self._buffer += chunk
+        output = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            output.append(self._finish_line(line, "\n"))
+        output.append(self._release_partial_line())
+        return "".join(output)
+
+    def flush(self) -> str:
+        """
+        Finish the stream and return whatever is still buffered, cleaned.
+
+        Returns:
+            str: Remaining cleaned text (trailing whitespace is dropped).
+        """
+        line, self._buffer = self._buffer, ""
+        return self._finish_line(line, "")
+
+    def _finish_line(self, line: str, newline: str) -> str:
+        """Clean a complete line; its newline is held back as pending whitespace."""
+        if line.strip().startswith("```"):
+            self._in_code_block = not self._in_code_block
+            self._line_started = False
+            self._blank_lines = ""
+            if self._in_code_block:
+                return ""
+            # Text after the closing fence and its newline survive block removal
+            rest = _clean_emphasis(line).lstrip()[len("```"):]
+            return self._emit(_clean_code_and_links(rest) + newline)
+        if self._in_code_block:
+            return ""
+
+        if self._line_started:
+            text = self._emit(_clean_inline_markdown(line) + newline)
+        elif not line.strip():
+            self._blank_lines += line + newline
+            text = self._emit(line + newline)
+        else:
+            if self._blank_lines and _starts_list_item(line):
+                # Still pending: nothing but whitespace was emitted since the last text
+                kept = len(self._pending_whitespace) - len(self._blank_lines)
+                self._pending_whitespace = self._pending_whitespace[:max(kept, 0)]
+            self._blank_lines = ""
+            text = self._emit(_clean_markdown_line(line) + newline)
+        self._line_started = False
+        return text
+
+    def _release_partial_line(self) -> str:
+        """Emit the head of the unfinished line when no markdown rule can still touch it."""
+        if self._in_code_block or any(c in self._buffer for c in self._MARKDOWN_CHARS):
+            return ""
+        if not self._line_started:
+            head = self._buffer.lstrip()
+            # Wait until we know the line is not a header, list item or code fence
+            if len(head) < 2 or head.startswith(self._LINE_START_CHARS):
+                return ""
+        cut = self._buffer.rfind(" ")
+        if cut <= 0:
+            return ""
+        segment, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        self._line_started = True
+        self._blank_lines = ""
+        return self._emit(segment)
+
+    def _emit(self, text: str) -> str:
+        """Release text up to its last non-whitespace character, collapsing blank-line runs."""
+        text = self._pending_whitespace + text
+        content = text.rstrip()
+        self._pending_whitespace = text[len(content):]
+        if not content:
+            return ""
+        if not self._emitted_any:
+            content = content.lstrip()
+            self._emitted_any = True
+        return re.sub(r'\n{3,}', '\n\n', content)
+
+
+def _clean_emphasis(text: str) -> str:
+    """Apply the emphasis rules of ``GroqClient._clean_markdown`` (they run before the line rules)."""
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.+?)\*', r'\1', text)
+    text = re.sub(r'_{1,2}(.+?)_{1,2}', r'\1', text)
+    return text
+
+
+def _clean_code_and_links(text: str) -> str:
+    """Apply the inline code and link rules of ``GroqClient._clean_markdown`` (they run after the line rules)."""
+    text = re.sub(r'`(.+?)`', r'\1', text)
+    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
+    return text
+
+
+def _clean_inline_markdown(text: str) -> str:
+    """Apply the inline (not line-anchored) rules of ``GroqClient._clean_markdown``."""
+    return _clean_code_and_links(_clean_emphasis(text))
+
+
+def _starts_list_item(line: str) -> bool:
+    """Whether ``_clean_markdown_line`` strips a list marker from this line."""
+    return re.match(r'^\s*[-*+]\s+', re.sub(r'^#+\s+', '', _clean_emphasis(line))) is not None
+
+
+def _clean_markdown_line(line: str) -> str:
+    """Apply every ``GroqClient._clean_markdown`` rule to a single complete line, in the same order."""
+    line = _clean_emphasis(line)
+    line = re.sub(r'^#+\s+', '', line)
+    line = re.sub(r'^\s*[-*+]\s+', '', line)
+    return _clean_code_and_links(line)
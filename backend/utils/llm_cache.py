@@ -0,0 +1,231 @@
+"""
+LLM Response Cache
+Two-tier cache for Groq completions: an in-memory LRU with TTL in front of an
+optional SQLite file that survives process restarts.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class LLMCache:
+    """
+    Thread-safe LRU + TTL cache for LLM responses.
+
+    Keys are derived from every parameter that influences the completion
+    (model, system message, prompt, temperature, max tokens). When ``db_path``
+    is set, entries are also written to a SQLite table and memory misses fall
+    through to it, so warm responses survive a worker restart. Each write prunes
+    expired rows and the oldest rows beyond ``max_disk_entries``, so the file
+    stays bounded.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        db_path: Optional[str] = None,
+        max_disk_entries: int = 10000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of in-memory entries before LRU eviction.
+            ttl_seconds (float): Time-to-live for an entry, in both tiers.
+            db_path (str, optional): SQLite file for the persistent tier. None disables it.
+            max_disk_entries (int): Maximum rows kept in the SQLite tier (oldest are pruned first).
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+
+        self._entries = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._disk_hits = 0
+        self._evictions = 0
+        self._disk_evictions = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_message: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """
+        Build a cache key from the completion parameters.
+
+        Returns:
+            str: SHA-256 hex digest of the canonical parameter tuple.
+        """
+        payload = json.dumps(
+            [model, system_message, prompt, temperature, max_tokens],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Key from ``make_key``.
+
+        Returns:
+            str or None: Cached response, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if now - created_at < self.ttl_seconds:
+                        self._store_in_memory(key, created_at, value)
+                        self._hits += 1
+                        self._disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key (str): Key from ``make_key``.
+            value (str): Response text to cache.
+        """
+        now = time.time()
+        with self._lock:
+            self._store_in_memory(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now),
+                )
+                self._prune_disk(now)
+                self._db.commit()
+
+    def _prune_disk(self, now: float):
+        """Delete expired rows, then the oldest rows beyond max_disk_entries. Caller holds the lock."""
+        expired = self._db.execute(
+            "DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+        (rows,) = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = 0
+        if rows > self.max_disk_entries:
+            overflow = self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY created_at LIMIT ?)",
+                (rows - self.max_disk_entries,),
+            ).rowcount
+        self._disk_evictions += expired + overflow
+
+    def _store_in_memory(self, key: str, created_at: float, value: str):
+        """Insert into the LRU, evicting the least recently used entries. Caller holds the lock."""
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Drop every entry from both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+            self._hits = self._misses = self._disk_hits = self._evictions = self._disk_evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hits, misses, disk hits, evictions (memory and disk), entry count and hit ratio.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "disk_hits": self._disk_hits,
+                "evictions": self._evictions,
+                "disk_evictions": self._disk_evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_disk_entries": self.max_disk_entries if self._db is not None else 0,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self._db is not None,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[LLMCache]:
+    """
+    Get the process-wide LLM cache configured from the environment.
+
+    Reads GROQ_CACHE_ENABLED (default true), GROQ_CACHE_MAX_ENTRIES (1024),
+    GROQ_CACHE_TTL seconds (3600), GROQ_CACHE_PATH (unset = memory only) and
+    GROQ_CACHE_MAX_DISK_ENTRIES (10000 rows in the SQLite file).
+
+    Returns:
+        LLMCache or None: Shared cache, or None when caching is disabled.
+    """
+    global _default_cache
+    if os.getenv("GROQ_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                max_entries=int(os.getenv("GROQ_CACHE_MAX_ENTRIES", "1024")),
+                ttl_seconds=float(os.getenv("GROQ_CACHE_TTL", "3600")),
+                db_path=os.getenv("GROQ_CACHE_PATH") or None,
+                max_disk_entries=int(os.getenv("GROQ_CACHE_MAX_DISK_ENTRIES", "10000")),
+            )
+        return _default_cache
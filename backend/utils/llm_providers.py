@@ -0,0 +1,474 @@
+"""
+LLM Providers
+Backends that turn a chat request into completion text for ``GroqClient``: the
+real Groq API, a record/replay cassette, and a local synthetic generator.
+Select one with the LLM_PROVIDER env var (groq, record, replay, synthetic).
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    # The Groq SDK (and httpx under it) is imported on first request, not at startup
+    from groq import AsyncGroq, Groq
+
+# Load environment variables
+load_dotenv()
+
+# Async transport tuning: size of the shared keep-alive connection pool per event loop.
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+GROQ_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "20"))
+GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30"))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))
+
+LLM_PROVIDERS = ("groq", "record", "replay", "synthetic")
+DEFAULT_CASSETTE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "llm_cassette.jsonl")
+
+SAMPLE_SENTENCES = [
+    "The molecule shows a favorable market trajectory with steady double-digit growth.",
+    "Ongoing trials indicate meaningful clinical activity across several indications.",
+    "Patent expiry within the next five years opens a window for repurposing strategies.",
+    "Publication momentum suggests rising scientific interest in adjacent mechanisms.",
+    "Key risks include competitive crowding and uncertain reimbursement dynamics.",
+    "Prioritize a phase II study in the indication with the strongest mechanistic rationale.",
+]
+
+
+class LLMProviderError(Exception):
+    """Raised by a provider when a completion cannot be produced."""
+
+
+class MissingAPIKeyError(ValueError):
+    """Raised when the selected provider needs a Groq API key and none is configured."""
+
+
+def synthetic_completion(system_message: str, max_tokens: int, prompt: str = "") -> str:
+    """
+    Build a plausible completion; JSON when the system message asks for JSON.
+
+    The same inputs always produce the same text.
+
+    Args:
+        system_message (str): System prompt of the request.
+        max_tokens (int): Requested token budget (roughly bounds the length).
+        prompt (str): User prompt; selects where the sample text starts.
+
+    Returns:
+        str: Completion text.
+    """
+    count = max(2, min(len(SAMPLE_SENTENCES), max_tokens // 60))
+    offset = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % len(SAMPLE_SENTENCES)
+    sentences = [SAMPLE_SENTENCES[(offset + i) % len(SAMPLE_SENTENCES)] for i in range(count)]
+    text = " ".join(sentences)
+    if "JSON" in system_message:
+        return json.dumps({
+            "insights": text,
+            "recommendations": "1. " + SAMPLE_SENTENCES[-1] + "\n2. " + SAMPLE_SENTENCES[2],
+        })
+    return text
+
+
+def _word_chunks(text: str) -> List[str]:
+    """Split text into word-sized stream deltas that concatenate back to ``text``."""
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+class LLMProvider(ABC):
+    """
+    Interface of a chat-completion backend.
+
+    ``messages`` are OpenAI-style ``{"role", "content"}`` dicts. Failures raise
+    (any exception); ``GroqClient`` turns them into its error string.
+    """
+
+    name = "base"
+    # Response-cache namespace; None shares the cache with real Groq responses
+    cache_namespace: Optional[str] = None
+
+    @abstractmethod
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 usage: Optional[Dict] = None) -> str:
+        """
+        Produce a completion.
+
+        Args:
+            model (str): Model name.
+            messages (List[Dict]): Chat messages.
+            temperature (float): Sampling temperature.
+            max_tokens (int): Maximum tokens in response.
+            usage (Dict, optional): Filled with "prompt_tokens"/"completion_tokens"
+                when the backend reports them.
+
+        Returns:
+            str: Completion text.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acomplete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                        usage: Optional[Dict] = None) -> str:
+        """Async variant of ``complete``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def astream(
+        self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+        usage: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion as text deltas."""
+        raise NotImplementedError
+
+
+class GroqProvider(LLMProvider):
+    """
+    Groq API backend.
+
+    The async calls share one pooled, keep-alive ``AsyncGroq`` client per event
+    loop and API key.
+    """
+
+    name = "groq"
+
+    # event loop -> {api_key: AsyncGroq}; entries go away with their loop.
+    _async_clients = weakref.WeakKeyDictionary()
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the Groq backend.
+
+        Args:
+            api_key (str, optional): Groq API key. If None, reads from GROQ_API_KEY env var.
+        """
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise MissingAPIKeyError(
+                "GROQ_API_KEY not found. Please set it in .env or pass it to __init__"
+            )
+        self._client = None
+
+    @property
+    def client(self) -> "Groq":
+        """Blocking Groq SDK client, created on first use."""
+        if self._client is None:
+            from groq import Groq
+
+            self._client = Groq(api_key=self.api_key)
+        return self._client
+
+    @property
+    def async_client(self) -> "AsyncGroq":
+        """
+        Shared async Groq client for the running event loop.
+
+        The underlying httpx connection pool is bound to the loop that created it,
+        so one client is kept per (loop, API key) and reused by every provider.
+
+        Returns:
+            AsyncGroq: Pooled async client.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._async_clients.setdefault(loop, {})
+        client = clients.get(self.api_key)
+        if client is None:
+            import httpx
+            from groq import AsyncGroq
+
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=GROQ_KEEPALIVE_EXPIRY,
+                ),
+                timeout=GROQ_TIMEOUT,
+            )
+            client = AsyncGroq(api_key=self.api_key, http_client=http_client)
+            clients[self.api_key] = client
+        return client
+
+    @classmethod
+    async def aclose_shared(cls):
+        """Close the pooled async clients of the running event loop."""
+        loop = asyncio.get_running_loop()
+        clients = cls._async_clients.pop(loop, {})
+        for client in clients.values():
+            await client.close()
+
+    @staticmethod
+    def _fill_usage(message, usage: Optional[Dict]):
+        if usage is not None and getattr(message, "usage", None) is not None:
+            usage["prompt_tokens"] = message.usage.prompt_tokens
+            usage["completion_tokens"] = message.usage.completion_tokens
+
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 usage: Optional[Dict] = None) -> str:
+        message = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self._fill_usage(message, usage)
+        return message.choices[0].message.content
+
+    async def acomplete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                        usage: Optional[Dict] = None) -> str:
+        message = await self.async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self._fill_usage(message, usage)
+        return message.choices[0].message.content
+
+    async def astream(
+        self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+        usage: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        stream = await self.async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+
+class CassetteProvider(LLMProvider):
+    """
+    Record/replay backend backed by a JSON-lines cassette file.
+
+    In "record" mode every request goes to the wrapped provider and its response
+    is appended to the cassette (a later recording of the same request wins). In
+    "replay" mode responses come only from the cassette, so runs are
+    deterministic and need no network or API key; an unrecorded request raises
+    ``LLMProviderError``. Requests are matched on (model, messages, temperature,
+    max_tokens).
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str = "replay", inner: Optional[LLMProvider] = None):
+        """
+        Initialize the cassette.
+
+        Args:
+            path (str): Cassette file (created when recording).
+            mode (str): "record" or "replay".
+            inner (LLMProvider, optional): Provider to record from. Required in record mode.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported cassette mode: {mode}. Use 'record' or 'replay'.")
+        if mode == "record" and inner is None:
+            raise ValueError("Recording a cassette needs a provider to record from")
+        self.path = path
+        self.mode = mode
+        self.name = mode
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._responses = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        responses = {}
+        if not os.path.exists(self.path):
+            if self.mode == "replay":
+                print(f"⚠️ LLM cassette not found: {self.path}")
+            return responses
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    responses[entry["key"]] = entry["response"]
+        return responses
+
+    @staticmethod
+    def request_key(model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+        """Return the cassette key of a request."""
+        payload = json.dumps([model, messages, temperature, max_tokens], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _replay(self, key: str) -> str:
+        with self._lock:
+            response = self._responses.get(key)
+        if response is None:
+            raise LLMProviderError(f"No recorded response in {self.path} for this request")
+        return response
+
+    def _record(self, key: str, model: str, messages: List[Dict], temperature: float,
+                max_tokens: int, response: str):
+        entry = {
+            "key": key,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response": response,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._responses[key] = response
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 usage: Optional[Dict] = None) -> str:
+        key = self.request_key(model, messages, temperature, max_tokens)
+        if self.mode == "replay":
+            return self._replay(key)
+        response = self.inner.complete(model, messages, temperature, max_tokens, usage)
+        self._record(key, model, messages, temperature, max_tokens, response)
+        return response
+
+    async def acomplete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                        usage: Optional[Dict] = None) -> str:
+        key = self.request_key(model, messages, temperature, max_tokens)
+        if self.mode == "replay":
+            return self._replay(key)
+        response = await self.inner.acomplete(model, messages, temperature, max_tokens, usage)
+        self._record(key, model, messages, temperature, max_tokens, response)
+        return response
+
+    async def astream(
+        self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+        usage: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        key = self.request_key(model, messages, temperature, max_tokens)
+        if self.mode == "replay":
+            for delta in _word_chunks(self._replay(key)):
+                yield delta
+            return
+        parts = []
+        async for delta in self.inner.astream(model, messages, temperature, max_tokens, usage):
+            parts.append(delta)
+            yield delta
+        self._record(key, model, messages, temperature, max_tokens, "".join(parts))
+
+
+class SyntheticProvider(LLMProvider):
+    """
+    Local backend generating plausible text with realistic timing.
+
+    Each completion waits ``latency_ms`` (time to first token, plus up to
+    ``jitter_ms``), then one word-sized token per ``1 / tokens_per_second``
+    seconds, and fails with ``LLMProviderError`` at ``error_rate``. Text is
+    deterministic per request; the seed fixes jitter and failures.
+    """
+
+    name = "synthetic"
+    cache_namespace = "synthetic"
+
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100, tokens_per_second: float = 500,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize the synthetic backend.
+
+        Args:
+            latency_ms (float): Base time to first token.
+            jitter_ms (float): Extra uniform random latency.
+            tokens_per_second (float): Generation rate after the first token (0 = instant).
+            error_rate (float): Probability that a completion fails.
+            seed (int, optional): Random seed for reproducible jitter and failures.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _plan(self, messages: List[Dict], max_tokens: int):
+        """Return (text, first-token delay, per-token delay) or raise an injected failure."""
+        with self._random_lock:
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            fail = self._random.random() < self.error_rate
+        if fail:
+            raise LLMProviderError("Synthetic failure injected")
+        system_message = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        prompt = next((m["content"] for m in messages if m.get("role") == "user"), "")
+        text = synthetic_completion(system_message, max_tokens, prompt)
+        token_delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return text, delay, token_delay
+
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 usage: Optional[Dict] = None) -> str:
+        text, delay, token_delay = self._plan(messages, max_tokens)
+        time.sleep(delay + token_delay * len(_word_chunks(text)))
+        return text
+
+    async def acomplete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                        usage: Optional[Dict] = None) -> str:
+        text, delay, token_delay = self._plan(messages, max_tokens)
+        await asyncio.sleep(delay + token_delay * len(_word_chunks(text)))
+        return text
+
+    async def astream(
+        self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+        usage: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        text, delay, token_delay = self._plan(messages, max_tokens)
+        await asyncio.sleep(delay)
+        for delta in _word_chunks(text):
+            yield delta
+            if token_delay:
+                await asyncio.sleep(token_delay)
+
+
+def create_provider(name: Optional[str] = None, api_key: Optional[str] = None) -> LLMProvider:
+    """
+    Create the LLM provider configured by the environment.
+
+    Reads LLM_PROVIDER (default groq). "record" and "replay" use the cassette at
+    LLM_CASSETTE_PATH (default data/llm_cassette.jsonl); "synthetic" reads
+    LLM_SYNTHETIC_LATENCY_MS (300), LLM_SYNTHETIC_JITTER_MS (100),
+    LLM_SYNTHETIC_TOKENS_PER_SECOND (500), LLM_SYNTHETIC_ERROR_RATE (0) and
+    LLM_SYNTHETIC_SEED (unset).
+
+    Args:
+        name (str, optional): Provider name. If None, reads LLM_PROVIDER.
+        api_key (str, optional): Groq API key for "groq" and "record".
+
+    Returns:
+        LLMProvider: Configured provider.
+
+    Raises:
+        ValueError: Unknown provider.
+        MissingAPIKeyError: The provider needs a Groq API key and none is set.
+    """
+    name = (name or os.getenv("LLM_PROVIDER", "groq")).lower()
+    if name not in LLM_PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {name}. Use one of: {', '.join(LLM_PROVIDERS)}")
+
+    if name == "groq":
+        return GroqProvider(api_key=api_key)
+    if name in CassetteProvider.MODES:
+        path = os.getenv("LLM_CASSETTE_PATH") or DEFAULT_CASSETTE_PATH
+        inner = GroqProvider(api_key=api_key) if name == "record" else None
+        return CassetteProvider(path, mode=name, inner=inner)
+
+    seed = os.getenv("LLM_SYNTHETIC_SEED")
+    return SyntheticProvider(
+        latency_ms=float(os.getenv("LLM_SYNTHETIC_LATENCY_MS", "300")),
+        jitter_ms=float(os.getenv("LLM_SYNTHETIC_JITTER_MS", "100")),
+        tokens_per_second=float(os.getenv("LLM_SYNTHETIC_TOKENS_PER_SECOND", "500")),
+        error_rate=float(os.getenv("LLM_SYNTHETIC_ERROR_RATE", "0")),
+        seed=int(seed) if seed else None,
+    )
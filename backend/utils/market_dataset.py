@@ -0,0 +1,308 @@
+"""
+Columnar Market Dataset
+NumPy-backed store of molecule x region market rows with a molecule -> row
+index, so lookups are a slice and therapeutic-area aggregation is a vectorized
+group-by instead of a Python loop over every molecule.
+"""
+
+import os
+import csv
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Columns every input file must provide (regional figures, one row per molecule x region)
+REQUIRED_COLUMNS = ("molecule", "region", "therapeutic_area", "market_size_usd", "growth_rate")
+# Optional molecule-level figures, repeated on each of the molecule's rows. When absent,
+# the molecule size is the sum of its regions and its growth the size-weighted regional growth.
+MOLECULE_COLUMNS = ("molecule_market_size_usd", "molecule_growth_rate", "market_size_units")
+
+_STRING_COLUMNS = ("molecule", "region", "therapeutic_area")
+
+
+def _factorize(values: np.ndarray):
+    """
+    Encode strings as integer codes numbered in order of first appearance.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (codes per row, unique values by code).
+    """
+    uniques, first_index, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first_index, kind="stable")
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    return remap[inverse], uniques[order]
+
+
+class MarketDataset:
+    """
+    Market figures held as parallel NumPy columns.
+
+    Rows are sorted by molecule, so each molecule owns one contiguous
+    ``[start, stop)`` slice found through a dict index. Molecule-level figures
+    (total size, growth, units, therapeutic area) are precomputed once per
+    molecule at load time, and area trends reduce them with ``np.bincount``.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], competitors: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Build the dataset from raw columns (any row order).
+
+        Args:
+            columns (Dict[str, np.ndarray]): REQUIRED_COLUMNS and any of MOLECULE_COLUMNS,
+                all of the same length. Missing numbers are NaN.
+            competitors (Dict[str, List[Dict]], optional): Lower-case molecule -> top competitors.
+        """
+        missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Market data is missing columns: {', '.join(missing)}")
+
+        keys = np.char.lower(np.char.strip(np.asarray(columns["molecule"], dtype=str)))
+        molecule_codes, molecules = _factorize(keys)
+        area_codes, self.areas = _factorize(np.asarray(columns["therapeutic_area"], dtype=str))
+        region_codes, self.regions = _factorize(np.asarray(columns["region"], dtype=str))
+
+        # Stable sort keeps each molecule's regions in input order
+        order = np.argsort(molecule_codes, kind="stable")
+        self.molecule_codes = molecule_codes[order]
+        self.area_codes = area_codes[order]
+        self.region_codes = region_codes[order]
+        self.market_size = np.asarray(columns["market_size_usd"], dtype=np.float64)[order]
+        self.growth = np.asarray(columns["growth_rate"], dtype=np.float64)[order]
+
+        rows = len(self.molecule_codes)
+        if rows:
+            starts = np.flatnonzero(np.r_[True, self.molecule_codes[1:] != self.molecule_codes[:-1]])
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+        stops = np.r_[starts[1:], rows].astype(np.int64)
+        self.molecules = molecules
+        self._index = {
+            str(molecules[code]): (int(start), int(stop))
+            for code, start, stop in zip(self.molecule_codes[starts], starts, stops)
+        }
+
+        # Molecule-level figures, one entry per molecule (in row order)
+        self.molecule_area_codes = self.area_codes[starts]
+        regional_size = np.add.reduceat(self.market_size, starts) if rows else np.zeros(0)
+        regional_weighted_growth = np.add.reduceat(self.market_size * self.growth, starts) if rows else np.zeros(0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            regional_growth = np.where(regional_size > 0, regional_weighted_growth / regional_size, 0.0)
+        self.molecule_market_size = self._molecule_column(columns, "molecule_market_size_usd", order, starts, regional_size)
+        self.molecule_growth = self._molecule_column(columns, "molecule_growth_rate", order, starts, regional_growth)
+        self.molecule_units = self._molecule_column(
+            columns, "market_size_units", order, starts, np.full(len(starts), np.nan)
+        )
+
+        self.competitors = competitors or {}
+
+    @staticmethod
+    def _molecule_column(columns: Dict, name: str, order: np.ndarray, starts: np.ndarray,
+                         fallback: np.ndarray) -> np.ndarray:
+        """Take a molecule-level column from each molecule's first row, falling back where NaN."""
+        if name not in columns:
+            return fallback
+        values = np.asarray(columns[name], dtype=np.float64)[order][starts]
+        return np.where(np.isnan(values), fallback, values)
+
+    def __len__(self) -> int:
+        return len(self.molecule_codes)
+
+    def __contains__(self, molecule_name: str) -> bool:
+        return self._key(molecule_name) in self._index
+
+    @staticmethod
+    def _key(molecule_name: str) -> str:
+        return molecule_name.lower()
+
+    def molecule_record(self, molecule_name: str) -> Optional[Dict]:
+        """
+        Get a molecule's market figures in the shape of the original mock records.
+
+        Args:
+            molecule_name (str): Molecule name (case-insensitive).
+
+        Returns:
+            Dict or None: market_size_usd, market_size_units (when known), growth_rate,
+            therapeutic_area, top_competitors and regions; None for unknown molecules.
+        """
+        key = self._key(molecule_name)
+        bounds = self._index.get(key)
+        if bounds is None:
+            return None
+        start, stop = bounds
+        code = self.molecule_codes[start]
+
+        record = {"market_size_usd": float(self.molecule_market_size[code])}
+        units = self.molecule_units[code]
+        if not np.isnan(units):
+            record["market_size_units"] = float(units)
+        record["growth_rate"] = float(self.molecule_growth[code])
+        record["therapeutic_area"] = str(self.areas[self.molecule_area_codes[code]])
+        record["top_competitors"] = list(self.competitors.get(key, []))
+        record["regions"] = self.regional_breakdown(molecule_name)
+        return record
+
+    def regional_breakdown(self, molecule_name: str) -> Dict[str, Dict]:
+        """
+        Get a molecule's market size and growth per region.
+
+        Args:
+            molecule_name (str): Molecule name (case-insensitive).
+
+        Returns:
+            Dict[str, Dict]: Region -> {"market_size", "growth"}; empty for unknown molecules.
+        """
+        bounds = self._index.get(self._key(molecule_name))
+        if bounds is None:
+            return {}
+        start, stop = bounds
+        return {
+            str(self.regions[region]): {"market_size": float(size), "growth": float(growth)}
+            for region, size, growth in zip(
+                self.region_codes[start:stop], self.market_size[start:stop], self.growth[start:stop]
+            )
+        }
+
+    def therapeutic_area_trends(self, top: Optional[int] = 5) -> List[Dict]:
+        """
+        Aggregate molecules per therapeutic area, sorted by average growth (descending).
+
+        Each molecule counts once regardless of how many regions it has.
+
+        Args:
+            top (int, optional): Number of areas to return (None for all).
+
+        Returns:
+            List[Dict]: {"area", "total_market_size", "avg_growth_rate", "molecule_count"} per area.
+        """
+        area_count = len(self.areas)
+        counts = np.bincount(self.molecule_area_codes, minlength=area_count)
+        totals = np.bincount(self.molecule_area_codes, weights=self.molecule_market_size, minlength=area_count)
+        growth_sums = np.bincount(self.molecule_area_codes, weights=self.molecule_growth, minlength=area_count)
+
+        present = np.flatnonzero(counts)
+        average_growth = growth_sums[present] / counts[present]
+        # Stable on first appearance, like sorting the areas of an insertion-ordered dict
+        ranked = present[np.argsort(-average_growth, kind="stable")]
+        if top is not None:
+            ranked = ranked[:top]
+
+        return [
+            {
+                "area": str(self.areas[area]),
+                "total_market_size": float(totals[area]),
+                "avg_growth_rate": float(growth_sums[area] / counts[area]),
+                "molecule_count": int(counts[area]),
+            }
+            for area in ranked
+        ]
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict]) -> "MarketDataset":
+        """
+        Build from nested per-molecule records (the IQVIA mock data shape).
+
+        Args:
+            records (Dict[str, Dict]): Molecule -> {market_size_usd, market_size_units,
+                growth_rate, therapeutic_area, top_competitors, regions}.
+
+        Returns:
+            MarketDataset: Dataset with one row per molecule x region.
+        """
+        columns = {name: [] for name in REQUIRED_COLUMNS + MOLECULE_COLUMNS}
+        for molecule, record in records.items():
+            regions = record.get("regions") or {"": {"market_size": record["market_size_usd"],
+                                                     "growth": record["growth_rate"]}}
+            for region, figures in regions.items():
+                columns["molecule"].append(molecule)
+                columns["region"].append(region)
+                columns["therapeutic_area"].append(record["therapeutic_area"])
+                columns["market_size_usd"].append(figures["market_size"])
+                columns["growth_rate"].append(figures["growth"])
+                columns["molecule_market_size_usd"].append(record["market_size_usd"])
+                columns["molecule_growth_rate"].append(record["growth_rate"])
+                columns["market_size_units"].append(record.get("market_size_units", np.nan))
+        competitors = {molecule.lower(): record.get("top_competitors", []) for molecule, record in records.items()}
+        return cls({name: np.asarray(values) for name, values in columns.items()}, competitors)
+
+    @classmethod
+    def load(cls, path: str) -> "MarketDataset":
+        """
+        Load rows from a CSV or Parquet file (by extension).
+
+        Args:
+            path (str): File with REQUIRED_COLUMNS and optionally MOLECULE_COLUMNS.
+
+        Returns:
+            MarketDataset: Loaded dataset (competitors are not part of the file format).
+        """
+        if path.lower().endswith((".parquet", ".pq")):
+            return cls(cls._read_parquet(path))
+        return cls(cls._read_csv(path))
+
+    @staticmethod
+    def _read_csv(path: str) -> Dict[str, np.ndarray]:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader)]
+            wanted = [name for name in REQUIRED_COLUMNS + MOLECULE_COLUMNS if name in header]
+            positions = [header.index(name) for name in wanted]
+            values = {name: [] for name in wanted}
+            for row in reader:
+                if not row:
+                    continue
+                for name, position in zip(wanted, positions):
+                    values[name].append(row[position])
+
+        columns = {}
+        for name, column in values.items():
+            if name in _STRING_COLUMNS:
+                columns[name] = np.asarray(column, dtype=str)
+            else:
+                columns[name] = np.asarray([float(value) if value else np.nan for value in column], dtype=np.float64)
+        return columns
+
+    @staticmethod
+    def _read_parquet(path: str) -> Dict[str, np.ndarray]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet market data requires pyarrow (pip install pyarrow)") from e
+
+        table = pq.read_table(path)
+        columns = {}
+        for name in REQUIRED_COLUMNS + MOLECULE_COLUMNS:
+            if name not in table.column_names:
+                continue
+            column = table.column(name)
+            if name in _STRING_COLUMNS:
+                columns[name] = np.asarray(column.to_pylist(), dtype=str)
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False).astype(np.float64)
+        return columns
+
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def load_market_dataset(path: str) -> MarketDataset:
+    """
+    Load a market data file once per process and share it.
+
+    Args:
+        path (str): CSV or Parquet file.
+
+    Returns:
+        MarketDataset: Shared dataset for that file.
+    """
+    path = os.path.abspath(path)
+    with _datasets_lock:
+        dataset = _datasets.get(path)
+        if dataset is None:
+            dataset = MarketDataset.load(path)
+            _datasets[path] = dataset
+            print(f"📊 Loaded {len(dataset)} market rows ({len(dataset.molecules)} molecules) from {path}")
+        return dataset
@@ -0,0 +1,450 @@
+"""
+Metrics
+Process-wide counters, gauges and latency histograms rendered in the Prometheus
+text exposition format for the /metrics endpoint.
+
+Recording a sample is a dict lookup and a few additions under a per-metric
+lock, cheap enough to leave on in production. Values that already live in a
+component's ``stats()`` (cache hit ratios, store sizes, pool queues) are read
+at scrape time through collectors instead of being tracked twice.
+"""
+
+import time
+import bisect
+import inspect
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from cache hits to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metric name, type, help, [(labels, value), ...]) produced by a collector at scrape time
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base of the labelled metric types."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}  # label values tuple -> value
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = self._header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down (e.g. requests in flight)."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Count the enclosed block as in progress."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (latencies) over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, with a final +Inf slot, sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = self._header()
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors, rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        Add a function called on every scrape.
+
+        Args:
+            collector (Callable): Returns (name, type, help, [(labels, value), ...]) families.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+
+        A failing collector is skipped so one broken component cannot break the scrape.
+
+        Returns:
+            str: Exposition text.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+AGENT_DURATION = REGISTRY.histogram(
+    "pharmai_agent_call_duration_seconds", "Data-agent method latency.", ("agent", "method")
+)
+AGENT_ERRORS = REGISTRY.counter(
+    "pharmai_agent_call_errors_total", "Data-agent method calls that raised.", ("agent", "method")
+)
+LLM_DURATION = REGISTRY.histogram(
+    "pharmai_llm_request_duration_seconds", "LLM completion latency (cache misses only).",
+    ("caller", "provider"), buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_REQUESTS = REGISTRY.counter(
+    "pharmai_llm_requests_total", "LLM requests by outcome (ok, error, cache_hit).",
+    ("caller", "provider", "outcome"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "pharmai_llm_tokens_total", "LLM tokens by kind (prompt, completion); estimated when the provider reports none.",
+    ("caller", "kind"),
+)
+LLM_IN_FLIGHT = REGISTRY.gauge("pharmai_llm_requests_in_flight", "LLM requests awaiting a response.")
+MONGO_DURATION = REGISTRY.histogram(
+    "pharmai_mongo_operation_duration_seconds", "MongoDB operation latency.", ("collection", "operation")
+)
+MONGO_ERRORS = REGISTRY.counter(
+    "pharmai_mongo_operation_errors_total", "MongoDB operations that raised.", ("collection", "operation")
+)
+REPORT_RENDER_DURATION = REGISTRY.histogram(
+    "pharmai_report_render_duration_seconds", "Report rendering latency by format.", ("format",)
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "pharmai_http_request_duration_seconds", "HTTP request latency until the response starts.",
+    ("method", "endpoint", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("pharmai_http_requests_in_flight", "HTTP requests being handled.")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (about four characters per token) for providers that report no usage."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def record_llm_usage(caller: str, usage: Dict, prompt_text: str, completion_text: Optional[str]):
+    """
+    Count the prompt and completion tokens of one LLM call.
+
+    Args:
+        caller (str): Caller label (e.g. "insights").
+        usage (Dict): Usage reported by the provider ({"prompt_tokens", "completion_tokens"}), possibly empty.
+        prompt_text (str): System message plus prompt, for the estimate.
+        completion_text (str, optional): Completion, for the estimate.
+    """
+    LLM_TOKENS.inc(usage.get("prompt_tokens") or estimate_tokens(prompt_text), caller=caller, kind="prompt")
+    LLM_TOKENS.inc(
+        usage.get("completion_tokens") or estimate_tokens(completion_text), caller=caller, kind="completion"
+    )
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy (async or sync) that times the time spent fetching documents.
+
+    Time the consumer spends between documents is excluded, so a streamed
+    response does not inflate the recorded database latency. The operation is
+    recorded once, when the cursor is exhausted or closed.
+    """
+
+    def __init__(self, cursor, collection: str, operation: str = "find"):
+        self._cursor = cursor
+        self._collection = collection
+        self._operation = operation
+        self._elapsed = 0.0
+        self._recorded = False
+
+    def sort(self, *args, **kwargs) -> "InstrumentedCursor":
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs) -> "InstrumentedCursor":
+        self._cursor = self._cursor.limit(*args, **kwargs)
+        return self
+
+    def skip(self, *args, **kwargs) -> "InstrumentedCursor":
+        self._cursor = self._cursor.skip(*args, **kwargs)
+        return self
+
+    def _record(self):
+        if not self._recorded:
+            self._recorded = True
+            MONGO_DURATION.observe(self._elapsed, collection=self._collection, operation=self._operation)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        started = time.perf_counter()
+        try:
+            return await self._cursor.__anext__()
+        except StopAsyncIteration:
+            self._elapsed += time.perf_counter() - started
+            self._record()
+            raise
+        except Exception:
+            MONGO_ERRORS.inc(collection=self._collection, operation=self._operation)
+            raise
+        finally:
+            if not self._recorded:
+                self._elapsed += time.perf_counter() - started
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            self._elapsed += time.perf_counter() - started
+            self._record()
+            raise
+        except Exception:
+            MONGO_ERRORS.inc(collection=self._collection, operation=self._operation)
+            raise
+        finally:
+            if not self._recorded:
+                self._elapsed += time.perf_counter() - started
+
+    async def to_list(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._cursor.to_list(*args, **kwargs)
+        finally:
+            self._elapsed += time.perf_counter() - started
+            self._record()
+
+    def close(self):
+        closing = self._cursor.close()
+        if inspect.isawaitable(closing):
+            return self._record_after(closing)
+        self._record()
+
+    async def _record_after(self, closing):
+        await closing
+        self._record()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedCollection:
+    """
+    Collection proxy recording the latency of every operation (find_one,
+    insert_one, update_one, ...) and of ``find`` cursors. Wraps async
+    collections (operations are timed until awaited) and sync ones alike.
+    """
+
+    def __init__(self, collection, name: str):
+        self._collection = collection
+        self._name = name
+
+    def find(self, *args, **kwargs) -> InstrumentedCursor:
+        return InstrumentedCursor(self._collection.find(*args, **kwargs), self._name)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception:
+                self._observe(name, started, failed=True)
+                raise
+            if inspect.isawaitable(result):
+                return self._timed_await(result, name, started)
+            self._observe(name, started)
+            return result
+
+        return timed
+
+    async def _timed_await(self, pending, operation: str, started: float):
+        try:
+            result = await pending
+        except Exception:
+            self._observe(operation, started, failed=True)
+            raise
+        self._observe(operation, started)
+        return result
+
+    def _observe(self, operation: str, started: float, failed: bool = False):
+        if failed:
+            MONGO_ERRORS.inc(collection=self._name, operation=operation)
+        MONGO_DURATION.observe(time.perf_counter() - started, collection=self._name, operation=operation)
+
+
+class HTTPMetricsMiddleware:
+    """
+    ASGI middleware counting in-flight HTTP requests and timing each one until
+    its response starts, labelled by endpoint function (bounded cardinality).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # The router stores the matched endpoint in the shared scope
+                endpoint = scope.get("endpoint")
+                HTTP_DURATION.observe(
+                    time.perf_counter() - started,
+                    method=scope["method"],
+                    endpoint=getattr(endpoint, "__name__", "unmatched"),
+                    status=f"{message['status'] // 100}xx",
+                )
+            await send(message)
+
+        with HTTP_IN_FLIGHT.track_inprogress():
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,21 @@
+"""
+Molecule Name Helpers
+Shared normalization so every cache, store and de-duplication step agrees on
+when two molecule names refer to the same molecule.
+"""
+
+
+def normalize_molecule_name(molecule_name: str) -> str:
+    """
+    Normalize a molecule name for lookups and de-duplication.
+
+    Trims, collapses inner whitespace and lower-cases, so "Aspirin" and
+    " aspirin " map to the same key.
+
+    Args:
+        molecule_name (str): Raw molecule name.
+
+    Returns:
+        str: Normalized key.
+    """
+    return " ".join(str(molecule_name).split()).lower()
@@ -0,0 +1,147 @@
+"""
+PDF Render Cache
+Content-addressed cache of rendered PDF reports, so repeat downloads of an
+unchanged analysis skip ReportLab entirely.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class PDFCache:
+    """
+    LRU cache of PDF bytes keyed by a content hash, bounded by total bytes.
+
+    The key (also used as the HTTP ETag) hashes the aggregated data, the
+    molecule name and the report template version, so any change to the data
+    or the layout produces a new entry.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Budget for the total size of cached PDFs.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # etag -> pdf bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_etag(aggregated_data: Dict, molecule_name: str, template_version: str) -> str:
+        """
+        Compute the content hash for a report.
+
+        Args:
+            aggregated_data (Dict): Data the PDF is rendered from.
+            molecule_name (str): Molecule name printed in the report.
+            template_version (str): Version of the PDF template.
+
+        Returns:
+            str: Quoted strong ETag.
+        """
+        payload = json.dumps(
+            [template_version, molecule_name, aggregated_data],
+            sort_keys=True,
+            default=str,
+        )
+        return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest() + '"'
+
+    def get(self, etag: str) -> Optional[bytes]:
+        """
+        Look up rendered PDF bytes.
+
+        Args:
+            etag (str): Key from ``make_etag``.
+
+        Returns:
+            bytes or None: Cached PDF, or None on a miss.
+        """
+        with self._lock:
+            pdf_bytes = self._entries.get(etag)
+            if pdf_bytes is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self._hits += 1
+            return pdf_bytes
+
+    def put(self, etag: str, pdf_bytes: bytes):
+        """
+        Cache rendered PDF bytes, evicting least recently used entries over budget.
+
+        PDFs larger than the whole budget are not cached.
+
+        Args:
+            etag (str): Key from ``make_etag``.
+            pdf_bytes (bytes): Rendered PDF.
+        """
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(etag, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[etag] = pdf_bytes
+            self._bytes += len(pdf_bytes)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict: Entries, bytes against budget, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    @classmethod
+    def from_env(cls) -> "PDFCache":
+        """
+        Build a cache sized by PDF_CACHE_MAX_BYTES (default 32 MiB).
+
+        Returns:
+            PDFCache: Configured cache.
+        """
+        return cls(max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag.
+
+    Args:
+        if_none_match (str, optional): Raw header value (may list several tags or be "*").
+        etag (str): Current quoted ETag.
+
+    Returns:
+        bool: True if the client's cached copy is current.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
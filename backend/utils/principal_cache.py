@@ -0,0 +1,178 @@
+"""
+Authenticated-Principal Cache
+Short-lived cache of the user record behind a bearer token, so repeat requests
+authenticate without a database round trip.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class PrincipalCache:
+    """
+    Thread-safe LRU + TTL cache of token -> user record.
+
+    Entries never outlive the token they were issued for: each one expires at
+    the earlier of ``ttl_seconds`` from now and the token's ``exp`` claim.
+    Tokens are stored as SHA-256 digests, and every entry is indexed by user id
+    so a changed user record can drop all of its cached principals at once.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached tokens before LRU eviction.
+            ttl_seconds (float): Upper bound on how long a principal is trusted without
+                re-reading the user record.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()  # token digest -> (expires_at, user_id, user)
+        self._by_user = {}  # user_id -> set of token digests
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Look up the user for a token.
+
+        Args:
+            token (str): Raw bearer token.
+
+        Returns:
+            Dict or None: Cached user record, or None on a miss or expired entry.
+        """
+        key = self._token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, user = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return user
+                self._remove(key)
+            self._misses += 1
+            return None
+
+    def put(self, token: str, user: Dict, token_expires_at: Optional[float] = None):
+        """
+        Cache the user record for a token.
+
+        Args:
+            token (str): Raw bearer token.
+            user (Dict): User document; ``password_hash`` is not cached.
+            token_expires_at (float, optional): Token ``exp`` claim (epoch seconds).
+        """
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, float(token_expires_at))
+        if expires_at <= time.time():
+            return
+
+        user_id = str(user["_id"])
+        principal = {field: value for field, value in user.items() if field != "password_hash"}
+        key = self._token_key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, user_id, principal)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: str):
+        """Drop one entry and its user index slot. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1]]
+
+    def invalidate_token(self, token: str):
+        """
+        Forget a single token (e.g. on logout).
+
+        Args:
+            token (str): Raw bearer token.
+        """
+        key = self._token_key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self._invalidations += 1
+
+    def invalidate_user(self, user_id: str):
+        """
+        Forget every cached token of a user; call whenever the user record changes.
+
+        Args:
+            user_id (str): User id (string form of ``_id``).
+        """
+        with self._lock:
+            for key in list(self._by_user.get(str(user_id), ())):
+                self._remove(key)
+                self._invalidations += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict: Hits, misses, evictions, invalidations, entry count and hit ratio.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    @classmethod
+    def from_env(cls) -> "PrincipalCache":
+        """
+        Build a cache sized by PRINCIPAL_CACHE_MAX_ENTRIES (10000) and
+        PRINCIPAL_CACHE_TTL seconds (60; 0 disables caching).
+
+        Returns:
+            PrincipalCache: Configured cache.
+        """
+        return cls(
+            max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL", "60")),
+        )
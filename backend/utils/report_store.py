@@ -0,0 +1,167 @@
+"""
+In-Memory Report Store
+Bounded cache of recent molecule analyses, used by the report download endpoints.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from .molecules import normalize_molecule_name
+
+# Load environment variables
+load_dotenv()
+
+
+class ReportStore:
+    """
+    LRU store of the latest analysis per molecule, bounded by entry count and bytes.
+
+    Analyses are indexed by normalized molecule name for O(1) lookup; storing a
+    molecule again replaces its previous analysis. Report metadata for
+    ``/saved_reports`` is kept separately in a bounded, insertion-ordered log.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_metadata: int = 1000,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries (int): Maximum number of analyses kept.
+            max_bytes (int): Budget for the JSON-serialized size of all analyses.
+            max_metadata (int): Maximum number of report metadata records kept.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_metadata = max_metadata
+
+        self._entries = OrderedDict()  # normalized name -> (report_id, data, size)
+        self._metadata = OrderedDict()  # report_id -> metadata
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def put(self, molecule_name: str, data: Dict) -> str:
+        """
+        Store (or replace) the analysis for a molecule.
+
+        Args:
+            molecule_name (str): Molecule name as requested.
+            data (Dict): Aggregated analysis results.
+
+        Returns:
+            str: Report id assigned to this analysis.
+        """
+        key = normalize_molecule_name(molecule_name)
+        report_id = f"{molecule_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        size = len(json.dumps(data, default=str))
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (report_id, data, size)
+            self._bytes += size
+            # Evict least recently used, but always keep the entry just stored
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+        return report_id
+
+    def lookup(self, molecule_name: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Find the stored analysis for a molecule (case/whitespace-insensitive).
+
+        Args:
+            molecule_name (str): Molecule name.
+
+        Returns:
+            Tuple[str, Dict] or None: (report_id, aggregated data), or None if not stored.
+        """
+        key = normalize_molecule_name(molecule_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0], entry[1]
+
+    def add_metadata(self, report_id: str, metadata: Dict):
+        """
+        Record metadata for a generated report, dropping the oldest beyond the limit.
+
+        Args:
+            report_id (str): Report id.
+            metadata (Dict): Metadata shown by ``/saved_reports``.
+        """
+        with self._lock:
+            self._metadata.pop(report_id, None)
+            self._metadata[report_id] = metadata
+            while len(self._metadata) > self.max_metadata:
+                self._metadata.popitem(last=False)
+
+    def list_metadata(self) -> List[Dict]:
+        """
+        Get metadata of generated reports, oldest first.
+
+        Returns:
+            List[Dict]: Report metadata records.
+        """
+        with self._lock:
+            return list(self._metadata.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict:
+        """
+        Get occupancy and eviction statistics.
+
+        Returns:
+            Dict: Entry/byte occupancy against limits, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "metadata_entries": len(self._metadata),
+                "max_metadata": self.max_metadata,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    @classmethod
+    def from_env(cls) -> "ReportStore":
+        """
+        Build a store sized by REPORTS_STORE_MAX_ENTRIES (256), REPORTS_STORE_MAX_BYTES
+        (64 MiB) and REPORTS_STORE_MAX_METADATA (1000).
+
+        Returns:
+            ReportStore: Configured store.
+        """
+        return cls(
+            max_entries=int(os.getenv("REPORTS_STORE_MAX_ENTRIES", "256")),
+            max_bytes=int(os.getenv("REPORTS_STORE_MAX_BYTES", str(64 * 1024 * 1024))),
+            max_metadata=int(os.getenv("REPORTS_STORE_MAX_METADATA", "1000")),
+        )
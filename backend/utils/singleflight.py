@@ -0,0 +1,81 @@
+"""
+Single-Flight Request Coalescing
+Collapses concurrent identical calls into one execution whose result is shared
+by every caller that arrived while it was in flight.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Async request coalescer keyed by an arbitrary string.
+
+    The first caller for a key starts the work; callers arriving before it
+    finishes await the same task instead of starting their own. Nothing is
+    cached afterwards: the next call once the task is done runs again. A
+    cancelled caller does not cancel the shared work for the others, and an
+    exception is re-raised to every caller of that flight. Results are shared
+    objects, so callers must treat them as read-only.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        """
+        Initialize the coalescer.
+
+        Args:
+            name (str): Name reported in stats.
+        """
+        self.name = name
+        self._flights = {}  # (event loop, key) -> asyncio.Task
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func()`` for ``key``, or join the execution already in flight.
+
+        Args:
+            key (str): Coalescing key (e.g. a normalized molecule name).
+            func (Callable): Zero-argument coroutine function doing the work.
+
+        Returns:
+            Any: Result of the (possibly shared) execution.
+        """
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._flights.get(flight_key)
+            if task is None:
+                task = asyncio.ensure_future(func())
+                self._flights[flight_key] = task
+                self._executions += 1
+                task.add_done_callback(lambda done: self._finish(flight_key, done))
+            else:
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task):
+        with self._lock:
+            if self._flights.get(flight_key) is task:
+                del self._flights[flight_key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved so an unawaited failure is not logged
+
+    def stats(self) -> Dict:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict: Executions started, duplicate executions avoided, flights in progress.
+        """
+        with self._lock:
+            calls = self._executions + self._coalesced
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._flights),
+                "coalesced_ratio": self._coalesced / calls if calls else 0.0,
+            }
@@ -0,0 +1,317 @@
+"""
+Request Tracing
+Timed spans grouped per request id, carried through context variables (also
+into worker threads that run in a copied context). Finished requests get a
+Server-Timing header with the per-stage breakdown, and slow traces are kept in
+a bounded in-memory ring for the admin API.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Printing every span (several per request) is local debugging output, so it is opt-in
+TRACE_LOG_SPANS = os.getenv("TRACE_LOG_SPANS", "false").lower() in ("1", "true", "yes")
+
+_current_trace = ContextVar("current_trace", default=None)
+_current_span_id = ContextVar("current_span_id", default=None)
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class Trace:
+    """
+    Spans recorded for one request.
+
+    Spans may be added from several threads (the agent fan-out), so the span
+    list is guarded by a lock. Span start times are offsets from the trace start.
+    """
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        """
+        Start a trace.
+
+        Args:
+            name (str): What is being traced (e.g. "GET /query_molecule/{molecule_name}").
+            request_id (str, optional): Correlation id. If None, a random one is generated.
+        """
+        self.name = name
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+        self.status = None
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the trace started."""
+        return (time.perf_counter() - self._started) * 1000
+
+    def add_span(self, span: Dict):
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Dict]:
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span["start_ms"])
+
+    def finish(self):
+        """Stop the clock."""
+        if self.duration_ms is None:
+            self.duration_ms = self.elapsed_ms()
+
+    def server_timing(self) -> str:
+        """
+        Build a Server-Timing header value from the spans finished so far.
+
+        Spans with the same name (e.g. one per molecule of a batch) are summed,
+        with the call count as the description.
+
+        Returns:
+            str: e.g. ``market_data;dur=12.3, insights;dur=850.0, total;dur=905.1``.
+        """
+        totals = {}
+        for span in self.spans:
+            name = re.sub(r"[^A-Za-z0-9_.-]", "_", span["name"])
+            duration, count = totals.get(name, (0.0, 0))
+            totals[name] = (duration + span["duration_ms"], count + 1)
+        entries = [
+            f'{name};dur={duration:.1f}' + (f';desc="{count} calls"' if count > 1 else "")
+            for name, (duration, count) in totals.items()
+        ]
+        entries.append(f"total;dur={self.duration_ms if self.duration_ms is not None else self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict:
+        return {
+            "request_id": self.request_id,
+            "name": self.name,
+            "status": self.status,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "duration_ms": round(self.duration_ms if self.duration_ms is not None else self.elapsed_ms(), 3),
+            "spans": self.spans,
+        }
+
+
+class SlowTraceLog:
+    """Bounded ring of the most recent traces slower than a threshold."""
+
+    def __init__(self, max_traces: int = 100, threshold_ms: float = 1000):
+        """
+        Initialize the ring.
+
+        Args:
+            max_traces (int): Traces kept; the oldest is dropped first.
+            threshold_ms (float): Minimum duration for a trace to be kept.
+        """
+        self.max_traces = max_traces
+        self.threshold_ms = threshold_ms
+        self._traces = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+        self._recorded = 0
+
+    @classmethod
+    def from_env(cls) -> "SlowTraceLog":
+        """Build from TRACE_RING_SIZE (default 100) and TRACE_SLOW_THRESHOLD_MS (default 1000)."""
+        return cls(
+            max_traces=int(os.getenv("TRACE_RING_SIZE", "100")),
+            threshold_ms=float(os.getenv("TRACE_SLOW_THRESHOLD_MS", "1000")),
+        )
+
+    def record(self, trace: Trace) -> bool:
+        """
+        Keep a finished trace if it is slow enough.
+
+        Args:
+            trace (Trace): Finished trace.
+
+        Returns:
+            bool: Whether the trace was kept.
+        """
+        if trace.duration_ms is None or trace.duration_ms < self.threshold_ms:
+            return False
+        with self._lock:
+            self._traces.append(trace)
+            self._recorded += 1
+        return True
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get kept traces, newest first.
+
+        Args:
+            limit (int, optional): Maximum number of traces.
+
+        Returns:
+            List[Dict]: Serialized traces.
+        """
+        with self._lock:
+            traces = list(reversed(self._traces))
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def get(self, request_id: str) -> Optional[Dict]:
+        """Get a kept trace by request id, or None."""
+        with self._lock:
+            for trace in reversed(self._traces):
+                if trace.request_id == request_id:
+                    return trace.to_dict()
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "kept": len(self._traces),
+                "max_traces": self.max_traces,
+                "threshold_ms": self.threshold_ms,
+                "recorded_total": self._recorded,
+            }
+
+
+# Process-wide ring of slow traces, shown by GET /api/admin/traces
+slow_traces = SlowTraceLog.from_env()
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the running request, if any."""
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    """Return the request id of the running request, if any."""
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def start_trace(name: str, request_id: Optional[str] = None) -> Iterator[Trace]:
+    """
+    Make a new trace current for the enclosed block, then offer it to ``slow_traces``.
+
+    Args:
+        name (str): What is being traced.
+        request_id (str, optional): Correlation id (generated when None).
+
+    Yields:
+        Trace: The active trace.
+    """
+    trace = Trace(name, request_id)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span_id.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span_id.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.finish()
+        slow_traces.record(trace)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict]:
+    """
+    Time the enclosed block as a span of the current trace.
+
+    Outside a trace the span is still timed and logged, so background jobs
+    keep their progress lines. The yielded dict can be updated with attributes
+    known only inside the block (e.g. whether a cache answered).
+
+    Args:
+        name (str): Stage name (e.g. "market_data").
+        **attributes: Extra span attributes (e.g. molecule="aspirin").
+
+    Yields:
+        Dict: The span's attributes.
+    """
+    trace = _current_trace.get()
+    span_id = uuid.uuid4().hex[:8]
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    start_ms = trace.elapsed_ms() if trace is not None else 0.0
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        try:
+            _current_span_id.reset(token)
+        except ValueError:
+            # An async generator resumed from another task; that context never saw this span
+            pass
+        record = {
+            "name": name,
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "start_ms": round(start_ms, 3),
+            "duration_ms": round(duration_ms, 3),
+            "thread": threading.current_thread().name,
+            "attributes": attributes,
+        }
+        if trace is not None:
+            trace.add_span(record)
+        if TRACE_LOG_SPANS:
+            fields = {
+                "request_id": trace.request_id if trace is not None else None,
+                "span": name,
+                "duration_ms": round(duration_ms, 1),
+                **attributes,
+            }
+            print(f"⏱️  {json.dumps(fields, default=str)}")
+
+
+def _request_id_from_headers(headers: List) -> Optional[str]:
+    for key, value in headers:
+        if key == b"x-request-id":
+            request_id = value.decode("latin-1")
+            if _REQUEST_ID_PATTERN.match(request_id):
+                return request_id
+    return None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request inside a trace.
+
+    The request id comes from a valid incoming X-Request-ID header or is
+    generated. The response carries X-Request-ID and a Server-Timing header
+    with the stages finished before the response started (all of them, except
+    for streamed bodies).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id_from_headers(scope.get("headers", []))
+        with start_trace(f"{scope['method']} {scope['path']}", request_id) as trace:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    trace.status = message["status"]
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-request-id", trace.request_id.encode("latin-1")))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
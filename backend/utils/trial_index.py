@@ -0,0 +1,163 @@
+"""
+Clinical Trial Search Index
+Token/prefix inverted index over trial condition, title and sponsor. Trials are
+numbered by start date (most recent first) when the index is built, so every
+posting list is already in rank order and a page of results is the first
+matches of a posting-list intersection.
+"""
+
+import re
+import heapq
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Fields searched by TrialIndex.search
+INDEXED_FIELDS = ("condition", "title", "sponsor")
+# Shorter query tokens match whole tokens only: a one- or two-letter prefix would
+# expand to most of the vocabulary
+MIN_PREFIX_LENGTH = 3
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case alphanumeric tokens of ``text``."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _list_seeker(ids: List[int]) -> Callable[[int], Optional[int]]:
+    """Forward-only ``seek(target)`` over a sorted list: first id >= target (binary search), or None."""
+    position = 0
+
+    def seek(target: int) -> Optional[int]:
+        nonlocal position
+        position = bisect_left(ids, target, position)
+        return ids[position] if position < len(ids) else None
+
+    return seek
+
+
+def _iterator_seeker(ids: Iterator[int]) -> Callable[[int], Optional[int]]:
+    """Forward-only ``seek(target)`` over a lazily produced sorted id stream."""
+    current = -1
+
+    def seek(target: int) -> Optional[int]:
+        nonlocal current
+        while current is not None and current < target:
+            current = next(ids, None)
+        return current
+
+    return seek
+
+
+class TrialIndex:
+    """
+    Inverted index from tokens to ranked trial ids.
+
+    Each query token of at least MIN_PREFIX_LENGTH characters matches every
+    indexed token it is a prefix of (found by bisecting the sorted vocabulary);
+    shorter ones match exactly. A trial matches when all query tokens do. The
+    posting lists of a prefix's tokens are merged lazily, and the intersection
+    leapfrogs between the per-token streams (binary search on plain posting
+    lists), stopping as soon as the requested page is filled. Non-matching
+    trials and matches past the page are never looked at.
+    """
+
+    def __init__(self, trials: Iterable[Dict]):
+        """
+        Build the index.
+
+        Args:
+            trials (Iterable[Dict]): Trial records with condition, title, sponsor and start_date.
+        """
+        # Most recent first; trials without a start date go last, ties keep input order
+        trials = list(trials)
+        undated = [trial for trial in trials if not trial.get("start_date")]
+        dated = sorted((trial for trial in trials if trial.get("start_date")),
+                       key=lambda trial: trial["start_date"], reverse=True)
+        self.trials = dated + undated
+
+        postings = {}
+        for trial_id, trial in enumerate(self.trials):
+            tokens = set()
+            for field in INDEXED_FIELDS:
+                tokens.update(tokenize(str(trial.get(field) or "")))
+            for token in tokens:
+                # Ids are visited in increasing order, so each list stays sorted
+                postings.setdefault(token, []).append(trial_id)
+
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self.trials)
+
+    def _token_seeker(self, token: str):
+        """
+        Seeker over the ids of trials matching one query token.
+
+        Returns:
+            Tuple[int, Callable] or None: (posting count, seek function), or None if nothing matches.
+        """
+        if len(token) < MIN_PREFIX_LENGTH:
+            ids = self._postings.get(token)
+            return (len(ids), _list_seeker(ids)) if ids else None
+
+        start = bisect_left(self._vocabulary, token)
+        posting_lists = []
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(token):
+                break
+            posting_lists.append(self._postings[candidate])
+        if not posting_lists:
+            return None
+        if len(posting_lists) == 1:
+            return len(posting_lists[0]), _list_seeker(posting_lists[0])
+        # Ids shared by several tokens repeat in the merge; seeking skips the repeats
+        return sum(map(len, posting_lists)), _iterator_seeker(heapq.merge(*posting_lists))
+
+    def search(self, query: str, offset: int = 0, limit: int = 10) -> List[Dict]:
+        """
+        Find trials matching every token of ``query``, most recent first.
+
+        Args:
+            query (str): Free text (e.g. "oncology", "cardio", "type 2 diab").
+            offset (int): Matches to skip (page start).
+            limit (int): Maximum number of trials to return.
+
+        Returns:
+            List[Dict]: Matching trial records for the requested page.
+        """
+        if limit <= 0:
+            return []
+        wanted = offset + limit
+
+        tokens = tokenize(query)
+        if not tokens:
+            return self.trials[offset:wanted]
+
+        seekers = []
+        for token in dict.fromkeys(tokens):
+            seeker = self._token_seeker(token)
+            if seeker is None:
+                return []
+            seekers.append(seeker)
+        # Most selective first, so mismatches are found with the fewest steps
+        seekers = [seek for _, seek in sorted(seekers, key=lambda seeker: seeker[0])]
+
+        matches = []
+        candidate = 0
+        while len(matches) < wanted:
+            for seek in seekers:
+                found = seek(candidate)
+                if found is None:
+                    return [self.trials[match] for match in matches[offset:]]
+                if found != candidate:
+                    # Jump every stream to the next id this one can match
+                    candidate = found
+                    break
+            else:
+                matches.append(candidate)
+                candidate += 1
+
+        return [self.trials[match] for match in matches[offset:]]
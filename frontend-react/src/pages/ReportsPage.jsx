@@ -8,6 +8,8 @@ export default function ReportsPage() {
   const [reports, setReports] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
   const { user, token, isAuthenticated } = useAuth();
 
@@ -28,15 +30,33 @@ export default function ReportsPage() {
       const response = await axios.get(`${API_BASE}/api/reports/user-reports`, {
         headers: { Authorization: `Bearer ${token}` },
       });
-      setReports(response.data);
+      setReports(response.data.reports);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to fetch reports');
       setReports([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMoreReports = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await axios.get(`${API_BASE}/api/reports/user-reports`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { cursor: nextCursor },
+      });
+      setReports((current) => [...current, ...response.data.reports]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      setError(err.response?.data?.detail || 'Failed to fetch reports');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (reportId) => {
     if (!window.confirm('Are you sure you want to delete this report?')) return;
 
@@ -54,8 +74,20 @@ export default function ReportsPage() {
     navigate(`/report/${reportId}`, { state: { from: 'reports' } });
   };
 
-  const handleDownload = (report) => {
-    const dataStr = JSON.stringify(report.data, null, 2);
+  const handleDownload = async (report) => {
+    // The listing only carries summaries, so fetch the full report first
+    let reportData;
+    try {
+      const response = await axios.get(`${API_BASE}/api/reports/${report._id}`, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      reportData = response.data.data;
+    } catch (err) {
+      setError(err.response?.data?.detail || 'Failed to download report');
+      return;
+    }
+
+    const dataStr = JSON.stringify(reportData, null, 2);
     const dataUri = 'data:application/json;charset=utf-8,' + encodeURIComponent(dataStr);
 
     const exportFileDefaultName = `${report.molecule_name}_report_${new Date().toISOString().split('T')[0]}.json`;
@@ -127,7 +159,7 @@ export default function ReportsPage() {
                   {/* Info */}
                   <div className="bg-gray-50 rounded-lg p-3 mb-4">
                     <p className="text-sm text-gray-600">
-                      <span className="font-semibold text-pharma-600">Data points:</span> {Object.keys(report.data).length}
+                      <span className="font-semibold text-pharma-600">Data points:</span> {report.data_points ?? Object.keys(report.data || {}).length}
                     </p>
                   </div>
 
@@ -159,6 +191,20 @@ export default function ReportsPage() {
             ))}
           </div>
         )}
+
+        {/* Load More */}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMoreReports}
+              disabled={loadingMore}
+              className="py-2 px-6 bg-pharma-100 text-pharma-700 rounded-lg hover:bg-pharma-200 transition font-medium flex items-center gap-2 disabled:opacity-50"
+            >
+              {loadingMore && <Loader size={16} className="animate-spin" />}
+              Load more
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
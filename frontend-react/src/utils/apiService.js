@@ -38,9 +38,7 @@ export const apiService = {
   },
 
   batchAnalyze: async (molecules) => {
-    const response = await apiClient.post(API_ENDPOINTS.batchAnalyze, {
-      molecules: molecules,
-    });
+    const response = await apiClient.post(API_ENDPOINTS.batchAnalyze, molecules);
     return response.data;
   },
 